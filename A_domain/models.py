@@ -1,5 +1,6 @@
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from array import array
+from typing import Optional, Iterable, Iterator, List, Dict
 from enum import Enum
 
 
@@ -13,16 +14,42 @@ class KassaartikelMissingException(Exception):
     pass
 
 
-@dataclass
+class UngueltigerExportException(Exception):
+    """Wird ausgelöst, wenn eine Datei strukturell kein verwertbarer Lotzapp-Artikelexport ist."""
+    pass
+
+
 class Artikel:
-    id: str
-    name: str
-    lagerstand: float
-    ist_kassaartikel: bool
-    einheit: str
-    barcode: str = ""
-    extnr: str = ""
-    gruppe: str = ""
+    """
+    Ein Artikel aus dem Lotzapp-Export. Bewusst ohne @dataclass geschrieben: dataclasses
+    zieht beim Import inspect nach, was den Start des CLI-Laufs spürbar verlängert.
+    Verhalten wie eine Dataclass mit slots (Vergleich und Darstellung über alle Felder).
+    """
+    __slots__ = ('id', 'name', 'lagerstand', 'ist_kassaartikel', 'einheit', 'barcode', 'extnr', 'gruppe')
+
+    def __init__(self, id: str, name: str, lagerstand: float, ist_kassaartikel: bool, einheit: str,
+                 barcode: str = "", extnr: str = "", gruppe: str = ""):
+        self.id = id
+        self.name = name
+        self.lagerstand = lagerstand
+        self.ist_kassaartikel = ist_kassaartikel
+        self.einheit = einheit
+        self.barcode = barcode
+        self.extnr = extnr
+        self.gruppe = gruppe
+
+    def _felder(self) -> tuple:
+        return (self.id, self.name, self.lagerstand, self.ist_kassaartikel,
+                self.einheit, self.barcode, self.extnr, self.gruppe)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._felder() == other._felder()
+
+    def __repr__(self) -> str:
+        felder = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__qualname__}({felder})"
 
     def berechne_soll_status(self) -> Optional[str]:
         """
@@ -37,4 +64,228 @@ class Artikel:
         if self.lagerstand <= 0 and self.ist_kassaartikel:
             return "Nein"
             
-        return None
\ No newline at end of file
+        return None
+
+
+class ArtikelTabelle:
+    """
+    Spaltenorientierte Ablage vieler Artikel mit geringem Speicherbedarf.
+    Lagerstände liegen in einem array('d'), der Kassa-Status in einem Bitset und
+    Einheit/Gruppe als Codes auf eine Liste internierter Strings.
+    Beim Iterieren werden die Artikel-Entities einzeln erzeugt.
+    """
+    __slots__ = (
+        'ids', 'namen', 'lagerstaende', 'kassa_bits', 'barcodes', 'extnrs',
+        'einheit_codes', 'einheiten', '_einheit_codes',
+        'gruppe_codes', 'gruppen', '_gruppe_codes', '_index'
+    )
+
+    def __init__(self) -> None:
+        self.ids: List[str] = []
+        self.namen: List[str] = []
+        self.lagerstaende = array('d')
+        self.kassa_bits = bytearray()
+        self.barcodes: List[str] = []
+        self.extnrs: List[str] = []
+        self.einheit_codes = array('I')
+        self.einheiten: List[str] = []
+        self._einheit_codes: Dict[str, int] = {}
+        self.gruppe_codes = array('I')
+        self.gruppen: List[str] = []
+        self._gruppe_codes: Dict[str, int] = {}
+        self._index: Optional["ArtikelIndex"] = None
+
+    @classmethod
+    def aus_artikeln(cls, artikel: Iterable[Artikel]) -> "ArtikelTabelle":
+        """Baut eine Tabelle aus einem (beliebig großen) Strom von Artikeln."""
+        tabelle = cls()
+        tabelle.erweitern(artikel)
+        return tabelle
+
+    @classmethod
+    def aus_spalten(cls, ids: List[str], namen: List[str], lagerstaende, kassa_bits, barcodes: List[str],
+                    extnrs: List[str], einheit_codes, einheiten: List[str], gruppe_codes, gruppen: List[str]) -> "ArtikelTabelle":
+        """
+        Baut eine Tabelle direkt aus fertigen Spalten (z.B. aus einem Binär-Cache).
+        Für die Zahlenspalten genügen Puffer mit Index-Zugriff wie memoryviews; eine
+        so erzeugte Tabelle ist dann nur lesbar.
+        """
+        tabelle = cls()
+        tabelle.ids, tabelle.namen, tabelle.barcodes, tabelle.extnrs = ids, namen, barcodes, extnrs
+        tabelle.lagerstaende, tabelle.kassa_bits = lagerstaende, kassa_bits
+        tabelle.einheit_codes, tabelle.einheiten = einheit_codes, einheiten
+        tabelle.gruppe_codes, tabelle.gruppen = gruppe_codes, gruppen
+        tabelle._einheit_codes = {wert: code for code, wert in enumerate(einheiten)}
+        tabelle._gruppe_codes = {wert: code for code, wert in enumerate(gruppen)}
+        return tabelle
+
+    @staticmethod
+    def _code_fuer(wert: str, codes: Dict[str, int], werte: List[str]) -> int:
+        """Liefert den Code eines Wertes und legt ihn bei Bedarf interniert an."""
+        code = codes.get(wert)
+        if code is None:
+            code = len(werte)
+            werte.append(sys.intern(wert))
+            codes[werte[code]] = code
+        return code
+
+    def anhaengen(self, artikel: Artikel) -> None:
+        """Fügt einen Artikel am Ende der Tabelle an."""
+        index = len(self.ids)
+        self._index = None
+        if index % 8 == 0:
+            self.kassa_bits.append(0)
+        if artikel.ist_kassaartikel:
+            self.kassa_bits[index >> 3] |= 1 << (index & 7)
+        self.ids.append(artikel.id)
+        self.namen.append(artikel.name)
+        self.lagerstaende.append(artikel.lagerstand)
+        self.barcodes.append(artikel.barcode)
+        self.extnrs.append(artikel.extnr)
+        self.einheit_codes.append(self._code_fuer(artikel.einheit, self._einheit_codes, self.einheiten))
+        self.gruppe_codes.append(self._code_fuer(artikel.gruppe, self._gruppe_codes, self.gruppen))
+
+    def erweitern(self, artikel: Iterable[Artikel]) -> None:
+        """Fügt mehrere Artikel am Ende der Tabelle an."""
+        for art in artikel:
+            self.anhaengen(art)
+
+    def index(self) -> "ArtikelIndex":
+        """Die Nachschlage-Indizes der Tabelle; werden einmal angelegt und beim Anhängen verworfen."""
+        if self._index is None:
+            self._index = ArtikelIndex(self)
+        return self._index
+
+    def einheit_code(self, einheit: str) -> Optional[int]:
+        """Gibt den Code einer Einheit zurück oder None, wenn sie in der Tabelle nicht vorkommt."""
+        return self._einheit_codes.get(einheit)
+
+    def ist_kassaartikel(self, index: int) -> bool:
+        """Liest das Kassa-Bit des Artikels an Position `index`."""
+        return bool(self.kassa_bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Artikel:
+        if index < 0:
+            index += len(self.ids)
+        if not 0 <= index < len(self.ids):
+            raise IndexError("Artikelindex außerhalb der Tabelle")
+        return Artikel(
+            id=self.ids[index],
+            name=self.namen[index],
+            lagerstand=self.lagerstaende[index],
+            ist_kassaartikel=self.ist_kassaartikel(index),
+            einheit=self.einheiten[self.einheit_codes[index]],
+            barcode=self.barcodes[index],
+            extnr=self.extnrs[index],
+            gruppe=self.gruppen[self.gruppe_codes[index]]
+        )
+
+    def __iter__(self) -> Iterator[Artikel]:
+        for index in range(len(self.ids)):
+            yield self[index]
+
+
+class ArtikelIndex:
+    """
+    Hash-Indizes über eine ArtikelTabelle nach Position: ID -> erste Position sowie
+    Barcode, externe Nummer, Gruppe und Einheit -> Positionen (array('I')). Gruppe und
+    Einheit nutzen die Codes der Tabelle. Die Artikel bleiben spaltenweise in der Tabelle,
+    erst die Treffer werden als Artikel erzeugt. Jede Spalte wird beim ersten Zugriff
+    indiziert, `aufbauen()` legt alle sofort an (z.B. direkt nach dem Laden).
+    """
+    __slots__ = ('tabelle', '_nach_id', '_nach_wert', '_nach_code')
+
+    TEXT_SPALTEN = ('barcodes', 'extnrs')
+    CODE_SPALTEN = ('einheit', 'gruppe')
+
+    def __init__(self, tabelle: ArtikelTabelle):
+        self.tabelle = tabelle
+        self._nach_id: Optional[Dict[str, int]] = None
+        self._nach_wert: Dict[str, Dict[str, array]] = {}
+        self._nach_code: Dict[str, List[array]] = {}
+
+    def aufbauen(self) -> "ArtikelIndex":
+        """Legt alle Indizes sofort an."""
+        self._id_index()
+        for spalte in self.TEXT_SPALTEN:
+            self._wert_index(spalte)
+        for spalte in self.CODE_SPALTEN:
+            self._code_index(spalte)
+        return self
+
+    def _id_index(self) -> Dict[str, int]:
+        if self._nach_id is None:
+            nach_id: Dict[str, int] = {}
+            for position, artikel_id in enumerate(self.tabelle.ids):
+                nach_id.setdefault(artikel_id, position)
+            self._nach_id = nach_id
+        return self._nach_id
+
+    def _wert_index(self, spalte: str) -> Dict[str, array]:
+        index = self._nach_wert.get(spalte)
+        if index is None:
+            index = {}
+            for position, wert in enumerate(getattr(self.tabelle, spalte)):
+                # Leere Barcodes/Nummern werden nicht indiziert
+                if wert:
+                    positionen = index.get(wert)
+                    if positionen is None:
+                        positionen = index[wert] = array('I')
+                    positionen.append(position)
+            self._nach_wert[spalte] = index
+        return index
+
+    def _code_index(self, spalte: str) -> List[array]:
+        index = self._nach_code.get(spalte)
+        if index is None:
+            index = [array('I') for _ in getattr(self.tabelle, f"_{spalte}_codes")]
+            for position, code in enumerate(getattr(self.tabelle, f"{spalte}_codes")):
+                index[code].append(position)
+            self._nach_code[spalte] = index
+        return index
+
+    def _code_positionen(self, spalte: str, wert: str) -> array:
+        code = getattr(self.tabelle, f"_{spalte}_codes").get(wert) if wert else None
+        return array('I') if code is None else self._code_index(spalte)[code]
+
+    def _artikel(self, positionen: array) -> List[Artikel]:
+        return [self.tabelle[position] for position in positionen]
+
+    def position_nach_id(self, artikel_id: str) -> Optional[int]:
+        """Position des Artikels mit der ID (bei doppelten IDs des ersten) oder None."""
+        return self._id_index().get(artikel_id)
+
+    def finde_nach_id(self, artikel_id: str) -> Optional[Artikel]:
+        position = self.position_nach_id(artikel_id)
+        return None if position is None else self.tabelle[position]
+
+    def positionen_nach_barcode(self, barcode: str) -> array:
+        """Positionen aller Artikel mit diesem Barcode (Barcodes sind in Lotzapp nicht zwingend eindeutig)."""
+        return self._wert_index('barcodes').get(barcode, array('I'))
+
+    def finde_nach_barcode(self, barcode: str) -> List[Artikel]:
+        return self._artikel(self.positionen_nach_barcode(barcode))
+
+    def positionen_nach_extnr(self, extnr: str) -> array:
+        """Positionen aller Artikel mit dieser externen Artikelnummer."""
+        return self._wert_index('extnrs').get(extnr, array('I'))
+
+    def finde_nach_extnr(self, extnr: str) -> List[Artikel]:
+        return self._artikel(self.positionen_nach_extnr(extnr))
+
+    def positionen_der_gruppe(self, gruppe: str) -> array:
+        """Positionen aller Artikel einer Artikelgruppe."""
+        return self._code_positionen('gruppe', gruppe)
+
+    def artikel_der_gruppe(self, gruppe: str) -> List[Artikel]:
+        return self._artikel(self.positionen_der_gruppe(gruppe))
+
+    def positionen_mit_einheit(self, einheit: str) -> array:
+        """Positionen aller Artikel mit der Einheit (z.B. 'Stück' oder 'kg')."""
+        return self._code_positionen('einheit', einheit)
+
+    def artikel_mit_einheit(self, einheit: str) -> List[Artikel]:
+        return self._artikel(self.positionen_mit_einheit(einheit))
@@ -0,0 +1,78 @@
+from typing import List, Dict, Any, Optional, Collection, Set, Tuple
+
+
+class ErgebnisIndex:
+    """
+    Hält eine verarbeitete Ergebnismenge und beantwortet gefilterte, sortierte und
+    seitenweise Abfragen darauf. Pro Filterspalte wird beim Aufbau einmalig ein Index
+    (Wert -> Zeilenpositionen) angelegt, Sortierreihenfolgen werden bei der ersten
+    Verwendung berechnet und wiederverwendet.
+    """
+
+    FILTER_SPALTEN = ('ändern_auf', 'einheit', 'gruppe')
+    SORTIER_SPALTEN = ('Name', 'ID', 'gruppe', 'barcode', 'extnr', 'ändern_auf', 'einheit')
+
+    def __init__(self, ergebnisse: List[Dict[str, Any]]):
+        self.ergebnisse = ergebnisse
+        self._indizes: Dict[str, Dict[str, List[int]]] = {spalte: {} for spalte in self.FILTER_SPALTEN}
+        for position, zeile in enumerate(ergebnisse):
+            for spalte, index in self._indizes.items():
+                index.setdefault(zeile.get(spalte) or '', []).append(position)
+        self._sortierungen: Dict[str, List[int]] = {}
+
+    def werte(self, spalte: str) -> List[str]:
+        """Alle vorkommenden Werte einer Filterspalte (z.B. für Auswahllisten)."""
+        return sorted(self._indizes[spalte])
+
+    def _positionen(self, spalte: str, werte: Collection[str]) -> Set[int]:
+        index = self._indizes[spalte]
+        treffer: Set[int] = set()
+        for wert in werte:
+            treffer.update(index.get(wert, ()))
+        return treffer
+
+    def _sortierung(self, spalte: str) -> List[int]:
+        reihenfolge = self._sortierungen.get(spalte)
+        if reihenfolge is None:
+            werte = [zeile.get(spalte) or '' for zeile in self.ergebnisse]
+            if spalte in ('ID', 'gruppe'):
+                # Numerische IDs auch numerisch sortieren, nicht-numerische dahinter
+                schluessel = lambda i: (0, int(werte[i]), '') if werte[i].isdigit() else (1, 0, werte[i])
+            else:
+                schluessel = lambda i: werte[i].casefold()
+            reihenfolge = sorted(range(len(werte)), key=schluessel)
+            self._sortierungen[spalte] = reihenfolge
+        return reihenfolge
+
+    def abfragen(self, status: Optional[Collection[str]] = None, einheiten: Optional[Collection[str]] = None,
+                 gruppe: Optional[str] = None, sortierung: Optional[str] = None, absteigend: bool = False,
+                 offset: int = 0, limit: Optional[int] = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Filtert nach Status (Ja/Nein), Einheiten und Gruppe, sortiert optional nach einer Spalte
+        und liefert die Gesamtzahl der Treffer sowie die angefragte Seite.
+        Ein Filter mit None ist inaktiv; eine leere Auswahl liefert keine Treffer.
+        """
+        if sortierung is not None and sortierung not in self.SORTIER_SPALTEN:
+            raise ValueError(f"Nach '{sortierung}' kann nicht sortiert werden.")
+
+        treffer: Optional[Set[int]] = None
+        for spalte, werte in (('ändern_auf', status), ('einheit', einheiten), ('gruppe', None if gruppe is None else [gruppe])):
+            if werte is None:
+                continue
+            positionen = self._positionen(spalte, werte)
+            treffer = positionen if treffer is None else treffer & positionen
+
+        if sortierung is None:
+            reihenfolge = sorted(treffer) if treffer is not None else range(len(self.ergebnisse))
+            if absteigend:
+                reihenfolge = list(reversed(reihenfolge))
+        else:
+            reihenfolge = self._sortierung(sortierung)
+            if absteigend:
+                reihenfolge = reihenfolge[::-1]
+            if treffer is not None:
+                reihenfolge = [i for i in reihenfolge if i in treffer]
+
+        gesamt = len(reihenfolge)
+        ende = gesamt if limit is None else offset + limit
+        return gesamt, [self.ergebnisse[i] for i in reihenfolge[offset:ende]]
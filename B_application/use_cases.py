@@ -1,5 +1,18 @@
-from typing import List, Dict, Any
-from A_domain.models import Artikel
+import logging
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional
+from A_domain.models import Artikel, ArtikelTabelle
+
+logger = logging.getLogger(__name__)
+
+
+def _lade_numpy():
+    """Importiert NumPy erst bei Bedarf; gibt None zurück, wenn es nicht installiert ist."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
 
 class ArtikelSyncUseCase:
     """
@@ -8,47 +21,127 @@ class ArtikelSyncUseCase:
     Ausgabeform (Datei, Web-UI).
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Mapping[str, Any], bestandsverlauf: Optional[Mapping[str, bool]] = None):
         """
         Initialisiert den Use Case mit den notwendigen Einstellungen.
+        Mit `bestandsverlauf` (Artikel-ID -> über die letzten Exporte durchgehend vorrätig
+        True bzw. durchgehend leer False) werden nur Vorschläge ausgegeben, die der Verlauf
+        bestätigt; Artikel, die zwischen leer und vorrätig pendeln, bleiben unverändert.
         """
         self.config = config
+        self.bestandsverlauf = bestandsverlauf
         self.stueck_filter_aktiv = bool(config.get("stueckartikel_aussortieren", 0))
         self.nur_Änderungen_zu_JA_ausgeben = bool(config.get("nur_Änderungen_zu_JA_ausgeben", 0))
+        self.vektorisiert = bool(config.get("vektorisierte_berechnung", 0))
 
-    def execute(self, artikel_liste: List[Artikel]) -> List[Dict[str, Any]]:
+    def execute(self, artikel_liste: Iterable[Artikel]) -> List[Dict[str, Any]]:
         """
         Führt den Abgleich für eine Liste von Artikeln durch.
         Wendet Filter an und nutzt die Domain-Logik der Artikel-Klasse.
         
         Gibt eine Liste von Dictionaries mit den Änderungsvorschlägen zurück.
+        Ist die vektorisierte Berechnung konfiguriert und liegt eine ArtikelTabelle vor,
+        wird der NumPy-Batch-Modus genutzt (sofern NumPy installiert ist).
         """
-        ergebnisse = []
-        
-        for art in artikel_liste:
+        if self.vektorisiert and isinstance(artikel_liste, ArtikelTabelle):
+            if _lade_numpy() is not None:
+                return self.execute_batch(artikel_liste)
+            logger.warning("NumPy ist nicht installiert, die Berechnung erfolgt artikelweise.")
+        return list(self.execute_stream(artikel_liste))
+
+    def execute_batch(self, tabelle: ArtikelTabelle) -> List[Dict[str, Any]]:
+        """
+        Berechnet Soll-Status und Filter für eine komplette ArtikelTabelle in einem
+        Durchlauf als boolesche Masken über die Spalten (NumPy).
+        Liefert dieselben Ergebnisse in derselben Reihenfolge wie execute_stream.
+        """
+        np = _lade_numpy()
+        if np is None:
+            raise RuntimeError("Für die vektorisierte Berechnung wird NumPy benötigt.")
+
+        anzahl = len(tabelle)
+        if anzahl == 0:
+            return []
+
+        lagerstaende = np.frombuffer(tabelle.lagerstaende, dtype=np.float64)
+        kassa = np.unpackbits(np.frombuffer(tabelle.kassa_bits, dtype=np.uint8), bitorder='little')[:anzahl].astype(bool)
+
+        # Gleiche Regeln wie Artikel.berechne_soll_status (NaN ergibt weder Ja noch Nein)
+        soll_ja = (lagerstaende > 0) & ~kassa
+        soll_nein = (lagerstaende <= 0) & kassa
+
+        if self.bestandsverlauf is not None:
+            verlauf = self.bestandsverlauf
+            # 1 = durchgehend vorrätig, 0 = durchgehend leer, -1 = kein stabiler Verlauf
+            stabil = np.fromiter(
+                (-1 if (wert := verlauf.get(art_id)) is None else int(wert) for art_id in tabelle.ids),
+                dtype=np.int8, count=anzahl
+            )
+            soll_ja = soll_ja & (stabil == 1)
+            soll_nein = soll_nein & (stabil == 0)
+
+        maske = soll_ja if self.nur_Änderungen_zu_JA_ausgeben else soll_ja | soll_nein
+
+        if self.stueck_filter_aktiv:
+            # Positionen der Stückartikel aus dem Einheiten-Index der Tabelle statt eines Vergleichs über alle Zeilen
+            stueck = tabelle.index().positionen_mit_einheit('Stück')
+            if stueck:
+                maske = maske.copy()
+                maske[np.frombuffer(stueck, dtype=np.dtype(f"u{stueck.itemsize}"))] = False
+
+        # Nur die Treffer werden in Dictionaries überführt, direkt aus den Spalten
+        ids, namen, barcodes, extnrs = tabelle.ids, tabelle.namen, tabelle.barcodes, tabelle.extnrs
+        einheiten, einheit_codes = tabelle.einheiten, tabelle.einheit_codes
+        gruppen, gruppe_codes = tabelle.gruppen, tabelle.gruppe_codes
+        treffer = np.flatnonzero(maske)
+        return [
+            {
+                'Name': namen[index],
+                'ID': ids[index],
+                'barcode': barcodes[index],
+                'extnr': extnrs[index],
+                'ändern_auf': 'Ja' if ist_ja else 'Nein',
+                'einheit': einheiten[einheit_codes[index]],
+                'gruppe': gruppen[gruppe_codes[index]]
+            }
+            for index, ist_ja in zip(treffer.tolist(), soll_ja[treffer].tolist())
+        ]
+
+    def execute_stream(self, artikel: Iterable[Artikel]) -> Iterator[Dict[str, Any]]:
+        """
+        Streaming-Variante von execute: verarbeitet die Artikel einzeln und
+        liefert jeden Änderungsvorschlag, sobald er feststeht.
+        """
+        for art in artikel:
             # 1. Soll-Status berechnen (Domain Logik aus dem Model)
             soll_status = art.berechne_soll_status()
             if not soll_status:
                 # Kein Handlungsbedarf für diesen Artikel
                 continue
             
-            # 2. Stückartikel-Filter (falls konfiguriert)
+            # 2. Nur vom Bestandsverlauf bestätigte Änderungen (falls übergeben)
+            if self.bestandsverlauf is not None and self.bestandsverlauf.get(art.id) != (soll_status == 'Ja'):
+                continue
+
+            # 3. Stückartikel-Filter (falls konfiguriert)
             if self.stueck_filter_aktiv and art.einheit == 'Stück':
                 continue
             
-            # 3. Filter nach 'Nur Ja' (falls konfiguriert)
+            # 4. Filter nach 'Nur Ja' (falls konfiguriert)
             if self.nur_Änderungen_zu_JA_ausgeben and soll_status != 'Ja':
                 continue
             
-            # Mapping der Ergebnisse für die Präsentationsschicht
-            ergebnisse.append({
-                'Name': art.name,
-                'ID': art.id,
-                'barcode': art.barcode,
-                'extnr': art.extnr,
-                'ändern_auf': soll_status,
-                'einheit': art.einheit,
-                'gruppe': art.gruppe
-            })
-            
-        return ergebnisse
+            yield self._ergebnis_zeile(art, soll_status)
+
+    @staticmethod
+    def _ergebnis_zeile(art: Artikel, soll_status: str) -> Dict[str, Any]:
+        """Mapping der Ergebnisse für die Präsentationsschicht."""
+        return {
+            'Name': art.name,
+            'ID': art.id,
+            'barcode': art.barcode,
+            'extnr': art.extnr,
+            'ändern_auf': soll_status,
+            'einheit': art.einheit,
+            'gruppe': art.gruppe
+        }
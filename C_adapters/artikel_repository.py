@@ -1,81 +1,368 @@
 import os
+import hashlib
+import itertools
 from datetime import datetime
-from typing import List, Dict, Any, Optional
-from A_domain.models import Artikel, KassaartikelMissingException
-from D_infrastructure import file_handler
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Iterable, Iterator, Mapping, Tuple, BinaryIO
+from A_domain.models import Artikel, ArtikelTabelle, KassaartikelMissingException, UngueltigerExportException
+from C_adapters.konfiguration import KonfigurationsAnbieter
+from D_infrastructure import file_handler, binaer_cache, instrumentierung
+
+if TYPE_CHECKING:
+    from D_infrastructure.bestands_journal import SqliteBestandsJournal
 
 CONFIG_DATEI = "config.json"
+konfigurations_anbieter = KonfigurationsAnbieter(CONFIG_DATEI)
 OUTPUT_ORDNER = "output"
 BASIS_DATEINAME = "vorschlaege_IN_KASSA.csv"
 
-def lade_konfiguration() -> Dict[str, Any]:
-    """Lädt die Konfiguration und stellt Standardwerte bereit."""
-    config = file_handler.lese_json(CONFIG_DATEI)
-    standard_config = {
-        "mode": "local",
-        "nur_Änderungen_zu_JA_ausgeben": 0,
-        "stueckartikel_aussortieren": 0,
-        "postfix_outputdatei_web": "vorschlaege_IN_KASSA"
-    }
-    # Mergen mit Standardwerten
-    for key, value in standard_config.items():
-        if key not in config:
-            config[key] = value
-    return config
+# Die einzigen Spalten des Lotzapp-Exports, die für den Abgleich benötigt werden
+ARTIKEL_SPALTEN = ('ID', 'name', 'lagerstand', 'kassaartikel', 'einheit', 'barcode', 'extnr', 'gruppe')
+# Ohne diese Spalten ist ein Abgleich nicht möglich; die übrigen sind optional
+PFLICHT_SPALTEN = ('ID', 'name', 'lagerstand', 'kassaartikel', 'einheit')
+
+KASSAARTIKEL_FEHLT_MELDUNG = "Aktiviere die Checkbox in LotzApp, damit das CSV in der Spalte kassaartikel Werte hat."
+KODIERUNG_MELDUNG = ("Die Datei ist nicht UTF-8-kodiert (z.B. in Excel neu gespeichert). "
+                     "Bitte den Lotzapp-Export unverändert hochladen.")
+FEHLER_LAGERSTAND = "lagerstand_ungueltig"
+FEHLER_KASSAARTIKEL = "kassaartikel_leer"
+
+class FehlerBericht:
+    """
+    Sammelt beim Mapping übersprungene Zeilen: die Anzahl je Fehlerart und die IDs der
+    ersten Zeilen als Beispiele. Ersetzt die frühere Konsolenausgabe pro Zeile.
+    """
+    MAX_BEISPIELE = 10
+
+    def __init__(self):
+        self.anzahl: Dict[str, int] = {}
+        self.beispiele: Dict[str, List[str]] = {}
+
+    def erfasse(self, fehlerart: str, artikel_id: Optional[str]) -> None:
+        self.anzahl[fehlerart] = self.anzahl.get(fehlerart, 0) + 1
+        beispiele = self.beispiele.setdefault(fehlerart, [])
+        if len(beispiele) < self.MAX_BEISPIELE:
+            beispiele.append(artikel_id or '')
+
+    @property
+    def gesamt(self) -> int:
+        return sum(self.anzahl.values())
+
+    def als_dict(self) -> Dict[str, Any]:
+        """JSON-taugliche Form, z.B. für die API-Antwort oder die Batch-Zusammenfassung."""
+        return {
+            "gesamt": self.gesamt,
+            "fehlerarten": {
+                art: {"anzahl": anzahl, "beispiel_ids": self.beispiele[art]}
+                for art, anzahl in self.anzahl.items()
+            },
+        }
+
+    def zusammenfassung(self) -> str:
+        """Eine Zeile für die Konsole, z.B. '3 Zeilen übersprungen: lagerstand_ungueltig 3 (IDs 7, 9, 12)'."""
+        teile = [
+            f"{art} {anzahl} (IDs {', '.join(self.beispiele[art])}{', ...' if anzahl > len(self.beispiele[art]) else ''})"
+            for art, anzahl in self.anzahl.items()
+        ]
+        return f"{self.gesamt} Zeilen übersprungen: " + "; ".join(teile)
+
+    def uebernehme(self, daten: Mapping[str, Any]) -> None:
+        """Ergänzt Anzahlen und Beispiel-IDs aus der Form von als_dict (z.B. aus dem Binär-Cache)."""
+        for art, eintrag in daten.get("fehlerarten", {}).items():
+            self.anzahl[art] = self.anzahl.get(art, 0) + eintrag["anzahl"]
+            beispiele = self.beispiele.setdefault(art, [])
+            beispiele.extend(eintrag["beispiel_ids"][:self.MAX_BEISPIELE - len(beispiele)])
+
+
+def lade_konfiguration() -> Mapping[str, Any]:
+    """
+    Liefert die validierte Konfiguration mit Standardwerten. Sie ist unveränderlich und wird
+    nur neu gelesen, wenn sich config.json geändert hat; Abweichungen für eine einzelne
+    Anfrage über konfiguration.mit_ueberschreibungen().
+    """
+    return konfigurations_anbieter.aktuell()
+
+def pruefe_export_struktur(header: List[str], stichprobe: List[List[str]]) -> None:
+    """
+    Schnelle Formatprüfung anhand von Header und den ersten Datenzeilen, bevor die ganze
+    Datei geparst wird. Löst UngueltigerExportException bzw. KassaartikelMissingException aus.
+    """
+    if not header:
+        raise UngueltigerExportException("Die Datei ist leer.")
+    if len(header) == 1 and (',' in header[0] or '\t' in header[0]):
+        raise UngueltigerExportException("Die Datei ist nicht mit Semikolon getrennt. Bitte den Lotzapp-Export unverändert hochladen.")
+    fehlend = [spalte for spalte in PFLICHT_SPALTEN if spalte not in header]
+    if fehlend:
+        raise UngueltigerExportException(f"Im Export fehlen die Spalten: {', '.join(fehlend)}.")
+    if not stichprobe:
+        raise UngueltigerExportException("Keine gültigen Artikeldaten gefunden.")
+
+    kassa_index = header.index('kassaartikel')
+    if all(len(zeile) <= kassa_index or not zeile[kassa_index].strip() for zeile in stichprobe):
+        raise KassaartikelMissingException(KASSAARTIKEL_FEHLT_MELDUNG)
+
+def pruefe_exportdatei(dateipfad: str) -> None:
+    """Formatprüfung einer Exportdatei anhand ihres Anfangs (siehe pruefe_export_struktur)."""
+    try:
+        stichprobe = file_handler.lese_stichprobe_csv(dateipfad)
+    except UnicodeDecodeError as e:
+        raise UngueltigerExportException(KODIERUNG_MELDUNG) from e
+    pruefe_export_struktur(*stichprobe)
+
+def pruefe_upload(datei: BinaryIO) -> None:
+    """Formatprüfung eines Uploads anhand des ersten Blocks (siehe pruefe_export_struktur)."""
+    try:
+        stichprobe = file_handler.lese_stichprobe_binaerdatei(datei)
+    except UnicodeDecodeError as e:
+        raise UngueltigerExportException(KODIERUNG_MELDUNG) from e
+    pruefe_export_struktur(*stichprobe)
+
+def _gemessen_gemappt(werte: Iterable[Tuple[Optional[str], ...]], bericht: Optional[FehlerBericht] = None) -> Iterable[Artikel]:
+    """Mappt projizierte Werte und misst dabei Parsen und Mapping als getrennte Stufen."""
+    return instrumentierung.gemessener_strom(
+        "mapping", _map_csv_werte_zu_artikel(instrumentierung.gemessener_strom("parsen", werte), bericht)
+    )
+
+def iter_artikel_aus_csv(dateipfad: str, bericht: Optional[FehlerBericht] = None) -> Iterator[Artikel]:
+    """Liest eine CSV-Datei zeilenweise und liefert die Artikel-Entities als Strom."""
+    return iter(_gemessen_gemappt(file_handler.iter_csv_projiziert(dateipfad, ARTIKEL_SPALTEN), bericht))
+
+def iter_artikel_aus_string(inhalt: str, bericht: Optional[FehlerBericht] = None) -> Iterator[Artikel]:
+    """Parst CSV-Inhalt aus einem String und liefert die Artikel-Entities als Strom."""
+    return _map_csv_werte_zu_artikel(file_handler.iter_csv_string_projiziert(inhalt, ARTIKEL_SPALTEN), bericht)
+
+def iter_artikel_aus_binaerdatei(datei: BinaryIO, max_bytes: Optional[int] = None,
+                                 bericht: Optional[FehlerBericht] = None) -> Iterator[Artikel]:
+    """Liest eine Binärdatei (z.B. einen Upload) blockweise und liefert die Artikel-Entities als Strom."""
+    return iter(_gemessen_gemappt(file_handler.iter_binaerdatei_projiziert(datei, ARTIKEL_SPALTEN, max_bytes), bericht))
 
 def lade_artikel_aus_csv(dateipfad: str) -> List[Artikel]:
     """Lädt Rohdaten und mappt sie auf Artikel-Entities."""
-    rohdaten = file_handler.lese_csv(dateipfad)
-    return _map_csv_daten_zu_artikel_liste(rohdaten)
+    return list(iter_artikel_aus_csv(dateipfad))
 
 def lade_artikel_aus_string(inhalt: str) -> List[Artikel]:
     """Parst CSV-Inhalt aus einem String und mappt ihn auf Artikel-Entities."""
-    rohdaten = file_handler.parse_csv_string(inhalt)
-    return _map_csv_daten_zu_artikel_liste(rohdaten)
+    return list(iter_artikel_aus_string(inhalt))
+
+def lade_artikel_tabelle_aus_csv(dateipfad: str, mit_binaer_cache: bool = False,
+                                 bericht: Optional[FehlerBericht] = None) -> ArtikelTabelle:
+    """
+    Lädt eine CSV-Datei direkt in die speichersparende, spaltenorientierte ArtikelTabelle.
+    Mit `mit_binaer_cache` wird ein gültiger Binär-Cache neben der CSV per mmap geladen
+    (ohne erneutes Parsen); fehlt er oder ist er veraltet, wird er nach dem Parsen geschrieben.
+    Geschrieben wird nur nach einem vollständigen Durchlauf: Lesefehler werden weitergegeben.
+    Die übersprungenen Zeilen werden mit dem Cache gespeichert und auch beim Laden aus dem
+    Cache im `bericht` gemeldet.
+    """
+    if not mit_binaer_cache:
+        return ArtikelTabelle.aus_artikeln(iter_artikel_aus_csv(dateipfad, bericht))
 
-def exportiere_ergebnisse(ergebnisse: List[Dict[str, Any]], felder: List[str]) -> None:
-    """Bereitet den Exportpfad vor und schreibt die CSV."""
-    if not ergebnisse:
-        return
+    cache_pfad = binaer_cache.cache_pfad_fuer(dateipfad)
+    spalten = binaer_cache.lade_spalten(cache_pfad, dateipfad)
+    if spalten is not None:
+        _melde_zeilenfehler(spalten["zusatz"].get("zeilenfehler", {}), bericht)
+        return ArtikelTabelle.aus_spalten(
+            ids=spalten["ids"], namen=spalten["namen"], lagerstaende=spalten["lagerstaende"],
+            kassa_bits=spalten["kassa_bits"], barcodes=spalten["barcodes"], extnrs=spalten["extnrs"],
+            einheit_codes=spalten["einheit_codes"], einheiten=spalten["einheiten"],
+            gruppe_codes=spalten["gruppe_codes"], gruppen=spalten["gruppen"]
+        )
 
+    kennung = binaer_cache.quell_kennung(dateipfad)
+    # Der Cache braucht den vollständigen Bericht, unabhängig davon, ob der Aufrufer einen übergibt
+    cache_bericht = FehlerBericht()
+    tabelle = ArtikelTabelle.aus_artikeln(iter_artikel_aus_csv(dateipfad, cache_bericht))
+    zeilenfehler = cache_bericht.als_dict()
+    binaer_cache.schreibe_spalten(
+        cache_pfad, kennung, len(tabelle),
+        zahlen_spalten={
+            "lagerstaende": ("d", tabelle.lagerstaende),
+            "kassa_bits": ("B", tabelle.kassa_bits),
+            "einheit_codes": ("I", tabelle.einheit_codes),
+            "gruppe_codes": ("I", tabelle.gruppe_codes),
+        },
+        text_spalten={
+            "ids": tabelle.ids, "namen": tabelle.namen, "barcodes": tabelle.barcodes,
+            "extnrs": tabelle.extnrs, "einheiten": tabelle.einheiten, "gruppen": tabelle.gruppen,
+        },
+        zusatz={"zeilenfehler": zeilenfehler}
+    )
+    _melde_zeilenfehler(zeilenfehler, bericht)
+    return tabelle
+
+def _melde_zeilenfehler(zeilenfehler: Mapping[str, Any], bericht: Optional[FehlerBericht]) -> None:
+    """
+    Überträgt gespeicherte Zeilenfehler (Form von FehlerBericht.als_dict) in den `bericht`.
+    Ohne Bericht führt ein leerer kassaartikel-Wert wie beim Parsen zur KassaartikelMissingException.
+    """
+    if bericht is not None:
+        bericht.uebernehme(zeilenfehler)
+    elif FEHLER_KASSAARTIKEL in zeilenfehler.get("fehlerarten", {}):
+        raise KassaartikelMissingException(KASSAARTIKEL_FEHLT_MELDUNG)
+
+def lade_artikel_tabelle_aus_string(inhalt: str) -> ArtikelTabelle:
+    """Parst CSV-Inhalt aus einem String direkt in eine ArtikelTabelle."""
+    return ArtikelTabelle.aus_artikeln(iter_artikel_aus_string(inhalt))
+
+def lade_artikel_tabelle_aus_binaerdatei(datei: BinaryIO, max_bytes: Optional[int] = None,
+                                         bericht: Optional[FehlerBericht] = None) -> ArtikelTabelle:
+    """
+    Liest eine Binärdatei blockweise direkt in eine ArtikelTabelle. Ist die Datei erst nach
+    dem geprüften Anfang nicht UTF-8-kodiert, gilt sie ebenfalls als ungültiger Export.
+    """
+    try:
+        return ArtikelTabelle.aus_artikeln(iter_artikel_aus_binaerdatei(datei, max_bytes, bericht))
+    except UnicodeDecodeError as e:
+        raise UngueltigerExportException(KODIERUNG_MELDUNG) from e
+
+def exportiere_ergebnisse(ergebnisse: Iterable[Dict[str, Any]], felder: List[str]) -> int:
+    """
+    Bereitet den Exportpfad vor und schreibt die CSV.
+    Die Ergebnisse werden gestreamt geschrieben; gibt die Anzahl der Zeilen zurück.
+    """
     zeitstempel = datetime.now().strftime("%y%m%d %H%M")
     dateiname = f"{zeitstempel}_{BASIS_DATEINAME}"
     ausgabe_pfad = os.path.join(OUTPUT_ORDNER, dateiname)
     
-    file_handler.schreibe_csv(ausgabe_pfad, ergebnisse, felder)
-    print(f"Ergebnis erfolgreich in {ausgabe_pfad} geschrieben.")
+    anzahl = exportiere_ergebnisse_nach(ausgabe_pfad, ergebnisse, felder)
+    if anzahl:
+        print(f"Ergebnis erfolgreich in {ausgabe_pfad} geschrieben.")
+    return anzahl
+
+def ausgabe_pfad_fuer(eingabe_pfad: str, basis_ordner: Optional[str] = None) -> str:
+    """
+    Leitet den Namen der Ergebnisdatei im Output-Ordner aus dem Namen der Eingabedatei ab.
+    Liegt die Datei unterhalb von `basis_ordner` in einem Unterordner (z.B. ein Ordner je
+    Filiale), wird dessen relativer Pfad vorangestellt, damit gleichnamige Exporte
+    verschiedener Ordner sich nicht überschreiben.
+    """
+    basisname = os.path.splitext(os.path.basename(eingabe_pfad))[0]
+    if basis_ordner is not None:
+        relativ = os.path.relpath(os.path.dirname(os.path.abspath(eingabe_pfad)), os.path.abspath(basis_ordner))
+        if relativ != os.curdir:
+            basisname = f"{relativ.replace(os.sep, '_')}_{basisname}"
+    return os.path.join(OUTPUT_ORDNER, f"{basisname}_{BASIS_DATEINAME}")
 
-def erzeuge_export_string(ergebnisse: List[Dict[str, Any]], felder: List[str]) -> str:
+def exportiere_ergebnisse_nach(ausgabe_pfad: str, ergebnisse: Iterable[Dict[str, Any]], felder: List[str]) -> int:
+    """
+    Schreibt die Ergebnisse gestreamt nach `ausgabe_pfad`. Ohne Ergebnisse wird keine
+    Datei angelegt. Gibt die Anzahl der geschriebenen Zeilen zurück.
+    """
+    ergebnisse = iter(ergebnisse)
+    erstes = next(ergebnisse, None)
+    if erstes is None:
+        return 0
+    return file_handler.schreibe_csv(ausgabe_pfad, itertools.chain([erstes], ergebnisse), felder)
+
+def erzeuge_export_string(ergebnisse: Iterable[Dict[str, Any]], felder: List[str]) -> str:
     """Erzeugt einen CSV-String für den Export."""
     return file_handler.generiere_csv_string(ergebnisse, felder)
 
-def _map_csv_daten_zu_artikel_liste(daten: List[Dict[str, str]]) -> List[Artikel]:
+def erzeuge_export_chunks(ergebnisse: Iterable[Dict[str, Any]], felder: List[str], mit_bom: bool = False) -> Iterator[bytes]:
+    """Erzeugt den CSV-Export blockweise als Bytes, z.B. für einen Streaming-Download."""
+    chunks = file_handler.generiere_csv_chunks(ergebnisse, felder, mit_bom=mit_bom)
+    zeilen = len(ergebnisse) if isinstance(ergebnisse, list) else 0
+    return iter(instrumentierung.gemessener_strom("export", chunks, block=1, zeilen=zeilen))
+
+def berechne_artikel_hash(artikel: Artikel) -> str:
+    """Berechnet einen kurzen Inhalts-Hash über alle für den Abgleich relevanten Felder."""
+    inhalt = "\x1f".join((
+        artikel.id, artikel.name, repr(artikel.lagerstand), '1' if artikel.ist_kassaartikel else '0',
+        artikel.einheit, artikel.barcode, artikel.extnr, artikel.gruppe
+    ))
+    return hashlib.blake2b(inhalt.encode('utf-8'), digest_size=8).hexdigest()
+
+def lade_snapshot(dateipfad: str) -> Dict[str, str]:
+    """Lädt den Snapshot (Artikel-ID -> Inhalts-Hash) des zuletzt verarbeiteten Exports."""
+    return file_handler.lese_json(dateipfad).get("artikel", {})
+
+def speichere_snapshot(dateipfad: str, snapshot: Dict[str, str], quelle: str) -> None:
+    """Speichert den Snapshot des gerade verarbeiteten Exports für den nächsten Lauf."""
+    file_handler.schreibe_json(dateipfad, {
+        "quelle": quelle,
+        "erstellt": datetime.now().isoformat(timespec="seconds"),
+        "artikel": snapshot
+    })
+
+def filtere_geaenderte_artikel(artikel: Iterable[Artikel], alter_snapshot: Dict[str, str],
+                               neuer_snapshot: Dict[str, str]) -> Iterator[Artikel]:
+    """
+    Liefert nur Artikel, die neu sind oder sich seit dem alten Snapshot geändert haben.
+    Nebenbei wird `neuer_snapshot` mit den Hashes aller Artikel befüllt.
+    """
+    for art in artikel:
+        artikel_hash = berechne_artikel_hash(art)
+        neuer_snapshot[art.id] = artikel_hash
+        if alter_snapshot.get(art.id) != artikel_hash:
+            yield art
+
+def pruefsumme_datei(dateipfad: str) -> str:
+    """SHA-256 einer Exportdatei, z.B. um denselben Export im Bestandsjournal wiederzuerkennen."""
+    with open(dateipfad, 'rb') as datei:
+        return file_handler.pruefsumme_binaerdatei(datei)[0]
+
+_bestands_journale: Dict[str, "SqliteBestandsJournal"] = {}
+
+def bestands_journal(dateipfad: str) -> "SqliteBestandsJournal":
+    """Das Bestandsjournal zur Datei; pro Pfad wird nur eine Instanz angelegt."""
+    # Erst bei Bedarf importiert: ohne Bestandsverlauf lädt der CLI-Start kein sqlite3
+    from D_infrastructure.bestands_journal import SqliteBestandsJournal
+    journal = _bestands_journale.get(dateipfad)
+    if journal is None:
+        journal = _bestands_journale.setdefault(dateipfad, SqliteBestandsJournal(dateipfad))
+    return journal
+
+def lade_bestandsverlauf(config: Mapping[str, Any], quelle: str, artikel: ArtikelTabelle,
+                         pruefsumme: Optional[str] = None) -> Dict[str, bool]:
+    """
+    Schreibt den Export ins Bestandsjournal und liefert die Artikel mit stabilem Bestand
+    über die letzten 'historie_exporte' Exporte bis einschließlich dieses Exports (auch wenn
+    er schon früher erfasst wurde).
+    """
+    journal = bestands_journal(config["historie_datei"])
+    kassa = (artikel.ist_kassaartikel(index) for index in range(len(artikel)))
+    with instrumentierung.stufe("historie"):
+        export_id, _ = journal.erfasse_export(quelle, zip(artikel.ids, artikel.lagerstaende, kassa), pruefsumme)
+        return journal.stabile_bestaende(int(config["historie_exporte"]), export_id)
+
+def _map_csv_daten_zu_artikel_liste(daten: Iterable[Dict[str, str]]) -> List[Artikel]:
     """Interner Mapper: CSV-Dict -> Artikel Entity."""
-    artikel_liste = []
-    for zeile in daten:
+    return list(_map_csv_daten_zu_artikel(daten))
+
+def _map_csv_daten_zu_artikel(daten: Iterable[Dict[str, str]]) -> Iterator[Artikel]:
+    """Interner Mapper als Generator: CSV-Dict -> Artikel Entity, Zeile für Zeile."""
+    return _map_csv_werte_zu_artikel(
+        tuple(zeile.get(spalte) for spalte in ARTIKEL_SPALTEN) for zeile in daten
+    )
+
+def _map_csv_werte_zu_artikel(werte: Iterable[Tuple[Optional[str], ...]],
+                              bericht: Optional[FehlerBericht] = None) -> Iterator[Artikel]:
+    """
+    Interner Mapper: projizierte CSV-Werte (Reihenfolge wie ARTIKEL_SPALTEN) -> Artikel Entity.
+    Fehlerhafte Zeilen werden übersprungen und im `bericht` gezählt. Ohne Bericht führt ein
+    leerer kassaartikel-Wert wie bisher zum Abbruch mit KassaartikelMissingException.
+    """
+    for artikel_id, name, ls_wert, kassa_val, einheit, barcode, extnr, gruppe in werte:
         try:
-            ls_str = str(zeile.get('lagerstand', '0')).replace(',', '.')
-            lagerstand = float(ls_str)
-            
-            # Prüfung auf fehlende Kassaartikel-Werte
-            kassa_val = zeile.get('kassaartikel')
-            if kassa_val is None or str(kassa_val).strip() == "":
-                raise KassaartikelMissingException("Aktiviere die Checkbox in LotzApp, damit das CSV in der Spalte kassaartikel Werte hat.")
-            
-            ist_kassa = str(kassa_val) == '1'
-            
-            artikel = Artikel(
-                id=str(zeile.get('ID', '')),
-                name=zeile.get('name', ''),
-                lagerstand=lagerstand,
-                ist_kassaartikel=ist_kassa,
-                einheit=zeile.get('einheit', ''),
-                barcode=zeile.get('barcode', ''),
-                extnr=zeile.get('extnr', ''),
-                gruppe=zeile.get('gruppe', '')
-            )
-            artikel_liste.append(artikel)
-        except (ValueError, TypeError) as e:
-            print(f"Warnung: Fehler beim Mapping von Artikel ID {zeile.get('ID')}: {e}")
+            lagerstand = float(('0' if ls_wert is None else ls_wert).replace(',', '.'))
+        except ValueError:
+            if bericht is not None:
+                bericht.erfasse(FEHLER_LAGERSTAND, artikel_id)
             continue
-    return artikel_liste
+
+        # Prüfung auf fehlende Kassaartikel-Werte
+        if kassa_val is None or kassa_val.strip() == "":
+            if bericht is None:
+                raise KassaartikelMissingException(KASSAARTIKEL_FEHLT_MELDUNG)
+            bericht.erfasse(FEHLER_KASSAARTIKEL, artikel_id)
+            continue
+
+        yield Artikel(
+            id=artikel_id or '',
+            name=name or '',
+            lagerstand=lagerstand,
+            ist_kassaartikel=kassa_val == '1',
+            einheit=einheit or '',
+            barcode=barcode or '',
+            extnr=extnr or '',
+            gruppe=gruppe or ''
+        )
@@ -1,7 +1,74 @@
+import csv
 import glob
+import os
+import re
+import time
+from typing import Dict, Any, List, Mapping, Optional
 from C_adapters import artikel_repository
+from C_adapters.konfiguration import mit_ueberschreibungen
 from B_application.use_cases import ArtikelSyncUseCase
-from A_domain.models import KassaartikelMissingException
+from A_domain.models import ArtikelTabelle, KassaartikelMissingException, UngueltigerExportException
+
+AUSGABE_FELDER = ['Name', 'ID', 'barcode', 'extnr', 'ändern_auf', 'einheit']
+
+
+def _datum_aus_dateiname(dateipfad: str) -> Optional[str]:
+    """Liest das Exportdatum (JJJJMMTT) aus dem Zeitstempel-Präfix der Lotzapp-Dateinamen."""
+    treffer = re.match(r"(\d{8})", os.path.basename(dateipfad))
+    return treffer.group(1) if treffer else None
+
+
+def _artikel_quelle(dateipfad: str, config: Mapping[str, Any], bericht: artikel_repository.FehlerBericht):
+    """
+    Liefert die Artikel einer Exportdatei: mit aktiviertem Binär-Cache aus der
+    gecachten ArtikelTabelle, sonst direkt als Strom aus der CSV.
+    Vorher wird das Format anhand des Dateianfangs geprüft.
+    """
+    artikel_repository.pruefe_exportdatei(dateipfad)
+    if config.get("binaer_cache", 0):
+        return iter(artikel_repository.lade_artikel_tabelle_aus_csv(dateipfad, mit_binaer_cache=True, bericht=bericht))
+    return artikel_repository.iter_artikel_aus_csv(dateipfad, bericht)
+
+
+def _ist_gueltiges_datum(wert: str) -> bool:
+    """Prüft ein Datum im Format JJJJMMTT (wie im Zeitstempel der Dateinamen)."""
+    if not re.fullmatch(r"\d{8}", wert):
+        return False
+    try:
+        time.strptime(wert, "%Y%m%d")
+    except ValueError:
+        return False
+    return True
+
+
+def _verarbeite_datei(dateipfad: str, config: Mapping[str, Any], ausgabe_pfad: str) -> Dict[str, Any]:
+    """
+    Verarbeitet eine einzelne Exportdatei vollständig (Worker-Funktion für den Batch-Modus).
+    Läuft in einem eigenen Prozess und gibt eine Zusammenfassung statt Konsolenausgaben zurück.
+    """
+    start = time.perf_counter()
+    zusammenfassung: Dict[str, Any] = {"datei": dateipfad, "artikel": 0, "vorschlaege": 0, "ausgabe": None,
+                                       "fehler": None, "zeilenfehler": None}
+    bericht = artikel_repository.FehlerBericht()
+
+    def zaehle(artikel_strom):
+        for art in artikel_strom:
+            zusammenfassung["artikel"] += 1
+            yield art
+
+    try:
+        artikel_strom = zaehle(_artikel_quelle(dateipfad, config, bericht))
+        ergebnisse = ArtikelSyncUseCase(config).execute_stream(artikel_strom)
+        zusammenfassung["vorschlaege"] = artikel_repository.exportiere_ergebnisse_nach(ausgabe_pfad, ergebnisse, AUSGABE_FELDER)
+        if zusammenfassung["vorschlaege"]:
+            zusammenfassung["ausgabe"] = ausgabe_pfad
+        if bericht.gesamt:
+            zusammenfassung["zeilenfehler"] = bericht.zusammenfassung()
+    except Exception as e:
+        zusammenfassung["fehler"] = str(e)
+    zusammenfassung["dauer"] = time.perf_counter() - start
+    return zusammenfassung
+
 
 class CLIController:
     """
@@ -22,22 +89,150 @@ class CLIController:
             neueste_datei = sorted(csv_dateien)[-1]
             print(f"Verarbeite Datei: {neueste_datei}")
 
-            # 2. Daten laden über das Repository (Adapter Layer)
+            # 2. Daten laden über das Repository (Adapter Layer) - als Strom, nicht als Liste
             config = artikel_repository.lade_konfiguration()
-            artikel_objekte = artikel_repository.lade_artikel_aus_csv(neueste_datei)
+            bericht = artikel_repository.FehlerBericht()
+            artikel_strom = _artikel_quelle(neueste_datei, config, bericht)
+
+            # Optional: nur Vorschläge, die der Bestandsverlauf der letzten Exporte bestätigt.
+            # Dafür muss der Export erst vollständig im Journal stehen, also als Tabelle geladen werden.
+            bestandsverlauf = None
+            historie_exporte = int(config.get("historie_exporte", 0))
+            if historie_exporte:
+                tabelle = ArtikelTabelle.aus_artikeln(artikel_strom)
+                bestandsverlauf = artikel_repository.lade_bestandsverlauf(
+                    config, neueste_datei, tabelle, artikel_repository.pruefsumme_datei(neueste_datei)
+                )
+                erfasst = artikel_repository.bestands_journal(config["historie_datei"]).anzahl_exporte()
+                if erfasst < historie_exporte:
+                    print(f"Bestandsverlauf: erst {erfasst} von {historie_exporte} Exporten erfasst, "
+                          f"daher noch keine Vorschläge.")
+                else:
+                    print(f"Bestandsverlauf: {len(bestandsverlauf)} Artikel mit stabilem Bestand "
+                          f"über die letzten {historie_exporte} Exporte.")
+                artikel_strom = iter(tabelle)
+
+            # Optional: nur Artikel verarbeiten, die sich seit dem letzten Lauf geändert haben
+            nur_neue = bool(config.get("nur_neue_vorschlaege", 0))
+            strom_vollstaendig = False
+            if nur_neue:
+                alter_snapshot = artikel_repository.lade_snapshot(config["snapshot_datei"])
+                neuer_snapshot = {}
+                artikel_strom = artikel_repository.filtere_geaenderte_artikel(artikel_strom, alter_snapshot, neuer_snapshot)
+
+                def bis_zum_ende(strom):
+                    # Der Snapshot darf nur aus einem vollständig gelesenen Export entstehen
+                    nonlocal strom_vollstaendig
+                    yield from strom
+                    strom_vollstaendig = True
+
+                artikel_strom = bis_zum_ende(artikel_strom)
             
             # 3. Business Logik über den Use Case ausführen
-            use_case = ArtikelSyncUseCase(config)
-            ergebnisse = use_case.execute(artikel_objekte)
+            use_case = ArtikelSyncUseCase(config, bestandsverlauf)
+            ergebnisse = use_case.execute_stream(artikel_strom)
 
-            # 4. Ergebnis-Ausgabe über das Repository
-            print(f"{len(ergebnisse)} Artikel gefunden, die für den Export vorbereitet wurden.")
-            
-            ausgabe_felder = ['Name', 'ID', 'barcode', 'extnr', 'ändern_auf', 'einheit']
-            artikel_repository.exportiere_ergebnisse(ergebnisse, ausgabe_felder)
-        except KassaartikelMissingException as e:
+            # 4. Ergebnis-Ausgabe über das Repository (Lesen, Berechnen und Schreiben in einem Durchlauf)
+            anzahl = artikel_repository.exportiere_ergebnisse(ergebnisse, AUSGABE_FELDER)
+
+            if nur_neue and not strom_vollstaendig:
+                print("Der Export wurde nicht vollständig geschrieben, der Snapshot bleibt unverändert.")
+            elif nur_neue:
+                artikel_repository.speichere_snapshot(config["snapshot_datei"], neuer_snapshot, neueste_datei)
+                geaendert = sum(1 for art_id, art_hash in neuer_snapshot.items() if alter_snapshot.get(art_id) != art_hash)
+                print(f"{geaendert} Artikel haben sich seit dem letzten Lauf geändert, "
+                      f"daraus ergeben sich {anzahl} neue Vorschläge.")
+            else:
+                print(f"{anzahl} Artikel gefunden, die für den Export vorbereitet wurden.")
+            if bericht.gesamt:
+                print(f"Warnung: {bericht.zusammenfassung()}")
+        except (KassaartikelMissingException, UngueltigerExportException) as e:
             print(f"FEHLER: {e}")
+        except (UnicodeDecodeError, csv.Error, OSError) as e:
+            # z.B. eine mittendrin beschädigte Exportdatei: der Lauf gilt als fehlgeschlagen,
+            # die Ergebnisdatei wird verworfen und der Snapshot nicht fortgeschrieben
+            print(f"FEHLER: Der Export konnte nicht vollständig gelesen bzw. geschrieben werden: {e}")
+            print("Es wurden keine Ergebnisse und kein Snapshot gespeichert.")
         except Exception as e:
             print(f"Ein unerwarteter Fehler ist aufgetreten: {e}")
         
         print("==================================================")
+
+    def execute_batch(self, muster: str = "data/*.csv", von: Optional[str] = None, bis: Optional[str] = None,
+                      prozesse: Optional[int] = None) -> None:
+        """
+        Verarbeitet alle passenden Exportdateien (z.B. mehrerer Filialen oder Tage) parallel
+        auf mehreren Prozessen. Pro Eingabedatei entsteht eine Ergebnisdatei in 'output/'.
+        `von`/`bis` (JJJJMMTT, inklusiv) filtern über den Zeitstempel im Dateinamen.
+        Die Modi 'nur_neue_vorschlaege' und 'historie_exporte' werden im Batch nicht angewendet.
+        """
+        print("=== Supermarkt Artikelbestand - Kassenabgleich (Batch-Modus) ===")
+
+        if prozesse is not None and prozesse < 1:
+            print(f"Fehler: --prozesse muss mindestens 1 sein, ist aber {prozesse}.")
+            return
+        for name, wert in (("--von", von), ("--bis", bis)):
+            if wert and not _ist_gueltiges_datum(wert):
+                print(f"Fehler: {name} '{wert}' ist kein gültiges Datum im Format JJJJMMTT (z.B. 20260105).")
+                return
+
+        dateien = sorted(glob.glob(muster))
+        if von or bis:
+            dateien = [
+                d for d in dateien
+                if (datum := _datum_aus_dateiname(d)) is not None
+                and (not von or datum >= von) and (not bis or datum <= bis)
+            ]
+        if not dateien:
+            print(f"Keine CSV-Dateien für '{muster}' gefunden.")
+            return
+
+        # Ausgabedateien vorab bestimmen: Unterordner (z.B. je Filiale) fließen in den Namen ein,
+        # verbleibende Kollisionen werden gemeldet, statt Ergebnisse gegenseitig zu überschreiben
+        basis_ordner = os.path.commonpath([os.path.dirname(os.path.abspath(d)) for d in dateien])
+        ausgaben = {datei: artikel_repository.ausgabe_pfad_fuer(datei, basis_ordner) for datei in dateien}
+        nach_ausgabe: Dict[str, List[str]] = {}
+        for datei, ausgabe_pfad in ausgaben.items():
+            nach_ausgabe.setdefault(ausgabe_pfad, []).append(datei)
+        kollisionen = {pfad: quellen for pfad, quellen in nach_ausgabe.items() if len(quellen) > 1}
+        if kollisionen:
+            print("Fehler: Mehrere Eingabedateien würden dieselbe Ergebnisdatei schreiben:")
+            for ausgabe_pfad, quellen in kollisionen.items():
+                print(f"  {ausgabe_pfad} <- {', '.join(quellen)}")
+            return
+
+        # Als einfaches dict, damit die Konfiguration an die Worker-Prozesse übergeben (gepickelt) werden kann
+        config = dict(mit_ueberschreibungen(artikel_repository.lade_konfiguration(),
+                                            nur_neue_vorschlaege=0, historie_exporte=0))
+        anzahl_prozesse = prozesse or int(config.get("batch_prozesse", 0)) or os.cpu_count() or 1
+        anzahl_prozesse = min(anzahl_prozesse, len(dateien))
+        print(f"Verarbeite {len(dateien)} Dateien mit {anzahl_prozesse} Prozessen...")
+
+        # Erst hier importiert: multiprocessing kostet beim Start des einfachen CLI-Laufs spürbar Zeit
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        start = time.perf_counter()
+        zusammenfassungen: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(max_workers=anzahl_prozesse) as executor:
+            auftraege = [executor.submit(_verarbeite_datei, datei, config, ausgaben[datei]) for datei in dateien]
+            for auftrag in as_completed(auftraege):
+                z = auftrag.result()
+                zusammenfassungen.append(z)
+                if z["fehler"]:
+                    print(f"  FEHLER  {z['datei']}: {z['fehler']}")
+                else:
+                    print(f"  {z['dauer']:7.2f} s  {z['datei']}: {z['artikel']} Artikel, "
+                          f"{z['vorschlaege']} Vorschläge -> {z['ausgabe'] or '(keine Datei)'}")
+                    if z["zeilenfehler"]:
+                        print(f"             Warnung: {z['zeilenfehler']}")
+        gesamtdauer = time.perf_counter() - start
+
+        erfolgreich = [z for z in zusammenfassungen if not z["fehler"]]
+        summe_dauer = sum(z["dauer"] for z in zusammenfassungen)
+        print("--------------------------------------------------")
+        print(f"Dateien: {len(erfolgreich)} erfolgreich, {len(zusammenfassungen) - len(erfolgreich)} fehlerhaft")
+        print(f"Artikel gesamt: {sum(z['artikel'] for z in erfolgreich)}, "
+              f"Vorschläge gesamt: {sum(z['vorschlaege'] for z in erfolgreich)}")
+        print(f"Laufzeit: {gesamtdauer:.2f} s (Summe der Einzelzeiten {summe_dauer:.2f} s, "
+              f"Faktor {summe_dauer / gesamtdauer if gesamtdauer else 0:.1f}x)")
+        print("==================================================")
@@ -0,0 +1,151 @@
+import json
+import logging
+import os
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Erlaubte Konfigurationsschlüssel: Typ, Standardwert und ggf. Mindestwert.
+# Schalter (0/1) sind als int hinterlegt, JSON-Booleans werden dabei akzeptiert.
+KONFIG_SCHEMA: Dict[str, Tuple[type, Any, Optional[int]]] = {
+    "mode": (str, "local", None),
+    "nur_Änderungen_zu_JA_ausgeben": (int, 0, 0),
+    "stueckartikel_aussortieren": (int, 0, 0),
+    "postfix_outputdatei_web": (str, "vorschlaege_IN_KASSA", None),
+    "vektorisierte_berechnung": (int, 0, 0),
+    "nur_neue_vorschlaege": (int, 0, 0),
+    "snapshot_datei": (str, "output/letzter_export_snapshot.json", None),
+    "cache_max_mb": (int, 64, 0),
+    "verarbeitung_worker": (int, 2, 1),
+    "verarbeitung_warteschlange": (int, 4, 0),
+    "max_upload_mb": (int, 50, 1),
+    "batch_prozesse": (int, 0, 0),
+    "binaer_cache": (int, 0, 0),
+    "ergebnis_ttl_minuten": (int, 60, 1),
+    "ergebnis_max_anzahl": (int, 50, 1),
+    "instrumentierung_speicher": (int, 0, 0),
+    "job_worker": (int, 1, 1),
+    "job_warteschlange": (int, 8, 0),
+    "web_worker": (int, 1, 1),
+    "ergebnis_speicher": (str, "memory", None),
+    "ergebnis_speicher_datei": (str, "output/ergebnisse.sqlite3", None),
+    "historie_exporte": (int, 0, 0),
+    "historie_datei": (str, "output/bestandshistorie.sqlite3", None),
+}
+# Schlüssel mit fester Auswahl an Werten
+KONFIG_AUSWAHL: Dict[str, Tuple[str, ...]] = {
+    "ergebnis_speicher": ("memory", "sqlite"),
+}
+
+
+class KonfigurationsFehler(Exception):
+    """Wird ausgelöst, wenn die Konfigurationsdatei nicht lesbar ist oder nicht zum Schema passt."""
+    pass
+
+
+def validiere_konfiguration(rohdaten: Any) -> Mapping[str, Any]:
+    """
+    Prüft die Rohdaten gegen KONFIG_SCHEMA, ergänzt Standardwerte und liefert eine
+    unveränderliche Konfiguration. Alle Verstöße werden gesammelt gemeldet.
+    """
+    if not isinstance(rohdaten, dict):
+        raise KonfigurationsFehler("Die Konfiguration muss ein JSON-Objekt sein.")
+    fehler: List[str] = []
+    config: Dict[str, Any] = {}
+    for schluessel, (typ, standard, minimum) in KONFIG_SCHEMA.items():
+        wert = rohdaten.get(schluessel, standard)
+        if typ is int and isinstance(wert, bool):
+            wert = int(wert)
+        if not isinstance(wert, typ):
+            fehler.append(f"'{schluessel}' muss vom Typ {typ.__name__} sein, ist aber {wert!r}")
+            continue
+        if minimum is not None and wert < minimum:
+            fehler.append(f"'{schluessel}' muss mindestens {minimum} sein, ist aber {wert}")
+            continue
+        if schluessel in KONFIG_AUSWAHL and wert not in KONFIG_AUSWAHL[schluessel]:
+            fehler.append(f"'{schluessel}' muss einer von {', '.join(KONFIG_AUSWAHL[schluessel])} sein, ist aber {wert!r}")
+            continue
+        config[schluessel] = wert
+    # Ergebnisse und Job-Status müssen bei mehreren Worker-Prozessen für alle sichtbar sein
+    if config.get("web_worker", 1) > 1 and config.get("ergebnis_speicher") == "memory":
+        fehler.append("Mit 'web_worker' > 1 muss 'ergebnis_speicher' auf 'sqlite' stehen")
+    if fehler:
+        raise KonfigurationsFehler("Ungültige Konfiguration: " + "; ".join(fehler))
+
+    unbekannt = sorted(set(rohdaten) - set(KONFIG_SCHEMA))
+    if unbekannt:
+        logger.warning(f"Unbekannte Konfigurationsschlüssel werden ignoriert: {', '.join(unbekannt)}")
+    return MappingProxyType(config)
+
+
+def mit_ueberschreibungen(config: Mapping[str, Any], **ueberschreibungen: Any) -> Mapping[str, Any]:
+    """
+    Liefert eine unveränderliche Kopie mit den angegebenen Werten, z.B. für Formular-Optionen
+    einer einzelnen Anfrage. Werte mit None werden nicht übernommen. Die geteilte
+    Konfiguration selbst bleibt unverändert.
+    """
+    geaendert = {schluessel: wert for schluessel, wert in ueberschreibungen.items() if wert is not None}
+    if not geaendert:
+        return config
+    return MappingProxyType({**config, **geaendert})
+
+
+class KonfigurationsAnbieter:
+    """
+    Lädt die Konfigurationsdatei einmal und hält sie validiert und unveränderlich im Speicher.
+    Bei jedem Zugriff wird nur per os.stat geprüft, ob sich die Datei geändert hat
+    (Änderungszeit und Größe); nur dann wird neu gelesen. Ist eine geänderte Datei
+    ungültig, bleibt die zuletzt gültige Konfiguration aktiv.
+    """
+
+    def __init__(self, dateipfad: str):
+        self.dateipfad = dateipfad
+        self._lock = threading.Lock()
+        self._config: Optional[Mapping[str, Any]] = None
+        self._kennung: Optional[Tuple[int, int]] = None
+
+    def _datei_kennung(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.dateipfad)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _lese(self) -> Mapping[str, Any]:
+        if not os.path.exists(self.dateipfad):
+            return validiere_konfiguration({})
+        try:
+            with open(self.dateipfad, 'r', encoding='utf-8') as f:
+                rohdaten = json.load(f)
+        except (OSError, ValueError) as e:
+            raise KonfigurationsFehler(f"Konfiguration {self.dateipfad} ist nicht lesbar: {e}") from e
+        return validiere_konfiguration(rohdaten)
+
+    def aktuell(self) -> Mapping[str, Any]:
+        """Die aktuelle Konfiguration; wird nur bei geänderter Datei neu geladen."""
+        kennung = self._datei_kennung()
+        config = self._config
+        if config is not None and kennung == self._kennung:
+            return config
+        try:
+            return self.neu_laden(kennung)
+        except KonfigurationsFehler as e:
+            if self._config is None:
+                raise
+            logger.error(f"{e} - die bisherige Konfiguration bleibt aktiv.")
+            return self._config
+
+    def neu_laden(self, kennung: Optional[Tuple[int, int]] = None) -> Mapping[str, Any]:
+        """
+        Liest die Datei sofort neu ein (z.B. über den Reload-Endpunkt). Ist sie ungültig,
+        bleibt die bisherige Konfiguration aktiv und der Fehler wird weitergegeben.
+        """
+        with self._lock:
+            if kennung is None:
+                kennung = self._datei_kennung()
+            # Auch bei einem Fehler merken, damit eine defekte Datei nicht bei jedem Zugriff neu gelesen wird
+            self._kennung = kennung
+            self._config = self._lese()
+            return self._config
@@ -1,15 +1,23 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Form
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request, Form, Query, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-import io
 import os
 import logging
 import re
-from typing import Optional
+import tempfile
+import tracemalloc
+from typing import Optional, Dict, Any, List, Mapping, Tuple, BinaryIO, AsyncIterator
 from C_adapters import artikel_repository
+from C_adapters.konfiguration import KonfigurationsFehler, mit_ueberschreibungen
 from B_application.use_cases import ArtikelSyncUseCase
-from A_domain.models import KassaartikelMissingException
+from B_application.ergebnis_abfrage import ErgebnisIndex
+from A_domain.models import ArtikelTabelle, KassaartikelMissingException, UngueltigerExportException
+from D_infrastructure import file_handler, instrumentierung
+from D_infrastructure.cache import LRUCache
+from D_infrastructure.ergebnis_speicher import erzeuge_ergebnis_speicher
+from D_infrastructure.worker_pool import BegrenzterWorkerPool, WarteschlangeVollException
 
 # Logging konfigurieren
 logging.basicConfig(
@@ -44,7 +52,91 @@ async def add_security_headers(request: Request, call_next):
     )
     return response
 
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
+async def _nach_dem_senden(body: AsyncIterator[bytes], messung: instrumentierung.Messung,
+                           methode: str, pfad: str, status: int) -> AsyncIterator[bytes]:
+    """
+    Reicht den Response-Body durch und schließt die Messung erst nach dem letzten Block ab,
+    damit bei Streaming-Downloads auch der Export erfasst wird.
+    """
+    try:
+        async for block in body:
+            yield block
+    finally:
+        metriken.erfasse(messung, methode, pfad, status)
+        if messung.stufen:
+            logger.info(messung.als_logfmt(methode=methode, pfad=pfad, status=status))
+
+@app.middleware("http")
+async def stufen_messen(request: Request, call_next):
+    """
+    Misst jede Anfrage: die Verarbeitungsstufen (Prüfsumme, Dekodieren, Parsen, Mapping,
+    Abgleich, Export) werden als `Server-Timing`-Header, als strukturierte Logzeile und
+    in den Zählern für /metrics ausgegeben. Der Header enthält nur die Stufen, die vor dem
+    Senden der Header abgeschlossen sind; ein gestreamter Export erscheint in Log und Metriken.
+    """
+    messung, token = instrumentierung.starte_messung(MIT_SPEICHERMESSUNG)
+    try:
+        response = await call_next(request)
+    finally:
+        instrumentierung.beende_messung(token)
+    response.headers["Server-Timing"] = messung.server_timing()
+    # Routen-Muster statt konkretem Pfad, damit z.B. Ergebnis-Tokens keine eigenen Zeitreihen erzeugen
+    pfad = getattr(request.scope.get("route"), "path", "unbekannt")
+    response.body_iterator = _nach_dem_senden(
+        response.body_iterator, messung, request.method, pfad, response.status_code
+    )
+    return response
+
+_start_config = artikel_repository.lade_konfiguration()
+
+# Stufen-Messung für alle Anfragen; die Speicherspitzen (tracemalloc) kosten spürbar
+# Laufzeit und werden daher nur auf Wunsch erfasst.
+metriken = instrumentierung.MetrikRegistry(prefix="kassenabgleich")
+MIT_SPEICHERMESSUNG = bool(_start_config["instrumentierung_speicher"])
+if MIT_SPEICHERMESSUNG and not tracemalloc.is_tracing():
+    tracemalloc.start()
+LOKALE_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+# Uploads werden blockweise gelesen und geparst, daher kann die Grenze großzügig sein
+MAX_FILE_SIZE = int(_start_config["max_upload_mb"]) * 1024 * 1024
+DATEI_ZU_GROSS_MELDUNG = f"Datei ist zu groß. Maximal {_start_config['max_upload_mb']} MB erlaubt."
+
+# Cache für geparste Uploads und Ergebnisse, adressiert über den SHA-256 der Upload-Bytes.
+# So wird z.B. die Vorschau (/api/process) und der anschließende Download (/upload)
+# derselben Datei nur einmal geparst und abgeglichen.
+upload_cache = LRUCache(max_bytes=int(_start_config["cache_max_mb"]) * 1024 * 1024)
+
+# Parsen und Abgleich laufen in einem begrenzten Thread-Pool, damit die Event-Loop
+# (und damit alle anderen Anfragen inkl. statischer Dateien) nicht blockiert wird.
+verarbeitungs_pool = BegrenzterWorkerPool(
+    max_worker=int(_start_config["verarbeitung_worker"]),
+    max_wartend=int(_start_config["verarbeitung_warteschlange"])
+)
+
+# Verarbeitete Ergebnismengen bleiben unter einem Token abrufbar, damit die UI
+# nur die jeweils angezeigte Seite laden muss. Mit mehreren Worker-Prozessen liegen sie
+# in einer gemeinsamen SQLite-Datei, sonst im Speicher dieses Prozesses.
+ergebnis_speicher = erzeuge_ergebnis_speicher(
+    _start_config["ergebnis_speicher"],
+    ttl_sekunden=int(_start_config["ergebnis_ttl_minuten"]) * 60,
+    max_eintraege=int(_start_config["ergebnis_max_anzahl"]),
+    dateipfad=_start_config["ergebnis_speicher_datei"]
+)
+
+# Große Dateien können als Hintergrund-Job verarbeitet werden (/api/jobs), damit keine
+# Anfrage lange offen bleibt (Proxy-Timeouts). Eigener Pool, damit wartende Jobs die
+# direkte Verarbeitung nicht blockieren; Status und Ergebnis liegen im ergebnis_speicher
+# und laufen dort wie alle Ergebnisse nach der TTL ab.
+job_pool = BegrenzterWorkerPool(
+    max_worker=int(_start_config["job_worker"]),
+    max_wartend=int(_start_config["job_warteschlange"])
+)
+JOB_WARTEND = "wartend"
+JOB_LAEUFT = "laeuft"
+JOB_FERTIG = "fertig"
+JOB_FEHLER = "fehler"
+
+EXPORT_FELDER = ['Name', 'ID', 'gruppe', 'barcode', 'extnr', 'ändern_auf', 'einheit']
 
 # Pfade für Templates und Statische Dateien konfigurieren
 basis_pfad = os.path.dirname(os.path.dirname(__file__))
@@ -63,6 +155,202 @@ def s_dateiname_reinigen(name: str) -> str:
     name = re.sub(r'[^a-zA-Z0-9._-]', '_', name)
     return name
 
+def _filter_schluessel(config: Mapping[str, Any]) -> Tuple[int, int, int]:
+    """Die Teile der Konfiguration, die das Ergebnis des Abgleichs beeinflussen."""
+    return (
+        int(config.get("nur_Änderungen_zu_JA_ausgeben", 0)),
+        int(config.get("stueckartikel_aussortieren", 0)),
+        int(config.get("vektorisierte_berechnung", 0)),
+    )
+
+def _geschaetzte_groesse(ergebnisse: List[Dict[str, Any]]) -> int:
+    """Grobe Schätzung des Speicherbedarfs einer Ergebnisliste in Bytes."""
+    return sum(64 + sum(len(str(wert)) for wert in zeile.values()) for zeile in ergebnisse)
+
+def _verarbeite_upload(datei: BinaryIO, config: Mapping[str, Any],
+                       snapshot_quelle: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Dekodiert, parst und gleicht einen Upload ab. Die Datei wird dabei nie komplett in den
+    Speicher geladen: vorab wird nur der erste Block auf das Exportformat geprüft, ein erster
+    Durchlauf berechnet blockweise Prüfsumme und Größe, ein zweiter dekodiert inkrementell
+    direkt in den CSV-Parser. Geparste Artikel und Ergebnisse werden
+    im upload_cache abgelegt, sodass eine erneute Anfrage mit derselben Datei und
+    denselben Filtern ohne erneutes Parsen beantwortet wird.
+    Ist `snapshot_quelle` gesetzt, wird im Modus 'nur_neue_vorschlaege' der Snapshot fortgeschrieben.
+    Mit 'historie_exporte' wird der Export (einmal je Prüfsumme) ins Bestandsjournal geschrieben
+    und nur vom Bestandsverlauf bestätigte Vorschläge bleiben übrig.
+    Gibt die Ergebnisse und den Bericht über übersprungene Zeilen zurück.
+    """
+    with instrumentierung.stufe("formatpruefung"):
+        artikel_repository.pruefe_upload(datei)
+
+    with instrumentierung.stufe("pruefsumme"):
+        digest, groesse = file_handler.pruefsumme_binaerdatei(datei, MAX_FILE_SIZE)
+
+    eintrag: Optional[Tuple[ArtikelTabelle, Dict[str, Any]]] = upload_cache.get(("artikel", digest))
+    if eintrag is None:
+        bericht = artikel_repository.FehlerBericht()
+        # Dekodieren, Parsen und Mapping werden darin als eigene Stufen gemessen;
+        # "tabelle" bleibt für den Aufbau der ArtikelTabelle übrig.
+        with instrumentierung.stufe("tabelle"):
+            tabelle = artikel_repository.lade_artikel_tabelle_aus_binaerdatei(datei, MAX_FILE_SIZE, bericht)
+        # Nachschlage-Indizes einmal beim Laden anlegen; sie werden mit der Tabelle gecacht
+        with instrumentierung.stufe("artikelindex"):
+            tabelle.index().aufbauen()
+        if bericht.gesamt:
+            logger.warning(f"Upload {digest[:12]}: {bericht.zusammenfassung()}")
+        eintrag = (tabelle, bericht.als_dict())
+        upload_cache.put(("artikel", digest), eintrag, groesse)
+    artikel_objekte, zeilenfehler = eintrag
+
+    if not artikel_objekte:
+        raise HTTPException(status_code=400, detail="Keine gültigen Artikeldaten gefunden.")
+
+    bestandsverlauf: Optional[Dict[str, bool]] = None
+    if config["historie_exporte"]:
+        bestandsverlauf = artikel_repository.lade_bestandsverlauf(
+            config, snapshot_quelle or f"upload {digest[:12]}", artikel_objekte, digest
+        )
+    use_case = ArtikelSyncUseCase(config, bestandsverlauf)
+
+    # Der Diff-Modus hängt vom gespeicherten Snapshot ab und wird daher nicht gecacht
+    if config["nur_neue_vorschlaege"]:
+        alter_snapshot = artikel_repository.lade_snapshot(config["snapshot_datei"])
+        neuer_snapshot: Dict[str, str] = {}
+        with instrumentierung.stufe("abgleich") as stufe:
+            ergebnisse = use_case.execute(
+                artikel_repository.filtere_geaenderte_artikel(artikel_objekte, alter_snapshot, neuer_snapshot)
+            )
+            if stufe is not None:
+                stufe.zeilen += len(artikel_objekte)
+        if snapshot_quelle is not None:
+            artikel_repository.speichere_snapshot(config["snapshot_datei"], neuer_snapshot, snapshot_quelle)
+        return ergebnisse, zeilenfehler
+
+    # Mit Bestandsverlauf hängen die Ergebnisse vom Journal ab und werden ebenfalls nicht gecacht
+    ergebnis_schluessel = ("ergebnisse", digest, _filter_schluessel(config))
+    ergebnisse = upload_cache.get(ergebnis_schluessel) if bestandsverlauf is None else None
+    if ergebnisse is None:
+        with instrumentierung.stufe("abgleich") as stufe:
+            ergebnisse = use_case.execute(artikel_objekte)
+            if stufe is not None:
+                stufe.zeilen += len(artikel_objekte)
+        if bestandsverlauf is None:
+            upload_cache.put(ergebnis_schluessel, ergebnisse, _geschaetzte_groesse(ergebnisse))
+    logger.debug(f"Upload-Cache: {upload_cache.statistik()}")
+    return ergebnisse, zeilenfehler
+
+def _lade_ergebnis_index(token: str) -> Tuple[ErgebnisIndex, str]:
+    """
+    Liefert den Abfrage-Index und den Dateinamen zu einem Ergebnis-Token.
+    Der Index wird pro Token nur einmal aufgebaut und im upload_cache gehalten. Maßgeblich
+    bleibt der ergebnis_speicher: Ist das Token dort abgelaufen, wird auch der Index verworfen.
+    """
+    schluessel = ("index", token)
+    eintrag = upload_cache.get(schluessel)
+    if eintrag is not None and not ergebnis_speicher.ist_gueltig(token):
+        upload_cache.entferne(schluessel)
+        eintrag = None
+    if eintrag is None:
+        gespeichert = ergebnis_speicher.hole(token)
+        if gespeichert is None:
+            raise HTTPException(status_code=404, detail="Ergebnis nicht gefunden oder abgelaufen. Bitte die Datei erneut hochladen.")
+        if "results" not in gespeichert:
+            # Job, der noch läuft oder fehlgeschlagen ist
+            raise HTTPException(status_code=409, detail="Für diesen Job liegen keine Ergebnisse vor.")
+        with instrumentierung.stufe("index"):
+            eintrag = (ErgebnisIndex(gespeichert["results"]), gespeichert["filename"])
+        _verwerfe_abgelaufene_indizes()
+        upload_cache.put(schluessel, eintrag, _geschaetzte_groesse(gespeichert["results"]))
+    return eintrag
+
+def _verwerfe_abgelaufene_indizes() -> None:
+    """Gibt den Speicher der Indizes frei, deren Ergebnis im ergebnis_speicher abgelaufen ist."""
+    for schluessel in upload_cache.schluessel():
+        if schluessel[0] == "index" and not ergebnis_speicher.ist_gueltig(schluessel[1]):
+            upload_cache.entferne(schluessel)
+
+def _job_fehler(e: Exception) -> Tuple[int, str]:
+    """Übersetzt einen Fehler im Hintergrund-Job in Status-Code und Meldung wie bei /api/process."""
+    if isinstance(e, (KassaartikelMissingException, UngueltigerExportException)):
+        return 400, str(e)
+    if isinstance(e, file_handler.DateiZuGrossException):
+        return 413, DATEI_ZU_GROSS_MELDUNG
+    if isinstance(e, HTTPException):
+        return e.status_code, e.detail
+    logger.error(f"Fehler im Verarbeitungs-Job: {e}", exc_info=True)
+    return 500, "Bei der Verarbeitung der Daten ist ein interner Fehler aufgetreten."
+
+def _job_ausfuehren(job_id: str, pfad: str, dateiname: str, groesse: int, config: Mapping[str, Any]) -> None:
+    """
+    Verarbeitet einen hochgeladenen Export im Hintergrund (läuft im job_pool) und legt
+    Fortschritt, Ergebnis bzw. Fehler unter der Job-ID im ergebnis_speicher ab.
+    Der Fortschritt ergibt sich aus den gelesenen Bytes: Prüfsumme und Parsen lesen die
+    Datei je einmal (bis 90 %), der Abgleich danach füllt den Rest.
+    Die temporäre Upload-Kopie wird anschließend gelöscht.
+    """
+    messung, token = instrumentierung.starte_messung(MIT_SPEICHERMESSUNG)
+    status = 200
+    letzter_stand = -1
+
+    def melde(gelesen: int) -> None:
+        nonlocal letzter_stand
+        prozent = min(90, gelesen * 90 // max(2 * groesse, 1))
+        if prozent != letzter_stand:
+            letzter_stand = prozent
+            ergebnis_speicher.setze(job_id, {"status": JOB_LAEUFT, "fortschritt": prozent, "filename": dateiname})
+
+    try:
+        melde(0)
+        with open(pfad, 'rb') as datei:
+            ergebnisse, zeilenfehler = _verarbeite_upload(file_handler.FortschrittsLeser(datei, melde), config)
+        ergebnis_speicher.setze(job_id, {
+            "status": JOB_FERTIG, "fortschritt": 100, "filename": dateiname,
+            "total": len(ergebnisse), "zeilenfehler": zeilenfehler, "results": ergebnisse,
+        })
+    except Exception as e:
+        status, meldung = _job_fehler(e)
+        ergebnis_speicher.setze(job_id, {"status": JOB_FEHLER, "fortschritt": 100, "filename": dateiname,
+                                         "fehler": meldung, "status_code": status})
+    finally:
+        os.remove(pfad)
+        instrumentierung.beende_messung(token)
+        metriken.erfasse(messung, "JOB", "/api/jobs", status)
+        logger.info(messung.als_logfmt(methode="JOB", pfad="/api/jobs", status=status))
+
+def _abfrage_parameter(
+    status: Optional[List[str]] = Query(None),
+    einheit: Optional[List[str]] = Query(None),
+    gruppe: Optional[str] = Query(None),
+    sortierung: Optional[str] = Query(None),
+    absteigend: bool = Query(False)
+) -> Dict[str, Any]:
+    """Gemeinsame Filter- und Sortierparameter der Ergebnis-Endpunkte."""
+    if sortierung is not None and sortierung not in ErgebnisIndex.SORTIER_SPALTEN:
+        raise HTTPException(status_code=400, detail=f"Sortierung nach '{sortierung}' ist nicht möglich.")
+    return {
+        "status": status,
+        "einheiten": einheit,
+        "gruppe": gruppe.strip() if gruppe and gruppe.strip() else None,
+        "sortierung": sortierung,
+        "absteigend": absteigend,
+    }
+
+def _als_schalter(wert: Optional[bool]) -> Optional[int]:
+    """Formular-Checkbox -> Konfigurationsschalter (0/1); None bedeutet "nicht gesendet"."""
+    return None if wert is None else int(wert)
+
+def _nur_lokal(request: Request) -> None:
+    """Verwaltungs-Endpunkte sind nur lokal erreichbar (nicht von außen, nicht über einen Reverse-Proxy)."""
+    if request.client is None or request.client.host not in LOKALE_HOSTS or "x-forwarded-for" in request.headers:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+def _download_dateiname(dateiname: str, config: Mapping[str, Any]) -> str:
+    """Dateiname für den Download (Postfix aus Config vor der Endung)."""
+    original_name = os.path.splitext(s_dateiname_reinigen(dateiname))[0]
+    postfix = s_dateiname_reinigen(config.get("postfix_outputdatei_web", "vorschlaege_IN_KASSA"))
+    return f"{original_name}{postfix}.csv"
+
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """Zeigt die Startseite mit Upload-Formular via Jinja2 Template."""
@@ -70,57 +358,55 @@ async def index(request: Request):
     # Nur anzeigen, wenn ?debug=1 in der URL steht
     show_config = request.query_params.get("debug") == "1"
     return templates.TemplateResponse(
-        "index.html", 
-        {"request": request, "config": config, "show_config": show_config}
+        request, "index.html",
+        {"config": config, "show_config": show_config}
     )
 
 @app.post("/api/process")
 async def process_csv_api(
     file: UploadFile = File(...),
     nur_ja: Optional[bool] = Form(None),
-    stueck_aus: Optional[bool] = Form(None)
+    stueck_aus: Optional[bool] = Form(None),
+    nur_neue: Optional[bool] = Form(None)
 ):
-    """Endpunkt zum Verarbeiten einer CSV, gibt JSON für die UI zurück."""
+    """
+    Endpunkt zum Verarbeiten einer CSV, gibt JSON für die UI zurück.
+    Mit `nur_neue` werden nur Vorschläge für seit dem letzten Export geänderte Artikel
+    geliefert; der gespeicherte Snapshot bleibt bei dieser Vorschau unverändert.
+    """
     if not file.filename.lower().endswith('.csv'):
         raise HTTPException(status_code=400, detail="Nur CSV-Dateien sind erlaubt.")
 
     # Prüfung der Dateigröße
     if file.size and file.size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail="Datei ist zu groß. Maximal 5 MB erlaubt.")
+        raise HTTPException(status_code=413, detail=DATEI_ZU_GROSS_MELDUNG)
 
     try:
-        inhalt = await file.read()
-        
-        # Sicherheitscheck: Falls file.size None war, hier nach dem Lesen prüfen
-        if len(inhalt) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=413, detail="Datei ist zu groß. Maximal 5 MB erlaubt.")
-            
-        inhalt_str = inhalt.decode("utf-8-sig")
-        
-        # Basis-Konfiguration laden
-        config = artikel_repository.lade_konfiguration()
-        
-        # Nur überschreiben, wenn explizit im Formular gesendet
-        if nur_ja is not None:
-            config["nur_Änderungen_zu_JA_ausgeben"] = 1 if nur_ja else 0
-        if stueck_aus is not None:
-            config["stueckartikel_aussortieren"] = 1 if stueck_aus else 0
-
-        artikel_objekte = artikel_repository.lade_artikel_aus_string(inhalt_str)
-        
-        if not artikel_objekte:
-            raise HTTPException(status_code=400, detail="Keine gültigen Artikeldaten gefunden.")
+        # Basis-Konfiguration, nur überschrieben, wenn explizit im Formular gesendet
+        config = mit_ueberschreibungen(
+            artikel_repository.lade_konfiguration(),
+            nur_Änderungen_zu_JA_ausgeben=_als_schalter(nur_ja),
+            stueckartikel_aussortieren=_als_schalter(stueck_aus),
+            nur_neue_vorschlaege=_als_schalter(nur_neue)
+        )
 
-        use_case = ArtikelSyncUseCase(config)
-        ergebnisse = use_case.execute(artikel_objekte)
+        ergebnisse, zeilenfehler = await verarbeitungs_pool.ausfuehren(_verarbeite_upload, file.file, config)
         
         # Dateiname für die UI säubern
         safe_filename = s_dateiname_reinigen(file.filename)
-        
-        return {"filename": safe_filename, "results": ergebnisse}
 
-    except KassaartikelMissingException as e:
+        # Ergebnis unter einem Token ablegen; die UI ruft es seitenweise über /api/results ab
+        token = ergebnis_speicher.neuer_token()
+        ergebnis_speicher.setze(token, {"filename": safe_filename, "results": ergebnisse})
+
+        return {"filename": safe_filename, "token": token, "total": len(ergebnisse), "zeilenfehler": zeilenfehler}
+
+    except (KassaartikelMissingException, UngueltigerExportException) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except file_handler.DateiZuGrossException:
+        raise HTTPException(status_code=413, detail=DATEI_ZU_GROSS_MELDUNG)
+    except WarteschlangeVollException as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except HTTPException:
         raise
     except Exception as e:
@@ -128,65 +414,177 @@ async def process_csv_api(
         raise HTTPException(status_code=500, detail="Bei der Verarbeitung der Daten ist ein interner Fehler aufgetreten.")
 
 @app.post("/upload")
-async def upload_csv(file: UploadFile = File(...)):
-    """Endpunkt zum Hochladen einer CSV und Erhalten der Ergebnisse."""
+async def upload_csv(file: UploadFile = File(...), nur_neue: Optional[bool] = Form(None)):
+    """
+    Endpunkt zum Hochladen einer CSV und Erhalten der Ergebnisse.
+    Mit `nur_neue` enthält der Download nur Vorschläge für seit dem letzten Export
+    geänderte Artikel; danach wird der Snapshot auf diesen Export fortgeschrieben.
+    """
     if not file.filename.lower().endswith('.csv'):
         raise HTTPException(status_code=400, detail="Nur CSV-Dateien sind erlaubt.")
 
     # Prüfung der Dateigröße
     if file.size and file.size > MAX_FILE_SIZE:
-        raise HTTPException(status_code=413, detail="Datei ist zu groß. Maximal 5 MB erlaubt.")
+        raise HTTPException(status_code=413, detail=DATEI_ZU_GROSS_MELDUNG)
 
     try:
-        # 1. Datei einlesen
-        inhalt = await file.read()
-        
-        # Sicherheitscheck: Falls file.size None war, hier nach dem Lesen prüfen
-        if len(inhalt) > MAX_FILE_SIZE:
-            raise HTTPException(status_code=413, detail="Datei ist zu groß. Maximal 5 MB erlaubt.")
-            
-        inhalt_str = inhalt.decode("utf-8-sig") # utf-8-sig für BOM Handling
-
-        # 2. Konfiguration laden
-        config = artikel_repository.lade_konfiguration()
-
-        # 3. Daten in Domain-Objekte mappen
-        artikel_objekte = artikel_repository.lade_artikel_aus_string(inhalt_str)
-        
-        if not artikel_objekte:
-            raise HTTPException(status_code=400, detail="Keine gültigen Artikeldaten in der Datei gefunden.")
-
-        # 4. Use Case ausführen
-        use_case = ArtikelSyncUseCase(config)
-        ergebnisse = use_case.execute(artikel_objekte)
+        # 1. Konfiguration laden
+        config = mit_ueberschreibungen(
+            artikel_repository.lade_konfiguration(), nur_neue_vorschlaege=_als_schalter(nur_neue)
+        )
 
-        # 5. Export-String generieren
-        ausgabe_felder = ['Name', 'ID', 'gruppe', 'barcode', 'extnr', 'ändern_auf', 'einheit']
-        csv_export = artikel_repository.erzeuge_export_string(ergebnisse, ausgabe_felder)
+        # 2. Datei blockweise einlesen, in Domain-Objekte mappen und Use Case ausführen
+        #    (über den Upload-Cache; die Größenbegrenzung wird beim Lesen geprüft)
+        ergebnisse, zeilenfehler = await verarbeitungs_pool.ausfuehren(
+            _verarbeite_upload, file.file, config, snapshot_quelle=s_dateiname_reinigen(file.filename)
+        )
 
         # Dateiname für den Download vorbereiten (Postfix aus Config vor der Endung)
-        safe_filename = s_dateiname_reinigen(file.filename)
-        original_name = os.path.splitext(safe_filename)[0]
-        postfix = s_dateiname_reinigen(config.get("postfix_outputdatei_web", "vorschlaege_IN_KASSA"))
-        download_filename = f"{original_name}{postfix}.csv"
+        download_filename = _download_dateiname(file.filename, config)
 
-        # 6. Als Download zurückgeben
-        output = io.StringIO(csv_export)
+        # 3. Als Download zurückgeben: der Export wird beim Senden blockweise erzeugt
         return StreamingResponse(
-            iter([output.getvalue()]),
+            artikel_repository.erzeuge_export_chunks(ergebnisse, EXPORT_FELDER),
             media_type="text/csv",
-            headers={"Content-Disposition": f"attachment; filename={download_filename}"}
+            # Anzahl übersprungener Zeilen; die Details liefert /api/process
+            headers={"Content-Disposition": f"attachment; filename={download_filename}",
+                     "X-Zeilenfehler": str(zeilenfehler["gesamt"])}
         )
 
-    except KassaartikelMissingException as e:
+    except (KassaartikelMissingException, UngueltigerExportException) as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except file_handler.DateiZuGrossException:
+        raise HTTPException(status_code=413, detail=DATEI_ZU_GROSS_MELDUNG)
+    except WarteschlangeVollException as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Fehler in upload_csv: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Bei der Verarbeitung der Datei ist ein interner Fehler aufgetreten.")
 
-def run():
-    """Startet den Webserver."""
+@app.post("/api/jobs", status_code=202)
+async def job_anlegen(
+    file: UploadFile = File(...),
+    nur_ja: Optional[bool] = Form(None),
+    stueck_aus: Optional[bool] = Form(None),
+    nur_neue: Optional[bool] = Form(None)
+):
+    """
+    Nimmt eine CSV wie /api/process an, verarbeitet sie aber im Hintergrund und antwortet
+    sofort mit einer Job-ID. Den Fortschritt liefert GET /api/jobs/{job_id}; ist der Job
+    fertig, sind die Ergebnisse unter /api/results/{job_id} abrufbar.
+    """
+    if not file.filename.lower().endswith('.csv'):
+        raise HTTPException(status_code=400, detail="Nur CSV-Dateien sind erlaubt.")
+    if file.size and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=413, detail=DATEI_ZU_GROSS_MELDUNG)
+
+    config = mit_ueberschreibungen(
+        artikel_repository.lade_konfiguration(),
+        nur_Änderungen_zu_JA_ausgeben=_als_schalter(nur_ja),
+        stueckartikel_aussortieren=_als_schalter(stueck_aus),
+        nur_neue_vorschlaege=_als_schalter(nur_neue)
+    )
+    safe_filename = s_dateiname_reinigen(file.filename)
+    job_id = ergebnis_speicher.neuer_token()
+
+    # Der Upload wird nach der Anfrage geschlossen, daher arbeitet der Job auf einer Kopie
+    pfad = os.path.join(tempfile.gettempdir(), f"kassenabgleich_job_{job_id}.csv")
+    try:
+        groesse = await run_in_threadpool(file_handler.kopiere_binaerdatei, file.file, pfad, MAX_FILE_SIZE)
+    except file_handler.DateiZuGrossException:
+        raise HTTPException(status_code=413, detail=DATEI_ZU_GROSS_MELDUNG)
+
+    ergebnis_speicher.setze(job_id, {"status": JOB_WARTEND, "fortschritt": 0, "filename": safe_filename})
+    try:
+        job_pool.einreichen(_job_ausfuehren, job_id, pfad, safe_filename, groesse, config)
+    except WarteschlangeVollException as e:
+        os.remove(pfad)
+        ergebnis_speicher.loesche(job_id)
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    return {"job_id": job_id, "status": JOB_WARTEND}
+
+@app.get("/api/jobs/{job_id}")
+async def job_abfragen(job_id: str):
+    """Status und Fortschritt (in %) eines Jobs; fertige Jobs enthalten Anzahl und Zeilenfehler."""
+    job = ergebnis_speicher.hole(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job nicht gefunden oder abgelaufen. Bitte die Datei erneut hochladen.")
+    antwort = {schluessel: wert for schluessel, wert in job.items() if schluessel != "results"}
+    antwort.setdefault("status", JOB_FERTIG)
+    antwort["job_id"] = job_id
+    return antwort
+
+@app.get("/api/results/{token}")
+async def ergebnisse_abfragen(
+    token: str,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    parameter: Dict[str, Any] = Depends(_abfrage_parameter)
+):
+    """
+    Liefert eine Seite einer zuvor über /api/process verarbeiteten Ergebnismenge,
+    gefiltert nach Status, Einheit und Gruppe und optional sortiert.
+    """
+    index, dateiname = _lade_ergebnis_index(token)
+    gesamt, seite = index.abfragen(offset=offset, limit=limit, **parameter)
+    return {"filename": dateiname, "total": gesamt, "offset": offset, "limit": limit, "results": seite}
+
+@app.get("/api/results/{token}/export")
+async def ergebnisse_exportieren(token: str, parameter: Dict[str, Any] = Depends(_abfrage_parameter)):
+    """
+    Exportiert alle Treffer einer (optional gefilterten) Ergebnismenge als CSV-Download.
+    Der Export beginnt mit einem UTF-8-BOM, damit Excel Umlaute korrekt anzeigt.
+    """
+    index, dateiname = _lade_ergebnis_index(token)
+    _, treffer = index.abfragen(**parameter)
+    download_filename = _download_dateiname(dateiname, artikel_repository.lade_konfiguration())
+    return StreamingResponse(
+        artikel_repository.erzeuge_export_chunks(treffer, EXPORT_FELDER, mit_bom=True),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={download_filename}"}
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metriken_abrufen(request: Request):
+    """
+    Zähler und Auslastung im Prometheus-Textformat. Nur lokal erreichbar: Anfragen von
+    außen oder über einen Reverse-Proxy (X-Forwarded-For) erhalten 404.
+    """
+    _nur_lokal(request)
+    pool = verarbeitungs_pool.statistik()
+    cache = upload_cache.statistik()
+    return metriken.als_prometheus({
+        "pool_aktiv_oder_wartend": pool["aktiv_oder_wartend"],
+        "pool_abgelehnt": pool["abgelehnt"],
+        "cache_treffer": cache["treffer"],
+        "cache_fehlschlaege": cache["fehlschlaege"],
+        "cache_eintraege": cache["eintraege"],
+        "cache_belegte_bytes": cache["belegte_bytes"],
+    })
+
+@app.post("/api/config/reload")
+async def konfiguration_neu_laden(request: Request):
+    """
+    Liest config.json sofort neu ein (sonst geschieht das beim nächsten Zugriff nach einer
+    Dateiänderung). Werte, die beim Start gelesen werden (Upload-Grenze, Cache-Größe,
+    Worker-Pool, Ergebnis-Speicher), wirken erst nach einem Neustart. Nur lokal erreichbar.
+    """
+    _nur_lokal(request)
+    try:
+        config = artikel_repository.konfigurations_anbieter.neu_laden()
+    except KonfigurationsFehler as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"config": dict(config)}
+
+def run(worker: int = 1):
+    """
+    Startet den Webserver. Mit mehreren Workern startet uvicorn eigene Prozesse, die die App
+    jeweils selbst importieren; Ergebnisse und Job-Status teilen sie über den SQLite-Speicher.
+    """
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
+    if worker > 1:
+        uvicorn.run("C_adapters.web_controller:app", host="127.0.0.1", port=8000, workers=worker)
+    else:
+        uvicorn.run(app, host="127.0.0.1", port=8000)
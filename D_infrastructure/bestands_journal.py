@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple
+
+# Zeilen je executemany-Aufruf beim Erfassen eines Exports
+EINFUEGE_BLOCK = 10_000
+
+
+class SqliteBestandsJournal:
+    """
+    Verlauf der Lagerstände über alle verarbeiteten Exporte in einer lokalen SQLite-Datei.
+    Je Export wird eine Zeile in `exporte` und je Artikel eine Zeile in `bestaende` angelegt.
+    Der Primärschlüssel (export_id, artikel_id) ist zugleich der Index für Abfragen über die
+    letzten N Exporte: sie lesen nur diese Bereiche, unabhängig davon, wie viele Monate
+    Verlauf bereits gespeichert sind. Jeder Thread nutzt eine eigene Verbindung (WAL-Modus).
+    """
+
+    def __init__(self, dateipfad: str):
+        self.dateipfad = dateipfad
+        self._lokal = threading.local()
+        os.makedirs(os.path.dirname(dateipfad) or ".", exist_ok=True)
+        with self._verbindung() as verbindung:
+            verbindung.execute(
+                "CREATE TABLE IF NOT EXISTS exporte ("
+                " export_id INTEGER PRIMARY KEY AUTOINCREMENT, quelle TEXT NOT NULL,"
+                " pruefsumme TEXT UNIQUE, erfasst TEXT NOT NULL, anzahl INTEGER NOT NULL DEFAULT 0)"
+            )
+            # Lagerstand darf NULL sein: SQLite speichert NaN als NULL
+            verbindung.execute(
+                "CREATE TABLE IF NOT EXISTS bestaende ("
+                " export_id INTEGER NOT NULL REFERENCES exporte (export_id), artikel_id TEXT NOT NULL,"
+                " lagerstand REAL, kassaartikel INTEGER NOT NULL,"
+                " PRIMARY KEY (export_id, artikel_id)) WITHOUT ROWID"
+            )
+
+    def _verbindung(self) -> sqlite3.Connection:
+        verbindung = getattr(self._lokal, "verbindung", None)
+        if verbindung is None:
+            verbindung = sqlite3.connect(self.dateipfad, timeout=30)
+            verbindung.execute("PRAGMA journal_mode=WAL")
+            verbindung.execute("PRAGMA synchronous=NORMAL")
+            self._lokal.verbindung = verbindung
+        return verbindung
+
+    def erfasse_export(self, quelle: str, bestaende: Iterable[Tuple[str, float, bool]],
+                       pruefsumme: Optional[str] = None) -> Tuple[int, bool]:
+        """
+        Legt einen Export mit seinen Beständen (Artikel-ID, Lagerstand, Kassaartikel) in einer
+        Transaktion an; eingefügt wird blockweise per executemany. Ist ein Export mit derselben
+        Prüfsumme schon erfasst (z.B. Vorschau und Download derselben Datei), wird er nicht
+        erneut gezählt. Gibt die Export-ID und ob neu erfasst wurde zurück.
+        """
+        verbindung = self._verbindung()
+        with verbindung:
+            # Schreibsperre vor der Prüfung holen: sonst könnten zwei Worker denselben Export
+            # gleichzeitig als neu ansehen und der zweite am UNIQUE-Index scheitern
+            verbindung.execute("BEGIN IMMEDIATE")
+            if pruefsumme is not None:
+                vorhanden = verbindung.execute(
+                    "SELECT export_id FROM exporte WHERE pruefsumme = ?", (pruefsumme,)
+                ).fetchone()
+                if vorhanden:
+                    return vorhanden[0], False
+            export_id = verbindung.execute(
+                "INSERT INTO exporte (quelle, pruefsumme, erfasst) VALUES (?, ?, ?)",
+                (quelle, pruefsumme, datetime.now().isoformat(timespec="seconds"))
+            ).lastrowid
+            zeilen = ((export_id, artikel_id, lagerstand, int(kassa)) for artikel_id, lagerstand, kassa in bestaende)
+            anzahl = 0
+            while True:
+                block = list(islice(zeilen, EINFUEGE_BLOCK))
+                if not block:
+                    break
+                # Doppelte Artikel-IDs im Export: die letzte Zeile gilt
+                verbindung.executemany(
+                    "INSERT OR REPLACE INTO bestaende (export_id, artikel_id, lagerstand, kassaartikel)"
+                    " VALUES (?, ?, ?, ?)", block
+                )
+                anzahl += len(block)
+            verbindung.execute("UPDATE exporte SET anzahl = ? WHERE export_id = ?", (anzahl, export_id))
+        return export_id, True
+
+    def anzahl_exporte(self) -> int:
+        return self._verbindung().execute("SELECT COUNT(*) FROM exporte").fetchone()[0]
+
+    def stabile_bestaende(self, anzahl_exporte: int, bis_export_id: Optional[int] = None) -> Dict[str, bool]:
+        """
+        Artikel, deren Lagerstand in jedem der letzten `anzahl_exporte` Exporte auf derselben
+        Seite lag: True = immer vorrätig (> 0), False = immer leer (<= 0). Artikel mit
+        wechselndem Bestand oder Lücken im Verlauf fehlen. Mit `bis_export_id` endet das
+        Fenster bei diesem Export (z.B. wenn ein älterer Export erneut verarbeitet wird),
+        sonst beim neuesten. Sind bis dahin nicht genügend Exporte erfasst, ist das Ergebnis leer.
+        """
+        verbindung = self._verbindung()
+        if bis_export_id is None:
+            neuester = verbindung.execute("SELECT MAX(export_id) FROM exporte").fetchone()[0]
+            if neuester is None:
+                return {}
+            bis_export_id = neuester
+        fenster = verbindung.execute(
+            "SELECT export_id FROM exporte WHERE export_id <= ? ORDER BY export_id DESC LIMIT 1 OFFSET ?",
+            (bis_export_id, anzahl_exporte - 1)
+        ).fetchone()
+        if fenster is None:
+            return {}
+        zeilen = verbindung.execute(
+            "SELECT artikel_id, MIN(lagerstand > 0) FROM bestaende WHERE export_id BETWEEN ? AND ?"
+            " GROUP BY artikel_id"
+            " HAVING COUNT(lagerstand) = ? AND MIN(lagerstand > 0) = MAX(lagerstand > 0)",
+            (fenster[0], bis_export_id, anzahl_exporte)
+        )
+        return {artikel_id: bool(vorraetig) for artikel_id, vorraetig in zeilen}
@@ -0,0 +1,163 @@
+import hashlib
+import itertools
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"ARTC"
+VERSION = 3
+CACHE_ENDUNG = ".artcache"
+_TRENNER = "\x00"
+# Kopf: Magic, Version, Länge des JSON-Headers
+_KOPF = struct.Struct("<4sII")
+
+
+def cache_pfad_fuer(quell_pfad: str) -> str:
+    """Der Binär-Cache liegt direkt neben der Quelldatei."""
+    return quell_pfad + CACHE_ENDUNG
+
+
+def _sha256_datei(pfad: str) -> str:
+    pruefsumme = hashlib.sha256()
+    with open(pfad, "rb") as datei:
+        for block in iter(lambda: datei.read(1024 * 1024), b""):
+            pruefsumme.update(block)
+    return pruefsumme.hexdigest()
+
+
+def quell_kennung(quell_pfad: str) -> Dict[str, Any]:
+    """Merkmale der Quelldatei, an denen die Gültigkeit des Caches geprüft wird."""
+    stat = os.stat(quell_pfad)
+    return {"mtime_ns": stat.st_mtime_ns, "groesse": stat.st_size, "sha256": _sha256_datei(quell_pfad)}
+
+
+def _ist_gueltig(gespeichert: Dict[str, Any], quell_pfad: str) -> bool:
+    """
+    Gleiche Größe und gleiche mtime gelten als unverändert. Bei abweichender mtime
+    (z.B. kopierte oder nur berührte Datei) entscheidet der Inhalts-Hash.
+    """
+    stat = os.stat(quell_pfad)
+    if stat.st_size != gespeichert["groesse"]:
+        return False
+    if stat.st_mtime_ns == gespeichert["mtime_ns"]:
+        return True
+    return _sha256_datei(quell_pfad) == gespeichert["sha256"]
+
+
+def _enden_name(spalte: str) -> str:
+    return f"{spalte}#enden"
+
+
+def schreibe_spalten(cache_pfad: str, kennung: Dict[str, Any], anzahl: int,
+                     zahlen_spalten: Dict[str, Tuple[str, Any]], text_spalten: Dict[str, List[str]],
+                     zusatz: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Schreibt Spalten in eine kompakte Binärdatei: Zahlenspalten (Typcode + Puffer) als
+    rohe, 8-Byte-ausgerichtete Blöcke, Textspalten als UTF-8 mit Null-Trennzeichen.
+    Enthält ein Wert selbst ein Null-Zeichen, wird die Spalte ohne Trennzeichen
+    geschrieben und zusätzlich ein Block mit den Endpositionen (in Zeichen) jedes Wertes
+    abgelegt; das schnelle Aufteilen am Trennzeichen bleibt so der Normalfall.
+    `zusatz` (JSON-tauglich, z.B. der Bericht übersprungener Zeilen) wird im Header abgelegt.
+    Die Datei wird über eine eindeutige temporäre Datei atomar ersetzt, sodass sich
+    gleichzeitige Schreiber nicht in die Quere kommen.
+    """
+    abschnitte: List[Tuple[str, bytes]] = []
+    mit_enden: List[str] = []
+    for name, (typcode, puffer) in zahlen_spalten.items():
+        abschnitte.append((name, memoryview(puffer).cast("B").tobytes()))
+    for name, werte in text_spalten.items():
+        text = _TRENNER.join(werte)
+        if text.count(_TRENNER) == max(len(werte) - 1, 0):
+            abschnitte.append((name, text.encode("utf-8")))
+            continue
+        mit_enden.append(name)
+        abschnitte.append((name, "".join(werte).encode("utf-8")))
+        enden = array("Q", itertools.accumulate(len(wert) for wert in werte))
+        abschnitte.append((_enden_name(name), enden.tobytes()))
+
+    inhaltsverzeichnis: Dict[str, Any] = {}
+    position = 0
+    for name, daten in abschnitte:
+        inhaltsverzeichnis[name] = {"offset": position, "laenge": len(daten)}
+        position += len(daten) + (-len(daten) % 8)
+    for name, (typcode, _) in zahlen_spalten.items():
+        inhaltsverzeichnis[name]["typ"] = typcode
+    for name, werte in text_spalten.items():
+        inhaltsverzeichnis[name]["anzahl"] = len(werte)
+    for name in mit_enden:
+        inhaltsverzeichnis[name]["enden"] = inhaltsverzeichnis.pop(_enden_name(name))
+
+    header = json.dumps({"quelle": kennung, "anzahl": anzahl, "spalten": inhaltsverzeichnis,
+                         "zusatz": zusatz or {}}).encode("utf-8")
+    header += b" " * (-(_KOPF.size + len(header)) % 8)
+
+    temp_pfad = None
+    try:
+        deskriptor, temp_pfad = tempfile.mkstemp(
+            dir=os.path.dirname(cache_pfad) or ".", prefix=os.path.basename(cache_pfad) + ".", suffix=".tmp"
+        )
+        with os.fdopen(deskriptor, "wb") as datei:
+            datei.write(_KOPF.pack(MAGIC, VERSION, len(header)))
+            datei.write(header)
+            for _, daten in abschnitte:
+                datei.write(daten)
+                datei.write(b"\x00" * (-len(daten) % 8))
+        os.replace(temp_pfad, cache_pfad)
+        temp_pfad = None
+    except OSError as e:
+        logger.warning(f"Binär-Cache {cache_pfad} konnte nicht geschrieben werden: {e}")
+    finally:
+        if temp_pfad is not None:
+            try:
+                os.remove(temp_pfad)
+            except OSError:
+                pass
+
+
+def lade_spalten(cache_pfad: str, quell_pfad: str) -> Optional[Dict[str, Any]]:
+    """
+    Lädt einen gültigen Cache per mmap. Zahlenspalten werden als memoryview ohne Kopie
+    zurückgegeben, Textspalten als Listen, der beim Schreiben übergebene Zusatz unter
+    "zusatz". Fehlt der Cache, ist er veraltet oder
+    beschädigt, wird None zurückgegeben.
+    """
+    if not os.path.exists(cache_pfad) or not os.path.exists(quell_pfad):
+        return None
+    try:
+        with open(cache_pfad, "rb") as datei:
+            abbild = mmap.mmap(datei.fileno(), 0, access=mmap.ACCESS_READ)
+        puffer = memoryview(abbild)
+        magic, version, header_laenge = _KOPF.unpack_from(puffer)
+        if magic != MAGIC or version != VERSION:
+            return None
+        header = json.loads(bytes(puffer[_KOPF.size:_KOPF.size + header_laenge]))
+        if not _ist_gueltig(header["quelle"], quell_pfad):
+            return None
+
+        daten_start = _KOPF.size + header_laenge
+        spalten: Dict[str, Any] = {"anzahl": header["anzahl"], "zusatz": header["zusatz"]}
+        for name, info in header["spalten"].items():
+            start = daten_start + info["offset"]
+            abschnitt = puffer[start:start + info["laenge"]]
+            if "typ" in info:
+                spalten[name] = abschnitt.cast(info["typ"])
+            elif "enden" not in info:
+                spalten[name] = str(abschnitt, "utf-8").split(_TRENNER) if info["anzahl"] else []
+            else:
+                text = str(abschnitt, "utf-8")
+                enden_start = daten_start + info["enden"]["offset"]
+                enden = puffer[enden_start:enden_start + info["enden"]["laenge"]].cast("Q")
+                if len(enden) != info["anzahl"] or (info["anzahl"] and enden[-1] != len(text)):
+                    raise ValueError(f"Textspalte {name} ist inkonsistent")
+                spalten[name] = [text[anfang:ende] for anfang, ende in zip(itertools.chain((0,), enden), enden)]
+        return spalten
+    except (OSError, ValueError, KeyError, struct.error) as e:
+        logger.warning(f"Binär-Cache {cache_pfad} ist unbrauchbar und wird ignoriert: {e}")
+        return None
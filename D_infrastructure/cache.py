@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Thread-sicherer In-Process-Cache mit LRU-Verdrängung.
+    Jeder Eintrag trägt eine (geschätzte) Größe in Bytes; übersteigt die Summe
+    `max_bytes`, werden die am längsten nicht genutzten Einträge entfernt.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._eintraege: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._belegt = 0
+        self._lock = threading.Lock()
+        self.treffer = 0
+        self.fehlschlaege = 0
+        self.verdraengungen = 0
+
+    def get(self, schluessel: Hashable) -> Optional[Any]:
+        """Liefert den Wert zum Schlüssel oder None und zählt Treffer/Fehlschläge mit."""
+        with self._lock:
+            eintrag = self._eintraege.get(schluessel)
+            if eintrag is None:
+                self.fehlschlaege += 1
+                return None
+            self._eintraege.move_to_end(schluessel)
+            self.treffer += 1
+            return eintrag[0]
+
+    def put(self, schluessel: Hashable, wert: Any, groesse: int) -> None:
+        """Legt einen Wert ab. Einträge, die allein größer als der Cache sind, werden nicht gespeichert."""
+        if groesse > self.max_bytes:
+            return
+        with self._lock:
+            alt = self._eintraege.pop(schluessel, None)
+            if alt is not None:
+                self._belegt -= alt[1]
+            self._eintraege[schluessel] = (wert, groesse)
+            self._belegt += groesse
+            while self._belegt > self.max_bytes:
+                _, (_, verdraengt_groesse) = self._eintraege.popitem(last=False)
+                self._belegt -= verdraengt_groesse
+                self.verdraengungen += 1
+
+    def entferne(self, schluessel: Hashable) -> None:
+        """Entfernt einen Eintrag, falls vorhanden (z.B. wenn die zugrunde liegenden Daten abgelaufen sind)."""
+        with self._lock:
+            eintrag = self._eintraege.pop(schluessel, None)
+            if eintrag is not None:
+                self._belegt -= eintrag[1]
+
+    def schluessel(self) -> List[Hashable]:
+        """Momentaufnahme aller Schlüssel (älteste zuerst)."""
+        with self._lock:
+            return list(self._eintraege)
+
+    def leeren(self) -> None:
+        """Entfernt alle Einträge (die Zähler bleiben erhalten)."""
+        with self._lock:
+            self._eintraege.clear()
+            self._belegt = 0
+
+    def statistik(self) -> Dict[str, int]:
+        """Gibt Trefferzähler und Belegung für Logging und Monitoring zurück."""
+        with self._lock:
+            return {
+                "treffer": self.treffer,
+                "fehlschlaege": self.fehlschlaege,
+                "verdraengungen": self.verdraengungen,
+                "eintraege": len(self._eintraege),
+                "belegte_bytes": self._belegt,
+                "max_bytes": self.max_bytes,
+            }
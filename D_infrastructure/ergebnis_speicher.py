@@ -0,0 +1,140 @@
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+class InMemoryErgebnisSpeicher:
+    """
+    Ablage für verarbeitete Ergebnisse (und ähnliche Zustände) unter einem zufälligen Token.
+    Einträge laufen nach `ttl_sekunden` ab; bei mehr als `max_eintraege` werden die
+    ältesten entfernt. Die Werte sollten JSON-serialisierbar sein, damit die Ablage
+    später gegen ein gemeinsames Backend getauscht werden kann.
+    """
+
+    def __init__(self, ttl_sekunden: int, max_eintraege: int):
+        self.ttl_sekunden = ttl_sekunden
+        self.max_eintraege = max_eintraege
+        self._eintraege: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def neuer_token() -> str:
+        """Erzeugt ein nicht erratbares Token für einen neuen Eintrag."""
+        return secrets.token_urlsafe(16)
+
+    def _aufraeumen(self, jetzt: float) -> None:
+        abgelaufen = [token for token, (ablauf, _) in self._eintraege.items() if ablauf <= jetzt]
+        for token in abgelaufen:
+            del self._eintraege[token]
+        while len(self._eintraege) > self.max_eintraege:
+            self._eintraege.popitem(last=False)
+
+    def setze(self, token: str, wert: Dict[str, Any]) -> None:
+        """Legt einen Wert unter dem Token ab (bzw. überschreibt ihn) und verlängert die Gültigkeit."""
+        jetzt = time.monotonic()
+        with self._lock:
+            self._eintraege.pop(token, None)
+            self._eintraege[token] = (jetzt + self.ttl_sekunden, wert)
+            self._aufraeumen(jetzt)
+
+    def hole(self, token: str) -> Optional[Dict[str, Any]]:
+        """Liefert den Wert zum Token oder None, wenn er nicht existiert oder abgelaufen ist."""
+        with self._lock:
+            eintrag = self._eintraege.get(token)
+            if eintrag is None:
+                return None
+            if eintrag[0] <= time.monotonic():
+                del self._eintraege[token]
+                return None
+            return eintrag[1]
+
+    def ist_gueltig(self, token: str) -> bool:
+        """Prüft, ob unter dem Token ein nicht abgelaufener Eintrag liegt."""
+        return self.hole(token) is not None
+
+    def loesche(self, token: str) -> None:
+        """Entfernt einen Eintrag, falls vorhanden."""
+        with self._lock:
+            self._eintraege.pop(token, None)
+
+
+class SqliteErgebnisSpeicher:
+    """
+    Ablage wie InMemoryErgebnisSpeicher, aber in einer lokalen SQLite-Datei, sodass mehrere
+    Worker-Prozesse dieselben Tokens sehen (z.B. Vorschau auf einem Worker, Download oder
+    Job-Status auf einem anderen). Die Werte werden als JSON gespeichert; der WAL-Modus
+    erlaubt paralleles Lesen während geschrieben wird. Jeder Thread nutzt eine eigene Verbindung.
+    """
+
+    def __init__(self, dateipfad: str, ttl_sekunden: int, max_eintraege: int):
+        self.dateipfad = dateipfad
+        self.ttl_sekunden = ttl_sekunden
+        self.max_eintraege = max_eintraege
+        self._lokal = threading.local()
+        os.makedirs(os.path.dirname(dateipfad) or ".", exist_ok=True)
+        with self._verbindung() as verbindung:
+            verbindung.execute(
+                "CREATE TABLE IF NOT EXISTS ergebnisse ("
+                " token TEXT PRIMARY KEY, ablauf REAL NOT NULL, geaendert REAL NOT NULL, wert TEXT NOT NULL)"
+            )
+            verbindung.execute("CREATE INDEX IF NOT EXISTS ergebnisse_ablauf ON ergebnisse (ablauf)")
+            verbindung.execute("CREATE INDEX IF NOT EXISTS ergebnisse_geaendert ON ergebnisse (geaendert)")
+
+    neuer_token = staticmethod(InMemoryErgebnisSpeicher.neuer_token)
+
+    def _verbindung(self) -> sqlite3.Connection:
+        verbindung = getattr(self._lokal, "verbindung", None)
+        if verbindung is None:
+            verbindung = sqlite3.connect(self.dateipfad, timeout=30)
+            verbindung.execute("PRAGMA journal_mode=WAL")
+            verbindung.execute("PRAGMA synchronous=NORMAL")
+            self._lokal.verbindung = verbindung
+        return verbindung
+
+    def setze(self, token: str, wert: Dict[str, Any]) -> None:
+        """Legt einen Wert unter dem Token ab (bzw. überschreibt ihn) und verlängert die Gültigkeit."""
+        # Prozessübergreifend zählt die Wanduhr, nicht time.monotonic()
+        jetzt = time.time()
+        daten = json.dumps(wert, ensure_ascii=False, separators=(",", ":"))
+        with self._verbindung() as verbindung:
+            verbindung.execute(
+                "INSERT OR REPLACE INTO ergebnisse (token, ablauf, geaendert, wert) VALUES (?, ?, ?, ?)",
+                (token, jetzt + self.ttl_sekunden, jetzt, daten)
+            )
+            verbindung.execute("DELETE FROM ergebnisse WHERE ablauf <= ?", (jetzt,))
+            verbindung.execute(
+                "DELETE FROM ergebnisse WHERE token IN"
+                " (SELECT token FROM ergebnisse ORDER BY geaendert DESC LIMIT -1 OFFSET ?)",
+                (self.max_eintraege,)
+            )
+
+    def hole(self, token: str) -> Optional[Dict[str, Any]]:
+        """Liefert den Wert zum Token oder None, wenn er nicht existiert oder abgelaufen ist."""
+        zeile = self._verbindung().execute(
+            "SELECT wert FROM ergebnisse WHERE token = ? AND ablauf > ?", (token, time.time())
+        ).fetchone()
+        return json.loads(zeile[0]) if zeile else None
+
+    def ist_gueltig(self, token: str) -> bool:
+        """Prüft, ob unter dem Token ein nicht abgelaufener Eintrag liegt (ohne den Wert zu lesen)."""
+        return self._verbindung().execute(
+            "SELECT 1 FROM ergebnisse WHERE token = ? AND ablauf > ?", (token, time.time())
+        ).fetchone() is not None
+
+    def loesche(self, token: str) -> None:
+        """Entfernt einen Eintrag, falls vorhanden."""
+        with self._verbindung() as verbindung:
+            verbindung.execute("DELETE FROM ergebnisse WHERE token = ?", (token,))
+
+
+def erzeuge_ergebnis_speicher(backend: str, ttl_sekunden: int, max_eintraege: int,
+                              dateipfad: Optional[str] = None) -> Union[InMemoryErgebnisSpeicher, SqliteErgebnisSpeicher]:
+    """Wählt die Ablage: 'memory' (nur innerhalb eines Prozesses) oder 'sqlite' (prozessübergreifend)."""
+    if backend == "sqlite":
+        return SqliteErgebnisSpeicher(dateipfad, ttl_sekunden, max_eintraege)
+    return InMemoryErgebnisSpeicher(ttl_sekunden, max_eintraege)
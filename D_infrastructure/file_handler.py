@@ -1,13 +1,51 @@
 import csv
+import codecs
+import hashlib
 import io
+import itertools
 import os
 import json
 import logging
+import threading
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence, Tuple, BinaryIO, Callable
+from D_infrastructure import instrumentierung
 
 logger = logging.getLogger(__name__)
 
+CHUNK_GROESSE = 64 * 1024
+
+
+class DateiZuGrossException(Exception):
+    """Wird ausgelöst, wenn beim blockweisen Lesen die erlaubte Dateigröße überschritten wird."""
+    pass
+
+
+class FortschrittsLeser:
+    """
+    Hülle um eine Binärdatei, die alle gelesenen Bytes (auch über mehrere Durchläufe nach
+    seek) zählt und nach jedem Block `melde(gelesen)` aufruft, z.B. für eine Fortschrittsanzeige.
+    """
+
+    def __init__(self, datei: BinaryIO, melde: Callable[[int], None]):
+        self._datei = datei
+        self._melde = melde
+        self.gelesen = 0
+
+    def read(self, groesse: int = -1) -> bytes:
+        block = self._datei.read(groesse)
+        if block:
+            self.gelesen += len(block)
+            self._melde(self.gelesen)
+        return block
+
+    def seek(self, position: int, woher: int = 0) -> int:
+        return self._datei.seek(position, woher)
+
+    def tell(self) -> int:
+        return self._datei.tell()
+
 def lese_json(dateipfad: str) -> Dict[str, Any]:
     """Liest eine JSON-Datei ein."""
     if not os.path.exists(dateipfad):
@@ -19,73 +57,287 @@ def lese_json(dateipfad: str) -> Dict[str, Any]:
         logger.error(f"Fehler beim Lesen der JSON-Datei {dateipfad}: {e}")
         return {}
 
-def lese_csv(dateipfad: str, delimiter: str = ';') -> List[Dict[str, str]]:
-    """Liest eine CSV-Datei ein."""
-    daten: List[Dict[str, str]] = []
-    if not os.path.exists(dateipfad):
-        return daten
+def schreibe_json(dateipfad: str, daten: Dict[str, Any]) -> None:
+    """
+    Schreibt Daten als JSON-Datei (atomar über eine temporäre Datei). Der temporäre Name
+    ist je Prozess und Thread eindeutig, sodass mehrere Web-Worker gleichzeitig schreiben
+    können, ohne dass eine halb geschriebene Datei gelesen wird.
+    """
+    os.makedirs(os.path.dirname(dateipfad) or ".", exist_ok=True)
+    temp_pfad = _temp_pfad_fuer(dateipfad)
     try:
-        with open(dateipfad, mode='r', encoding='utf-8-sig') as csvdatei:
-            reader = csv.DictReader(csvdatei, delimiter=delimiter)
-            for zeile in reader:
-                daten.append(zeile)
+        with open(temp_pfad, 'w', encoding='utf-8') as f:
+            json.dump(daten, f, ensure_ascii=False)
+        os.replace(temp_pfad, dateipfad)
     except Exception as e:
-        logger.error(f"Fehler beim Lesen der CSV-Datei {dateipfad}: {e}")
-    return daten
+        _entferne_temp_datei(temp_pfad)
+        logger.error(f"Fehler beim Schreiben der JSON-Datei {dateipfad}: {e}")
+
+def iter_csv(dateipfad: str, delimiter: str = ';') -> Iterator[Dict[str, str]]:
+    """
+    Liest eine CSV-Datei zeilenweise ein, ohne sie komplett im Speicher zu halten.
+    Lese- und Dekodierfehler werden an den Aufrufer weitergegeben, statt den Strom
+    vorzeitig (und scheinbar vollständig) zu beenden.
+    """
+    if not os.path.exists(dateipfad):
+        return
+    with open(dateipfad, mode='r', encoding='utf-8-sig') as csvdatei:
+        yield from csv.DictReader(csvdatei, delimiter=delimiter)
+
+def lese_csv(dateipfad: str, delimiter: str = ';') -> List[Dict[str, str]]:
+    """Liest eine CSV-Datei ein."""
+    return list(iter_csv(dateipfad, delimiter))
+
+def iter_csv_string(inhalt: str, delimiter: str = ';') -> Iterator[Dict[str, str]]:
+    """Parst einen CSV-String zeilenweise in Dictionaries (Parserfehler werden weitergegeben)."""
+    # splitlines() behandelt verschiedene Zeilenenden korrekt
+    yield from csv.DictReader(inhalt.splitlines(), delimiter=delimiter)
 
 def parse_csv_string(inhalt: str, delimiter: str = ';') -> List[Dict[str, str]]:
     """Parst einen CSV-String in eine Liste von Dictionaries."""
-    daten: List[Dict[str, str]] = []
-    try:
-        # splitlines() behandelt verschiedene Zeilenenden korrekt
-        reader = csv.DictReader(inhalt.splitlines(), delimiter=delimiter)
+    return list(iter_csv_string(inhalt, delimiter))
+
+def projiziere_csv_zeilen(zeilen: Iterable[str], spalten: Sequence[str], delimiter: str = ';') -> Iterator[Tuple[Optional[str], ...]]:
+    """
+    Parst CSV-Zeilen und liefert pro Datensatz nur die angefragten Spalten als Tupel
+    (in der Reihenfolge von `spalten`). Die Spaltenpositionen werden einmalig aus dem
+    Header bestimmt; fehlende Spalten oder zu kurze Zeilen ergeben None.
+    """
+    reader = csv.reader(zeilen, delimiter=delimiter)
+    header = next(reader, None)
+    if header is None:
+        return
+    # Bei doppelten Spaltennamen gewinnt wie bei csv.DictReader das letzte Vorkommen
+    positionen = {name: i for i, name in enumerate(header)}
+    indizes = [positionen.get(name) for name in spalten]
+
+    if all(i is not None for i in indizes):
+        # Schneller Pfad: alle Spalten vorhanden, Extraktion per itemgetter
+        hole = itemgetter(*indizes)
+        if len(indizes) == 1:
+            einzel = hole
+            hole = lambda zeile: (einzel(zeile),)
+        min_laenge = max(indizes) + 1
         for zeile in reader:
-            daten.append(zeile)
-    except Exception as e:
-        logger.error(f"Fehler beim Parsen des CSV-Strings: {e}")
-    return daten
+            if len(zeile) >= min_laenge:
+                yield hole(zeile)
+            elif zeile:
+                yield tuple(zeile[i] if i < len(zeile) else None for i in indizes)
+    else:
+        for zeile in reader:
+            if zeile:
+                yield tuple(zeile[i] if i is not None and i < len(zeile) else None for i in indizes)
+
+def iter_csv_projiziert(dateipfad: str, spalten: Sequence[str], delimiter: str = ';') -> Iterator[Tuple[Optional[str], ...]]:
+    """
+    Liest eine CSV-Datei zeilenweise und extrahiert nur die angefragten Spalten.
+    Lese- und Dekodierfehler (z.B. eine mittendrin beschädigte Datei) werden an den
+    Aufrufer weitergegeben, damit ein abgeschnittener Strom nicht als vollständig gilt.
+    """
+    if not os.path.exists(dateipfad):
+        return
+    with open(dateipfad, mode='r', encoding='utf-8-sig', newline='') as csvdatei:
+        zeilen = instrumentierung.gemessener_strom("dekodieren", csvdatei)
+        yield from projiziere_csv_zeilen(zeilen, spalten, delimiter)
+
+def iter_csv_string_projiziert(inhalt: str, spalten: Sequence[str], delimiter: str = ';') -> Iterator[Tuple[Optional[str], ...]]:
+    """Parst einen CSV-String und extrahiert nur die angefragten Spalten (Parserfehler werden weitergegeben)."""
+    yield from projiziere_csv_zeilen(inhalt.splitlines(), spalten, delimiter)
 
-def _sanitize_fuer_csv_injection(daten: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def kopiere_binaerdatei(quelle: BinaryIO, ziel_pfad: str, max_bytes: Optional[int] = None,
+                        chunk_groesse: int = CHUNK_GROESSE) -> int:
     """
-    Bereinigt Daten, um CSV-Injection (Excel Formula Injection) zu verhindern.
+    Kopiert eine Binärdatei (z.B. einen Upload) blockweise nach `ziel_pfad` und gibt die Größe
+    zurück. Bei Überschreiten von `max_bytes` wird abgebrochen und die Teilkopie entfernt.
+    """
+    groesse = 0
+    quelle.seek(0)
+    try:
+        with open(ziel_pfad, 'wb') as ziel:
+            while True:
+                block = quelle.read(chunk_groesse)
+                if not block:
+                    break
+                groesse += len(block)
+                if max_bytes is not None and groesse > max_bytes:
+                    raise DateiZuGrossException(f"Die Datei überschreitet die maximale Größe von {max_bytes} Bytes.")
+                ziel.write(block)
+    except BaseException:
+        if os.path.exists(ziel_pfad):
+            os.remove(ziel_pfad)
+        raise
+    return groesse
+
+def pruefsumme_binaerdatei(datei: BinaryIO, max_bytes: Optional[int] = None,
+                           chunk_groesse: int = CHUNK_GROESSE) -> Tuple[str, int]:
+    """
+    Berechnet SHA-256 und Größe einer Binärdatei blockweise und spult sie danach zurück.
+    Überschreitet die Datei `max_bytes`, wird abgebrochen (DateiZuGrossException).
+    """
+    pruefsumme = hashlib.sha256()
+    groesse = 0
+    datei.seek(0)
+    while True:
+        block = datei.read(chunk_groesse)
+        if not block:
+            break
+        groesse += len(block)
+        if max_bytes is not None and groesse > max_bytes:
+            raise DateiZuGrossException(f"Die Datei überschreitet die maximale Größe von {max_bytes} Bytes.")
+        pruefsumme.update(block)
+    datei.seek(0)
+    return pruefsumme.hexdigest(), groesse
+
+def iter_text_zeilen(datei: BinaryIO, max_bytes: Optional[int] = None, encoding: str = 'utf-8-sig',
+                     chunk_groesse: int = CHUNK_GROESSE) -> Iterator[str]:
+    """
+    Liest eine Binärdatei blockweise, dekodiert inkrementell (BOM-Handling über utf-8-sig)
+    und liefert die Textzeilen inkl. Zeilenende. Die Größenbegrenzung wird schon während
+    des Lesens geprüft, sodass nie mehr als ein Block zusätzlich im Speicher liegt.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    gelesen = 0
+    rest = ""
+    while True:
+        block = datei.read(chunk_groesse)
+        if not block:
+            break
+        gelesen += len(block)
+        if max_bytes is not None and gelesen > max_bytes:
+            raise DateiZuGrossException(f"Die Datei überschreitet die maximale Größe von {max_bytes} Bytes.")
+        zeilen = (rest + decoder.decode(block)).splitlines(keepends=True)
+        # Die letzte (evtl. unvollständige) Zeile wird mit dem nächsten Block zusammengesetzt
+        rest = zeilen.pop() if zeilen else ""
+        yield from zeilen
+    rest += decoder.decode(b"", final=True)
+    if rest:
+        yield from rest.splitlines(keepends=True)
+
+def _stichprobe_aus_zeilen(zeilen: Iterable[str], max_zeilen: int, delimiter: str) -> Tuple[List[str], List[List[str]]]:
+    reader = csv.reader(zeilen, delimiter=delimiter)
+    header = next(reader, [])
+    return header, [zeile for zeile in itertools.islice(reader, max_zeilen) if zeile]
+
+def lese_stichprobe_binaerdatei(datei: BinaryIO, max_zeilen: int = 50, delimiter: str = ';',
+                                chunk_groesse: int = CHUNK_GROESSE) -> Tuple[List[str], List[List[str]]]:
+    """
+    Liest nur den Anfang einer Binärdatei (ein Block) und liefert Header und die ersten
+    vollständigen Datenzeilen, z.B. für eine Formatprüfung vor dem eigentlichen Parsen.
+    Dekodiert wird wie beim Parsen strikt als UTF-8: Ist der Anfang anders kodiert (z.B.
+    Latin-1), wird UnicodeDecodeError ausgelöst. Die Leseposition steht danach wieder am Anfang.
+    """
+    datei.seek(0)
+    block = datei.read(chunk_groesse)
+    datei.seek(0)
+    # Inkrementell, damit ein am Blockende abgeschnittenes Mehrbyte-Zeichen kein Fehler ist
+    text = codecs.getincrementaldecoder('utf-8-sig')().decode(block)
+    zeilen = text.splitlines(keepends=True)
+    if len(block) == chunk_groesse and zeilen:
+        # Die letzte Zeile ist evtl. abgeschnitten
+        zeilen.pop()
+    return _stichprobe_aus_zeilen(zeilen, max_zeilen, delimiter)
+
+def lese_stichprobe_csv(dateipfad: str, max_zeilen: int = 50, delimiter: str = ';') -> Tuple[List[str], List[List[str]]]:
+    """Liest Header und die ersten Datenzeilen einer CSV-Datei (siehe lese_stichprobe_binaerdatei)."""
+    with open(dateipfad, mode='rb') as datei:
+        return lese_stichprobe_binaerdatei(datei, max_zeilen, delimiter)
+
+def iter_binaerdatei_projiziert(datei: BinaryIO, spalten: Sequence[str], max_bytes: Optional[int] = None,
+                                delimiter: str = ';') -> Iterator[Tuple[Optional[str], ...]]:
+    """
+    Parst eine (hochgeladene) Binärdatei blockweise und extrahiert nur die angefragten Spalten.
+    Fehler beim Dekodieren oder eine zu große Datei werden an den Aufrufer weitergegeben.
+    """
+    zeilen = instrumentierung.gemessener_strom("dekodieren", iter_text_zeilen(datei, max_bytes))
+    return projiziere_csv_zeilen(zeilen, spalten, delimiter)
+
+def _sanitize_zeile(zeile: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Bereinigt eine Zeile, um CSV-Injection (Excel Formula Injection) zu verhindern.
     Werte, die mit gefährlichen Zeichen beginnen, werden mit einem Hochkomma (') escaped.
     """
     gefaehrliche_anfänge = ('=', '+', '-', '@', '\t', '\r')
-    bereinigte_daten = []
+    neue_zeile = {}
+    for key, wert in zeile.items():
+        wert_str = str(wert) if wert is not None else ""
+        if wert_str.startswith(gefaehrliche_anfänge):
+            neue_zeile[key] = f"'{wert_str}"
+        else:
+            neue_zeile[key] = wert
+    return neue_zeile
+
+def _sanitize_fuer_csv_injection(daten: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Bereinigt alle Zeilen eines Datenstroms gegen CSV-Injection."""
     for zeile in daten:
-        neue_zeile = {}
-        for key, wert in zeile.items():
-            wert_str = str(wert) if wert is not None else ""
-            if wert_str.startswith(gefaehrliche_anfänge):
-                neue_zeile[key] = f"'{wert_str}"
-            else:
-                neue_zeile[key] = wert
-        bereinigte_daten.append(neue_zeile)
-    return bereinigte_daten
-
-def schreibe_csv(dateipfad: str, daten: List[Dict[str, Any]], felder: List[str], delimiter: str = ';') -> None:
-    """Schreibt Daten in eine CSV-Datei."""
-    os.makedirs(os.path.dirname(dateipfad), exist_ok=True)
-    bereinigte_daten = _sanitize_fuer_csv_injection(daten)
+        yield _sanitize_zeile(zeile)
+
+def _temp_pfad_fuer(dateipfad: str) -> str:
+    """Eindeutiger temporärer Pfad neben dem Ziel (je Prozess und Thread) für atomares Ersetzen."""
+    return f"{dateipfad}.{os.getpid()}_{threading.get_ident()}.tmp"
+
+def _entferne_temp_datei(temp_pfad: str) -> None:
     try:
-        with open(dateipfad, mode='w', encoding='utf-8', newline='') as csvdatei:
-            writer = csv.DictWriter(csvdatei, fieldnames=felder, delimiter=delimiter)
-            writer.writeheader()
-            writer.writerows(bereinigte_daten)
-    except Exception as e:
+        os.remove(temp_pfad)
+    except FileNotFoundError:
+        pass
+
+def schreibe_csv(dateipfad: str, daten: Iterable[Dict[str, Any]], felder: List[str], delimiter: str = ';') -> int:
+    """
+    Schreibt Daten in eine CSV-Datei.
+    Die Daten werden zeilenweise geschrieben, sodass auch Generatoren übergeben werden können.
+    Geschrieben wird in eine temporäre Datei, die erst nach vollständigem Durchlauf die
+    Zieldatei ersetzt. Fehler aus dem Datenstrom (Lesen, Mapping, Abgleich) werden
+    weitergegeben, es bleibt dann keine abgeschnittene Datei zurück.
+    Gibt die Anzahl der geschriebenen Zeilen zurück.
+    """
+    temp_pfad = _temp_pfad_fuer(dateipfad)
+    try:
+        os.makedirs(os.path.dirname(dateipfad), exist_ok=True)
+        csvdatei = open(temp_pfad, mode='w', encoding='utf-8', newline='')
+    except OSError as e:
         logger.error(f"Fehler beim Schreiben der CSV-Datei {dateipfad}: {e}")
+        return 0
+    anzahl = 0
+    try:
+        with csvdatei:
+            writer = csv.DictWriter(csvdatei, fieldnames=felder, delimiter=delimiter, extrasaction='ignore')
+            writer.writeheader()
+            for zeile in _sanitize_fuer_csv_injection(daten):
+                writer.writerow(zeile)
+                anzahl += 1
+        os.replace(temp_pfad, dateipfad)
+    except BaseException:
+        _entferne_temp_datei(temp_pfad)
+        raise
+    return anzahl
+
+def generiere_csv_chunks(daten: Iterable[Dict[str, Any]], felder: List[str], delimiter: str = ';',
+                         zeilen_pro_chunk: int = 500, mit_bom: bool = False) -> Iterator[bytes]:
+    """
+    Erzeugt den CSV-Export als Folge von UTF-8-kodierten Byte-Blöcken.
+    Die Zeilen werden beim Schreiben gegen CSV-Injection bereinigt und in Blöcken
+    zu `zeilen_pro_chunk` ausgegeben, sodass nie der komplette Export im Speicher liegt.
+    Mit `mit_bom` wird ein UTF-8-BOM vorangestellt (damit Excel Umlaute korrekt erkennt).
+    Fehler aus dem Datenstrom werden weitergegeben, damit kein abgeschnittener Export
+    als vollständig gilt.
+    """
+    puffer = io.StringIO()
+    if mit_bom:
+        puffer.write('\ufeff')
+    writer = csv.DictWriter(puffer, fieldnames=felder, delimiter=delimiter, extrasaction='ignore')
+    writer.writeheader()
+    for anzahl, zeile in enumerate(daten, start=1):
+        writer.writerow(_sanitize_zeile(zeile))
+        if anzahl % zeilen_pro_chunk == 0:
+            yield puffer.getvalue().encode('utf-8')
+            puffer.seek(0)
+            puffer.truncate()
+    if puffer.tell():
+        yield puffer.getvalue().encode('utf-8')
 
-def generiere_csv_string(daten: List[Dict[str, Any]], felder: List[str], delimiter: str = ';') -> str:
+def generiere_csv_string(daten: Iterable[Dict[str, Any]], felder: List[str], delimiter: str = ';') -> str:
     """Generiert einen CSV-String aus Daten."""
-    output = io.StringIO()
-    bereinigte_daten = _sanitize_fuer_csv_injection(daten)
-    try:
-        writer = csv.DictWriter(output, fieldnames=felder, delimiter=delimiter)
-        writer.writeheader()
-        writer.writerows(bereinigte_daten)
-    except Exception as e:
-        logger.error(f"Fehler beim Generieren des CSV-Strings: {e}")
-    return output.getvalue()
+    return b"".join(generiere_csv_chunks(daten, felder, delimiter)).decode('utf-8')
 
 def schreibe_text(dateipfad: str, inhalt: str) -> None:
     """Schreibt Text in eine Datei."""
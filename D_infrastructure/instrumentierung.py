@@ -0,0 +1,224 @@
+import contextvars
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+STROM_BLOCK = 1000
+
+
+class StufenMessung:
+    """Aufsummierte Messwerte einer Verarbeitungsstufe (Dauer exklusive verschachtelter Stufen)."""
+    __slots__ = ('name', 'dauer', 'zeilen', 'spitze_bytes')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.dauer = 0.0
+        self.zeilen = 0
+        self.spitze_bytes = 0
+
+
+class Messung:
+    """
+    Sammelt die Stufen-Messwerte einer Anfrage bzw. eines Verarbeitungslaufs.
+    Stufen können verschachtelt sein (z.B. Parsen innerhalb des Mappings, weil die
+    Generatoren sich gegenseitig aufrufen); jede Stufe zählt nur ihre eigene Zeit.
+    Mit `mit_speicher` wird zusätzlich die tracemalloc-Spitze je Stufe erfasst,
+    sofern tracemalloc läuft.
+    """
+
+    def __init__(self, mit_speicher: bool = False):
+        self.start = time.perf_counter()
+        self.mit_speicher = mit_speicher and tracemalloc.is_tracing()
+        self.stufen: Dict[str, StufenMessung] = {}
+        self._stapel: List[StufenMessung] = []
+
+    def _stufe_fuer(self, name: str) -> StufenMessung:
+        stufe = self.stufen.get(name)
+        if stufe is None:
+            stufe = self.stufen[name] = StufenMessung(name)
+        return stufe
+
+    @contextmanager
+    def stufe(self, name: str) -> Iterator[StufenMessung]:
+        """Misst einen Abschnitt; die Zeit wird von einer umgebenden Stufe abgezogen."""
+        stufe = self._stufe_fuer(name)
+        eltern = self._stapel[-1] if self._stapel else None
+        if self.mit_speicher:
+            speicher_vorher = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._stapel.append(stufe)
+        start = time.perf_counter()
+        try:
+            yield stufe
+        finally:
+            dauer = time.perf_counter() - start
+            self._stapel.pop()
+            stufe.dauer += dauer
+            if eltern is not None:
+                eltern.dauer -= dauer
+            if self.mit_speicher:
+                spitze = tracemalloc.get_traced_memory()[1] - speicher_vorher
+                stufe.spitze_bytes = max(stufe.spitze_bytes, spitze)
+
+    def strom(self, name: str, daten: Iterable[Any], block: int = STROM_BLOCK,
+              zeilen: Optional[int] = None) -> Iterator[Any]:
+        """
+        Misst einen Generator-Strom als Stufe. Es wird blockweise gelesen, damit die
+        Messung pro Block und nicht pro Zeile Kosten verursacht. Sind die Elemente keine
+        Zeilen (z.B. Export-Blöcke), kann die Zeilenzahl über `zeilen` vorgegeben werden.
+        """
+        iterator = iter(daten)
+        if zeilen is not None:
+            self._stufe_fuer(name).zeilen += zeilen
+        while True:
+            with self.stufe(name) as stufe:
+                puffer = list(islice(iterator, block))
+                if zeilen is None:
+                    stufe.zeilen += len(puffer)
+            if not puffer:
+                return
+            yield from puffer
+
+    def gesamtdauer(self) -> float:
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Die Stufen im Format des `Server-Timing`-Headers (Dauer in ms)."""
+        eintraege = [f"{stufe.name};dur={stufe.dauer * 1000:.1f}" for stufe in self.stufen.values()]
+        eintraege.append(f"gesamt;dur={self.gesamtdauer() * 1000:.1f}")
+        return ", ".join(eintraege)
+
+    def als_logfmt(self, **felder: Any) -> str:
+        """Eine strukturierte Logzeile (key=value) mit allen Stufen und zusätzlichen Feldern."""
+        teile = [f"{schluessel}={wert}" for schluessel, wert in felder.items()]
+        teile.append(f"gesamt_ms={self.gesamtdauer() * 1000:.1f}")
+        for stufe in self.stufen.values():
+            teile.append(f"{stufe.name}_ms={stufe.dauer * 1000:.1f}")
+            if stufe.zeilen:
+                teile.append(f"{stufe.name}_zeilen={stufe.zeilen}")
+            if stufe.spitze_bytes:
+                teile.append(f"{stufe.name}_spitze_bytes={stufe.spitze_bytes}")
+        return " ".join(teile)
+
+
+_aktuelle_messung: contextvars.ContextVar[Optional[Messung]] = contextvars.ContextVar("aktuelle_messung", default=None)
+
+
+def starte_messung(mit_speicher: bool = False) -> Tuple[Messung, contextvars.Token]:
+    """
+    Startet eine Messung für den aktuellen Kontext. Der BegrenzterWorkerPool übernimmt den
+    Kontext in seine Threads, sodass auch die Stufen im Worker erfasst werden.
+    """
+    messung = Messung(mit_speicher)
+    return messung, _aktuelle_messung.set(messung)
+
+
+def beende_messung(token: contextvars.Token) -> None:
+    _aktuelle_messung.reset(token)
+
+
+def aktuelle_messung() -> Optional[Messung]:
+    return _aktuelle_messung.get()
+
+
+@contextmanager
+def stufe(name: str) -> Iterator[Optional[StufenMessung]]:
+    """Misst einen Abschnitt in der aktuellen Messung; ohne aktive Messung ohne Wirkung."""
+    messung = _aktuelle_messung.get()
+    if messung is None:
+        yield None
+        return
+    with messung.stufe(name) as stufen_messung:
+        yield stufen_messung
+
+
+def gemessen(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: misst jeden Aufruf der Funktion als Stufe `name`."""
+    def decorator(funktion: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(funktion)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with stufe(name):
+                return funktion(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def gemessener_strom(name: str, daten: Iterable[Any], block: int = STROM_BLOCK,
+                     zeilen: Optional[int] = None) -> Iterable[Any]:
+    """
+    Misst einen Strom in der beim Aufruf aktiven Messung (auch wenn er später in einem
+    anderen Thread konsumiert wird). Ohne aktive Messung wird der Strom unverändert
+    zurückgegeben, es entstehen also keine Kosten.
+    """
+    messung = _aktuelle_messung.get()
+    if messung is None:
+        return daten
+    return messung.strom(name, daten, block, zeilen)
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(f'{name}="{wert}"' for name, wert in labels.items())
+
+
+class MetrikRegistry:
+    """
+    Thread-sichere Sammlung von Zählern über alle abgeschlossenen Messungen,
+    ausgegeben im Prometheus-Textformat.
+    """
+
+    def __init__(self, prefix: str):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stufen: Dict[str, List[float]] = {}
+        self._anfragen: Dict[Tuple[str, str, int], List[float]] = {}
+
+    def erfasse(self, messung: Messung, methode: str, pfad: str, status: int) -> None:
+        """Übernimmt eine abgeschlossene Messung in die Zähler."""
+        with self._lock:
+            for stufe in messung.stufen.values():
+                werte = self._stufen.setdefault(stufe.name, [0, 0.0, 0, 0])
+                werte[0] += 1
+                werte[1] += stufe.dauer
+                werte[2] += stufe.zeilen
+                werte[3] = max(werte[3], stufe.spitze_bytes)
+            anfrage = self._anfragen.setdefault((methode, pfad, status), [0, 0.0])
+            anfrage[0] += 1
+            anfrage[1] += messung.gesamtdauer()
+
+    def als_prometheus(self, messwerte: Optional[Dict[str, float]] = None) -> str:
+        """
+        Rendert alle Zähler im Prometheus-Textformat. `messwerte` sind zusätzliche
+        Momentanwerte (Gauges), z.B. die Auslastung von Cache und Worker-Pool.
+        """
+        p = self.prefix
+        zeilen = [
+            f"# HELP {p}_anfragen_total Anzahl beantworteter Anfragen.",
+            f"# TYPE {p}_anfragen_total counter",
+        ]
+        with self._lock:
+            anfragen = sorted(self._anfragen.items())
+            stufen = sorted(self._stufen.items())
+        for (methode, pfad, status), (anzahl, _) in anfragen:
+            zeilen.append(f"{p}_anfragen_total{{{_labels(methode=methode, pfad=pfad, status=str(status))}}} {anzahl}")
+        zeilen += [f"# HELP {p}_anfrage_sekunden_total Summe der Antwortzeiten.", f"# TYPE {p}_anfrage_sekunden_total counter"]
+        for (methode, pfad, status), (_, sekunden) in anfragen:
+            zeilen.append(f"{p}_anfrage_sekunden_total{{{_labels(methode=methode, pfad=pfad, status=str(status))}}} {sekunden:.6f}")
+
+        for name, typ, hilfe, index in (
+            ("stufe_aufrufe_total", "counter", "Anzahl gemessener Durchläufe je Stufe.", 0),
+            ("stufe_sekunden_total", "counter", "Summe der Laufzeit je Stufe (exklusive verschachtelter Stufen).", 1),
+            ("stufe_zeilen_total", "counter", "Summe der verarbeiteten Zeilen je Stufe.", 2),
+            ("stufe_speicher_spitze_bytes", "gauge", "Höchste tracemalloc-Spitze je Stufe.", 3),
+        ):
+            zeilen += [f"# HELP {p}_{name} {hilfe}", f"# TYPE {p}_{name} {typ}"]
+            for stufe_name, werte in stufen:
+                wert = f"{werte[index]:.6f}" if isinstance(werte[index], float) else str(werte[index])
+                zeilen.append(f"{p}_{name}{{{_labels(stufe=stufe_name)}}} {wert}")
+
+        for name, wert in sorted((messwerte or {}).items()):
+            zeilen += [f"# TYPE {p}_{name} gauge", f"{p}_{name} {wert}"]
+        return "\n".join(zeilen) + "\n"
@@ -6,10 +6,16 @@ document.addEventListener('DOMContentLoaded', () => {
         fileInfo: document.getElementById('file-info'),
         resultArea: document.getElementById('result-area'),
         resultTitle: document.getElementById('result-title'),
+        rowErrors: document.getElementById('row-errors'),
         noResultsMessage: document.getElementById('no-results-message'),
         resultsContent: document.getElementById('results-content'),
         resultBody: document.getElementById('result-body'),
+        resultHeaders: document.querySelectorAll('#result-table th[data-sort]'),
         downloadBtn: document.getElementById('download-btn'),
+        // Seitenweise Anzeige
+        pageInfo: document.getElementById('page-info'),
+        prevPage: document.getElementById('prev-page'),
+        nextPage: document.getElementById('next-page'),
         loading: document.getElementById('loading'),
         // Filter
         filterJa: document.getElementById('filter-ja'),
@@ -25,23 +31,16 @@ document.addEventListener('DOMContentLoaded', () => {
         closeModal: document.querySelector('.close')
     };
 
-    // App Status
+    // App Status: die Ergebnisse liegen auf dem Server, der Browser hält nur die aktuelle Seite
+    const PAGE_SIZE = 100;
     let state = {
-        results: [],
-        filename: ""
+        token: null,
+        total: 0,
+        offset: 0,
+        sortierung: null,
+        absteigend: false
     };
 
-    // Konfiguration sicher aus dem DOM laden
-    const config = (() => {
-        const configElement = document.getElementById('app-config');
-        try {
-            return configElement ? JSON.parse(configElement.textContent) : { configPostfix: "_vorschlaege_IN_KASSA" };
-        } catch (e) {
-            console.error("Fehler beim Laden der Konfiguration:", e);
-            return { configPostfix: "_vorschlaege_IN_KASSA" };
-        }
-    })();
-
     // --- Modal Logik ---
     if (ui.explanationImg && ui.modal) {
         ui.explanationImg.addEventListener('click', () => {
@@ -96,23 +95,30 @@ document.addEventListener('DOMContentLoaded', () => {
     // --- API & Datenverarbeitung ---
     async function handleUpload(file) {
         updateFileInfo(file);
+        ui.loading.textContent = 'Verarbeite Daten...';
         toggleLoading(true);
 
         const formData = new FormData();
         formData.append('file', file);
 
         try {
-            const response = await fetch('/api/process', { method: 'POST', body: formData });
+            // Verarbeitung als Hintergrund-Job: der Upload kehrt sofort zurück, danach wird der Fortschritt abgefragt
+            const response = await fetch('/api/jobs', { method: 'POST', body: formData });
             if (!response.ok) {
                 const err = await response.json();
                 throw new Error(err.detail || 'Fehler beim Verarbeiten');
             }
+
+            const { job_id: jobId } = await response.json();
+            const data = await waitForJob(jobId);
+            showRowErrors(data.zeilenfehler);
+            state.token = jobId;
+            state.total = data.total;
+            state.offset = 0;
+            state.sortierung = null;
+            state.absteigend = false;
             
-            const data = await response.json();
-            state.results = data.results;
-            state.filename = data.filename;
-            
-            displayResults(state.results);
+            await displayResults();
         } catch (error) {
             alert(error.message);
             toggleLoading(false);
@@ -121,8 +127,34 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    function displayResults(results) {
-        const hasResults = results && results.length > 0;
+    // Fragt den Job-Status ab, bis der Job fertig oder fehlgeschlagen ist, und zeigt den Fortschritt an
+    const JOB_POLL_MS = 500;
+    async function waitForJob(jobId) {
+        while (true) {
+            const response = await fetch(`/api/jobs/${encodeURIComponent(jobId)}`);
+            const job = await response.json();
+            if (!response.ok) throw new Error(job.detail || 'Fehler beim Verarbeiten');
+            if (job.status === 'fertig') return job;
+            if (job.status === 'fehler') throw new Error(job.fehler || 'Fehler beim Verarbeiten');
+            ui.loading.textContent = `Verarbeite Daten... ${job.fortschritt} %`;
+            await new Promise(resolve => setTimeout(resolve, JOB_POLL_MS));
+        }
+    }
+
+    // Übersprungene Zeilen (z.B. ungültiger Lagerstand) als Hinweis über der Tabelle
+    function showRowErrors(bericht) {
+        if (!ui.rowErrors) return;
+        const hasErrors = bericht && bericht.gesamt > 0;
+        ui.rowErrors.classList.toggle('hidden', !hasErrors);
+        if (!hasErrors) return;
+        const details = Object.entries(bericht.fehlerarten)
+            .map(([art, info]) => `${art}: ${info.anzahl} (z.B. IDs ${info.beispiel_ids.join(', ')})`)
+            .join('; ');
+        ui.rowErrors.textContent = `${bericht.gesamt} Zeilen wurden übersprungen – ${details}`;
+    }
+
+    async function displayResults() {
+        const hasResults = state.total > 0;
 
         // UI-Elemente basierend auf Ergebnissen umschalten
         if (ui.noResultsMessage) ui.noResultsMessage.classList.toggle('hidden', hasResults);
@@ -138,46 +170,57 @@ document.addEventListener('DOMContentLoaded', () => {
         if (ui.filterError) ui.filterError.classList.add('hidden');
 
         ui.resultBody.innerHTML = '';
-        
-        if (hasResults) {
-            results.forEach(row => {
-                const tr = document.createElement('tr');
-                // Metadaten für Filterung speichern
-                tr.dataset.status = row['ändern_auf'] || '';
-                tr.dataset.einheit = row['einheit'] || '';
-                tr.dataset.gruppe = row['gruppe'] || '';
-                
-                // Definiere Spalten-Mapping (Key im Objekt -> Textinhalt)
-                const columns = [
-                    { key: 'Name' },
-                    { key: 'ID' },
-                    { key: 'gruppe' },
-                    { key: 'barcode' },
-                    { key: 'ändern_auf', isBold: true }
-                ];
-
-                columns.forEach(col => {
-                    const td = document.createElement('td');
-                    const val = row[col.key] || '';
-                    if (col.isBold) {
-                        const strong = document.createElement('strong');
-                        strong.textContent = val;
-                        td.appendChild(strong);
-                    } else {
-                        td.textContent = val;
-                    }
-                    tr.appendChild(td);
-                });
-
-                ui.resultBody.appendChild(tr);
+        ui.resultArea.classList.remove('hidden');
+        if (hasResults) await loadPage();
+    }
+
+    function renderRows(results) {
+        const fragment = document.createDocumentFragment();
+        results.forEach(row => {
+            const tr = document.createElement('tr');
+            
+            // Definiere Spalten-Mapping (Key im Objekt -> Textinhalt)
+            const columns = [
+                { key: 'Name' },
+                { key: 'ID' },
+                { key: 'gruppe' },
+                { key: 'barcode' },
+                { key: 'ändern_auf', isBold: true }
+            ];
+
+            columns.forEach(col => {
+                const td = document.createElement('td');
+                const val = row[col.key] || '';
+                if (col.isBold) {
+                    const strong = document.createElement('strong');
+                    strong.textContent = val;
+                    td.appendChild(strong);
+                } else {
+                    td.textContent = val;
+                }
+                tr.appendChild(td);
             });
+
+            fragment.appendChild(tr);
+        });
+        ui.resultBody.replaceChildren(fragment);
+    }
+
+    function renderPagination(total) {
+        if (ui.pageInfo) {
+            ui.pageInfo.textContent = total === 0
+                ? 'Keine Treffer für die gewählten Filter'
+                : `${state.offset + 1}–${Math.min(state.offset + PAGE_SIZE, total)} von ${total}`;
         }
-        
-        ui.resultArea.classList.remove('hidden');
-        applyAllFilters();
+        if (ui.prevPage) ui.prevPage.disabled = state.offset === 0;
+        if (ui.nextPage) ui.nextPage.disabled = state.offset + PAGE_SIZE >= total;
+        ui.resultHeaders.forEach(th => {
+            th.classList.toggle('sort-asc', th.dataset.sort === state.sortierung && !state.absteigend);
+            th.classList.toggle('sort-desc', th.dataset.sort === state.sortierung && state.absteigend);
+        });
     }
 
-    // --- Filter Logik ---
+    // --- Filter Logik (wird serverseitig ausgewertet) ---
     const getFilterValues = () => ({
         ja: ui.filterJa ? ui.filterJa.checked : true,
         nein: ui.filterNein ? ui.filterNein.checked : true,
@@ -186,43 +229,59 @@ document.addEventListener('DOMContentLoaded', () => {
         group: ui.groupFilter ? ui.groupFilter.value.trim() : ""
     });
 
-    function applyAllFilters() {
+    function buildQuery(filters) {
+        const params = new URLSearchParams();
+        // Status (JA/NEIN) und Einheit (Stück/kg); Artikel ohne Einheit werden so nie angezeigt
+        if (filters.ja) params.append('status', 'Ja');
+        if (filters.nein) params.append('status', 'Nein');
+        if (filters.stueck) params.append('einheit', 'Stück');
+        if (filters.kg) params.append('einheit', 'kg');
+        if (filters.group !== "") params.set('gruppe', filters.group);
+        if (state.sortierung) {
+            params.set('sortierung', state.sortierung);
+            params.set('absteigend', state.absteigend);
+        }
+        return params;
+    }
+
+    async function loadPage() {
+        if (!state.token) return;
         const filters = getFilterValues();
-        const rows = ui.resultBody.querySelectorAll('tr');
-        
+
         // Validierung der Gruppen-ID
         const isNumeric = /^\d*$/.test(filters.group);
         if (ui.filterError) {
             ui.filterError.classList.toggle('hidden', isNumeric);
         }
 
-        rows.forEach(row => {
-            const status = row.dataset.status;
-            const einheit = row.dataset.einheit;
-            const gruppe = row.dataset.gruppe;
-
-            // 1. Basis-Regel: Ohne Einheit immer ausblenden
-            if (!einheit || einheit.trim() === "") {
-                row.classList.add('hidden');
-                return;
-            }
-
-            // 2. Filter nach Status (JA/NEIN)
-            let matchStatus = false;
-            if (status === 'Ja' && filters.ja) matchStatus = true;
-            if (status === 'Nein' && filters.nein) matchStatus = true;
+        // Ohne ausgewählten Status oder ohne ausgewählte Einheit gibt es keine Treffer
+        if (!isNumeric || (!filters.ja && !filters.nein) || (!filters.stueck && !filters.kg)) {
+            renderRows([]);
+            renderPagination(0);
+            return;
+        }
 
-            // 3. Filter nach Einheit (Stück/kg)
-            let matchEinheit = false;
-            if (einheit === 'Stück' && filters.stueck) matchEinheit = true;
-            if (einheit === 'kg' && filters.kg) matchEinheit = true;
+        const params = buildQuery(filters);
+        params.set('offset', state.offset);
+        params.set('limit', PAGE_SIZE);
 
-            // 4. Filter nach Gruppe
-            let matchGroup = (filters.group === "" || gruppe === filters.group);
+        try {
+            const response = await fetch(`/api/results/${encodeURIComponent(state.token)}?${params}`);
+            if (!response.ok) {
+                const err = await response.json();
+                throw new Error(err.detail || 'Fehler beim Laden der Ergebnisse');
+            }
+            const data = await response.json();
+            renderRows(data.results);
+            renderPagination(data.total);
+        } catch (error) {
+            alert(error.message);
+        }
+    }
 
-            const isVisible = matchStatus && matchEinheit && matchGroup;
-            row.classList.toggle('hidden', !isVisible);
-        });
+    function applyAllFilters() {
+        state.offset = 0;
+        loadPage();
     }
 
     [ui.filterJa, ui.filterNein, ui.filterStueck, ui.filterKg].forEach(el => {
@@ -230,43 +289,45 @@ document.addEventListener('DOMContentLoaded', () => {
     });
 
     if (ui.groupFilter) {
-        ui.groupFilter.addEventListener('input', applyAllFilters);
+        let debounceTimer = null;
+        ui.groupFilter.addEventListener('input', () => {
+            clearTimeout(debounceTimer);
+            debounceTimer = setTimeout(applyAllFilters, 250);
+        });
     }
 
-    const sanitizeForCsv = (val) => {
-        const str = String(val === null || val === undefined ? '' : val);
-        const dangerousStarts = ['=', '+', '-', '@', '\t', '\r'];
-        if (dangerousStarts.some(start => str.startsWith(start))) {
-            return `'${str}`;
-        }
-        return str;
-    };
+    // --- Blättern & Sortieren ---
+    if (ui.prevPage) {
+        ui.prevPage.addEventListener('click', () => {
+            state.offset = Math.max(0, state.offset - PAGE_SIZE);
+            loadPage();
+        });
+    }
+
+    if (ui.nextPage) {
+        ui.nextPage.addEventListener('click', () => {
+            state.offset += PAGE_SIZE;
+            loadPage();
+        });
+    }
 
-    // --- CSV Download ---
+    ui.resultHeaders.forEach(th => {
+        th.addEventListener('click', () => {
+            if (state.sortierung === th.dataset.sort) {
+                state.absteigend = !state.absteigend;
+            } else {
+                state.sortierung = th.dataset.sort;
+                state.absteigend = false;
+            }
+            applyAllFilters();
+        });
+    });
+
+    // --- CSV Download (wird vom Server mit allen Ergebnissen erzeugt) ---
     if (ui.downloadBtn) {
         ui.downloadBtn.addEventListener('click', () => {
-            if (state.results.length === 0) return;
-            
-            const headers = ['Name', 'ID', 'gruppe', 'barcode', 'extnr', 'ändern_auf', 'einheit'];
-            const csvRows = [
-                headers.join(';'),
-                ...state.results.map(res => headers.map(h => sanitizeForCsv(res[h])).join(';'))
-            ];
-            
-            const csvContent = "\ufeff" + csvRows.join('\n');
-            const blob = new Blob([csvContent], { type: 'text/csv;charset=utf-8;' });
-            const url = URL.createObjectURL(blob);
-            const link = document.createElement("a");
-            
-            const dotIndex = state.filename.lastIndexOf('.');
-            const baseName = dotIndex !== -1 ? state.filename.substring(0, dotIndex) : state.filename;
-            
-            link.href = url;
-            link.download = `${baseName}${config.configPostfix}.csv`;
-            document.body.appendChild(link);
-            link.click();
-            document.body.removeChild(link);
-            URL.revokeObjectURL(url);
+            if (!state.token || state.total === 0) return;
+            window.location.href = `/api/results/${encodeURIComponent(state.token)}/export`;
         });
     }
 });
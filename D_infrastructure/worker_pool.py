@@ -0,0 +1,67 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class WarteschlangeVollException(Exception):
+    """Wird ausgelöst, wenn der Worker-Pool keine weiteren Aufträge annehmen kann."""
+    pass
+
+
+class BegrenzterWorkerPool:
+    """
+    Thread-Pool für CPU-lastige Verarbeitung außerhalb der asyncio-Event-Loop.
+    Es werden höchstens `max_worker` Aufträge gleichzeitig ausgeführt und höchstens
+    `max_wartend` weitere angenommen; darüber hinaus wird sofort abgelehnt (Back-Pressure).
+    """
+
+    def __init__(self, max_worker: int, max_wartend: int):
+        self.max_worker = max_worker
+        self.max_wartend = max_wartend
+        self._executor = ThreadPoolExecutor(max_workers=max_worker, thread_name_prefix="verarbeitung")
+        self._plaetze = threading.BoundedSemaphore(max_worker + max_wartend)
+        self._lock = threading.Lock()
+        self.aktiv = 0
+        self.abgelehnt = 0
+
+    def _freigeben(self, _future: Any) -> None:
+        with self._lock:
+            self.aktiv -= 1
+        self._plaetze.release()
+
+    def einreichen(self, funktion: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Reicht `funktion` zur Ausführung im Pool ein, ohne auf das Ergebnis zu warten
+        (z.B. für Hintergrund-Jobs). Ist der Pool voll, wird WarteschlangeVollException ausgelöst.
+        Der aktuelle contextvars-Kontext wird in den Worker-Thread übernommen.
+        """
+        if not self._plaetze.acquire(blocking=False):
+            with self._lock:
+                self.abgelehnt += 1
+            raise WarteschlangeVollException("Die Verarbeitung ist ausgelastet. Bitte später erneut versuchen.")
+        with self._lock:
+            self.aktiv += 1
+
+        kontext = contextvars.copy_context()
+        # Der Platz wird erst freigegeben, wenn der Auftrag wirklich fertig ist,
+        # auch wenn die anfragende Verbindung vorher abbricht.
+        future = self._executor.submit(kontext.run, functools.partial(funktion, *args, **kwargs))
+        future.add_done_callback(self._freigeben)
+        return future
+
+    async def ausfuehren(self, funktion: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Führt `funktion` im Pool aus und wartet asynchron auf das Ergebnis (siehe einreichen)."""
+        return await asyncio.wrap_future(self.einreichen(funktion, *args, **kwargs))
+
+    def statistik(self) -> dict:
+        """Gibt die aktuelle Auslastung für Logging und Monitoring zurück."""
+        with self._lock:
+            return {
+                "aktiv_oder_wartend": self.aktiv,
+                "max_worker": self.max_worker,
+                "max_wartend": self.max_wartend,
+                "abgelehnt": self.abgelehnt,
+            }
@@ -0,0 +1,49 @@
+"""
+Misst die Ladezeit eines Exports ohne Cache, beim ersten Laden (Parsen + Cache schreiben)
+und beim erneuten Laden aus dem memory-mapped Binär-Cache.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_binaer_cache [faktor]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from B_application.use_cases import ArtikelSyncUseCase
+from C_adapters import artikel_repository
+from D_infrastructure import binaer_cache
+from benchmarks.synthetische_daten import vervielfache_export
+
+
+def _messe(beschreibung: str, funktion):
+    start = time.perf_counter()
+    ergebnis = funktion()
+    print(f"{beschreibung:<36} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return ergebnis
+
+
+def main() -> None:
+    faktor = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = os.path.join(ordner, "export.csv")
+        with open(pfad, "w", encoding="utf-8") as datei:
+            datei.write(vervielfache_export(faktor))
+        print(f"Synthetischer Export: {os.path.getsize(pfad) / 1024 / 1024:.1f} MB")
+
+        ohne = _messe("Ohne Cache (CSV parsen)", lambda: artikel_repository.lade_artikel_tabelle_aus_csv(pfad))
+        _messe("Kalt (parsen + Cache schreiben)", lambda: artikel_repository.lade_artikel_tabelle_aus_csv(pfad, True))
+        warm = _messe("Warm (mmap aus Cache)", lambda: artikel_repository.lade_artikel_tabelle_aus_csv(pfad, True))
+        print(f"Cache-Größe: {os.path.getsize(binaer_cache.cache_pfad_fuer(pfad)) / 1024 / 1024:.1f} MB")
+
+        os.utime(pfad)
+        _messe("Warm nach mtime-Änderung (Hash)", lambda: artikel_repository.lade_artikel_tabelle_aus_csv(pfad, True))
+
+        use_case = ArtikelSyncUseCase({})
+        if use_case.execute(warm) != use_case.execute(ohne):
+            raise SystemExit("Ergebnisse aus dem Cache weichen vom CSV-Parsen ab")
+        print("Ergebnisse aus Cache und CSV sind identisch.")
+
+
+if __name__ == "__main__":
+    main()
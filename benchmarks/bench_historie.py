@@ -0,0 +1,52 @@
+"""
+Misst das Bestandsjournal bei wachsendem Verlauf: Erfassen eines Exports (executemany in
+Blöcken) und die Abfrage der stabilen Bestände über die letzten N Exporte. Die Abfragezeit
+sollte mit der Zahl gespeicherter Exporte nicht wachsen, da nur die letzten N gelesen werden.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_historie [artikel] [exporte] [fenster]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+from D_infrastructure.bestands_journal import SqliteBestandsJournal
+
+
+def main() -> None:
+    anzahl_artikel = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    anzahl_exporte = int(sys.argv[2]) if len(sys.argv) > 2 else 26
+    fenster = int(sys.argv[3]) if len(sys.argv) > 3 else 3
+
+    zufall = random.Random(42)
+    lagerstaende = [zufall.choice((0.0, 0.0, 1.0, 3.0, 12.0)) for _ in range(anzahl_artikel)]
+    ids = [str(100000 + index) for index in range(anzahl_artikel)]
+    print(f"{anzahl_artikel} Artikel je Export, {anzahl_exporte} Exporte, Fenster {fenster}")
+
+    with tempfile.TemporaryDirectory() as ordner:
+        journal = SqliteBestandsJournal(os.path.join(ordner, "historie.sqlite3"))
+        for nummer in range(1, anzahl_exporte + 1):
+            # Etwa 5 % der Artikel ändern je Export ihren Bestand
+            for index in zufall.sample(range(anzahl_artikel), anzahl_artikel // 20):
+                lagerstaende[index] = zufall.choice((0.0, 1.0))
+
+            start = time.perf_counter()
+            journal.erfasse_export(f"export_{nummer}", zip(ids, lagerstaende, (lagerstand > 0 for lagerstand in lagerstaende)))
+            dauer_erfassen = time.perf_counter() - start
+
+            start = time.perf_counter()
+            stabil = journal.stabile_bestaende(fenster)
+            dauer_abfrage = time.perf_counter() - start
+
+            if nummer == 1 or nummer % 5 == 0 or nummer == anzahl_exporte:
+                print(f"Export {nummer:>4}: erfassen {dauer_erfassen * 1000:8.1f} ms "
+                      f"({anzahl_artikel / dauer_erfassen:10,.0f} Zeilen/s) | "
+                      f"Abfrage {dauer_abfrage * 1000:7.1f} ms | stabil {len(stabil):>7}")
+        megabyte = os.path.getsize(journal.dateipfad) / 1024 / 1024
+        print(f"Journal: {megabyte:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
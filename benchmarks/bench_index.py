@@ -0,0 +1,63 @@
+"""
+Vergleicht Nachschlagen per linearem Durchlauf mit den Hash-Indizes (ArtikelIndex)
+einer ArtikelTabelle.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_index [faktor] [anzahl_abfragen]
+"""
+import random
+import sys
+import time
+
+from C_adapters import artikel_repository
+from benchmarks.synthetische_daten import vervielfache_export
+
+
+def main() -> None:
+    faktor = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    anzahl_abfragen = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    tabelle = artikel_repository.lade_artikel_tabelle_aus_string(vervielfache_export(faktor))
+    artikel_liste = list(tabelle)
+    print(f"Tabelle: {len(tabelle)} Artikel, {anzahl_abfragen} Abfragen je Art")
+
+    start = time.perf_counter()
+    index = tabelle.index().aufbauen()
+    print(f"Aufbau der Indizes: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    zufall = random.Random(42)
+    stichprobe = [zufall.choice(artikel_liste) for _ in range(anzahl_abfragen)]
+    # Die linearen Varianten durchsuchen die Spalten der Tabelle und erzeugen nur die Treffer;
+    # bei Gruppe und Einheit werden (wie im Abgleich) nur die Positionen verglichen.
+    abfragen = {
+        "ID": ([a.id for a in stichprobe],
+               lambda wert: next((tabelle[i] for i, x in enumerate(tabelle.ids) if x == wert), None),
+               index.finde_nach_id),
+        "Barcode": ([a.barcode or "0" for a in stichprobe],
+                    lambda wert: [tabelle[i] for i, x in enumerate(tabelle.barcodes) if x == wert],
+                    index.finde_nach_barcode),
+        "Gruppe": ([a.gruppe for a in stichprobe if a.gruppe],
+                   lambda wert: [i for i, code in enumerate(tabelle.gruppe_codes) if tabelle.gruppen[code] == wert],
+                   lambda wert: list(index.positionen_der_gruppe(wert))),
+        "Einheit": ([a.einheit for a in stichprobe[:20] if a.einheit],
+                    lambda wert: [i for i, code in enumerate(tabelle.einheit_codes) if tabelle.einheiten[code] == wert],
+                    lambda wert: list(index.positionen_mit_einheit(wert))),
+    }
+
+    for name, (werte, linear, indiziert) in abfragen.items():
+        start = time.perf_counter()
+        erwartet = [linear(w) for w in werte]
+        dauer_linear = (time.perf_counter() - start) / len(werte)
+
+        start = time.perf_counter()
+        ergebnis = [indiziert(w) for w in werte]
+        dauer_index = (time.perf_counter() - start) / len(werte)
+
+        if ergebnis != erwartet:
+            raise SystemExit(f"Abweichende Ergebnisse beim Nachschlagen nach {name}")
+        print(f"{name:<8} linear {dauer_linear * 1e6:10.1f} µs | Index {dauer_index * 1e6:8.1f} µs "
+              f"| Faktor {dauer_linear / dauer_index:8.0f}x")
+
+
+if __name__ == "__main__":
+    main()
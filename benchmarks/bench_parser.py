@@ -0,0 +1,49 @@
+"""
+Vergleicht das Parsen per csv.DictReader mit dem spaltenprojizierten Parser.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_parser [faktor]
+"""
+import sys
+import time
+from typing import Callable
+
+from C_adapters import artikel_repository
+from D_infrastructure import file_handler
+from benchmarks.synthetische_daten import vervielfache_export
+
+
+def _messe(funktion: Callable[[], int], wiederholungen: int = 3) -> float:
+    """Gibt die beste Laufzeit in Sekunden aus mehreren Wiederholungen zurück."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        start = time.perf_counter()
+        funktion()
+        beste = min(beste, time.perf_counter() - start)
+    return beste
+
+
+def main() -> None:
+    faktor = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    inhalt = vervielfache_export(faktor)
+    zeilen = inhalt.count("\n") - 1
+    print(f"Synthetischer Export: {zeilen} Zeilen, {len(inhalt) / 1024 / 1024:.1f} MB")
+
+    messungen = {
+        "DictReader (nur Parsen)": lambda: sum(1 for _ in file_handler.iter_csv_string(inhalt)),
+        "Projektion (nur Parsen)": lambda: sum(1 for _ in file_handler.iter_csv_string_projiziert(
+            inhalt, artikel_repository.ARTIKEL_SPALTEN)),
+        "DictReader + Mapping": lambda: sum(1 for _ in artikel_repository._map_csv_daten_zu_artikel(
+            file_handler.iter_csv_string(inhalt))),
+        "Projektion + Mapping": lambda: sum(1 for _ in artikel_repository.iter_artikel_aus_string(inhalt)),
+    }
+    ergebnisse = {name: _messe(funktion) for name, funktion in messungen.items()}
+
+    for name, dauer in ergebnisse.items():
+        print(f"{name:<26} {dauer * 1000:9.1f} ms  {zeilen / dauer:12,.0f} Zeilen/s")
+    print(f"Speedup Parsen:            {ergebnisse['DictReader (nur Parsen)'] / ergebnisse['Projektion (nur Parsen)']:.2f}x")
+    print(f"Speedup Parsen + Mapping:  {ergebnisse['DictReader + Mapping'] / ergebnisse['Projektion + Mapping']:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Misst den Speicherbedarf pro Artikel: klassische Dataclass, Dataclass mit __slots__
+und spaltenorientierte ArtikelTabelle.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_speicher [faktor]
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List
+
+from A_domain.models import ArtikelTabelle
+from D_infrastructure import file_handler
+from C_adapters import artikel_repository
+from benchmarks.synthetische_daten import vervielfache_export
+
+
+@dataclass
+class ArtikelOhneSlots:
+    """Nachbau des ursprünglichen Artikel-Dataclass ohne __slots__ als Vergleichsbasis."""
+    id: str
+    name: str
+    lagerstand: float
+    ist_kassaartikel: bool
+    einheit: str
+    barcode: str = ""
+    extnr: str = ""
+    gruppe: str = ""
+
+
+def _messe_bytes(aufbau: Callable[[], object]) -> int:
+    """
+    Gibt die nach dem Aufbau dauerhaft belegten Bytes zurück. Die Strings der
+    geparsten Zeilen existieren bereits vorher und zählen daher nicht mit.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objekt = aufbau()
+    gc.collect()
+    belegt, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objekt
+    return belegt
+
+
+def main() -> None:
+    faktor = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    inhalt = vervielfache_export(faktor)
+    werte: List[tuple] = list(file_handler.iter_csv_string_projiziert(inhalt, artikel_repository.ARTIKEL_SPALTEN))
+    anzahl = len(werte)
+    print(f"Synthetischer Export: {anzahl} Artikel")
+
+    def ohne_slots():
+        return [ArtikelOhneSlots(a.id, a.name, a.lagerstand, a.ist_kassaartikel, a.einheit, a.barcode, a.extnr, a.gruppe)
+                for a in artikel_repository._map_csv_werte_zu_artikel(werte)]
+
+    def mit_slots():
+        return list(artikel_repository._map_csv_werte_zu_artikel(werte))
+
+    def tabelle():
+        return ArtikelTabelle.aus_artikeln(artikel_repository._map_csv_werte_zu_artikel(werte))
+
+    messungen = {
+        "Dataclass (ohne __slots__)": ohne_slots,
+        "Artikel (__slots__)": mit_slots,
+        "ArtikelTabelle": tabelle,
+    }
+    basis = None
+    for name, aufbau in messungen.items():
+        pro_artikel = _messe_bytes(aufbau) / anzahl
+        basis = basis or pro_artikel
+        print(f"{name:<28} {pro_artikel:8.1f} Bytes/Artikel  ({pro_artikel / basis:.0%})")
+
+
+if __name__ == "__main__":
+    main()
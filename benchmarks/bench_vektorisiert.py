@@ -0,0 +1,43 @@
+"""
+Prüft, dass der NumPy-Batch-Modus von ArtikelSyncUseCase dieselben Ergebnisse liefert
+wie die artikelweise Berechnung, und vergleicht die Laufzeiten. Die Gleichheit der
+Ergebnisse sichert zusätzlich tests/test_abgleich_vektorisiert.py (inkl. Randfällen) ab.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.bench_vektorisiert [faktor]
+"""
+import itertools
+import sys
+import time
+
+from A_domain.models import ArtikelTabelle
+from B_application.use_cases import ArtikelSyncUseCase
+from C_adapters import artikel_repository
+from benchmarks.synthetische_daten import vervielfache_export
+
+
+def main() -> None:
+    faktor = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    tabelle = ArtikelTabelle.aus_artikeln(artikel_repository.iter_artikel_aus_string(vervielfache_export(faktor)))
+    print(f"Synthetischer Export: {len(tabelle)} Artikel")
+
+    for nur_ja, stueck_aus in itertools.product((0, 1), repeat=2):
+        config = {"nur_Änderungen_zu_JA_ausgeben": nur_ja, "stueckartikel_aussortieren": stueck_aus}
+        use_case = ArtikelSyncUseCase(config)
+
+        start = time.perf_counter()
+        artikelweise = list(use_case.execute_stream(tabelle))
+        dauer_artikelweise = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = use_case.execute_batch(tabelle)
+        dauer_batch = time.perf_counter() - start
+
+        if batch != artikelweise:
+            raise SystemExit(f"Abweichende Ergebnisse bei nur_ja={nur_ja}, stueck_aus={stueck_aus}")
+        print(f"nur_ja={nur_ja} stueck_aus={stueck_aus}: {len(batch):7d} Treffer identisch | "
+              f"artikelweise {dauer_artikelweise * 1000:8.1f} ms | Batch {dauer_batch * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Prüft die Startkosten des CLI-Pfads mit `python -X importtime`: Der Import von main und
+dem CLI-Controller muss innerhalb eines Zeitbudgets bleiben und darf weder Web-Abhängigkeiten
+(FastAPI, Starlette, Jinja2, uvicorn) noch NumPy, sqlite3 oder multiprocessing laden.
+Bei einer Verletzung endet das Skript mit Exit-Code 1, sodass es z.B. in CI laufen kann.
+
+Gemessen wird die beste kumulierte Importzeit aus mehreren Läufen (je ein neuer Prozess);
+Module, die der Interpreter selbst beim Start lädt (site), zählen nicht mit. Ein erster,
+nicht gewerteter Import legt die .pyc-Dateien an, damit nicht das einmalige Kompilieren
+(z.B. in einem frischen Checkout) gemessen wird. Dieselbe Prüfung läuft als Test in
+tests/test_importzeit.py.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.importzeit [budget_ms] [--laeufe N]
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+CLI_MODULE = ("main", "C_adapters.cli_controller")
+VERBOTENE_MODULE = (
+    "fastapi", "starlette", "jinja2", "uvicorn", "numpy",
+    "sqlite3", "multiprocessing", "concurrent.futures.process",
+)
+PROJEKT_ORDNER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_MS = 60.0
+LAEUFE = 5
+
+
+def _vorwaermen() -> None:
+    """Importiert die Module einmal ungemessen, damit die .pyc-Dateien vorliegen."""
+    subprocess.run([sys.executable, "-c", "import " + ", ".join(CLI_MODULE)],
+                   cwd=PROJEKT_ORDNER, capture_output=True, check=True)
+
+
+def _importzeiten() -> Dict[str, int]:
+    """Kumulierte Importzeit (µs) der obersten Importe eines frischen Prozesses."""
+    ergebnis = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(CLI_MODULE)],
+        cwd=PROJEKT_ORDNER, capture_output=True, text=True, check=True
+    )
+    zeiten: Dict[str, int] = {}
+    for zeile in ergebnis.stderr.splitlines():
+        if not zeile.startswith("import time:"):
+            continue
+        _, kumuliert, name = zeile[len("import time:"):].split("|")
+        # Nur oberste Ebene (ein Leerzeichen Einrückung); die Kopfzeile ist keine Zahl
+        if name.startswith(" ") and not name.startswith("  ") and kumuliert.strip().isdigit():
+            zeiten[name.strip()] = int(kumuliert)
+    return zeiten
+
+
+def geladene_verbotene_module() -> List[str]:
+    pruefung = (
+        "import sys, " + ", ".join(CLI_MODULE) + "; "
+        f"print('\\n'.join(m for m in {VERBOTENE_MODULE!r} if m in sys.modules))"
+    )
+    ergebnis = subprocess.run([sys.executable, "-c", pruefung], cwd=PROJEKT_ORDNER,
+                              capture_output=True, text=True, check=True)
+    return ergebnis.stdout.split()
+
+
+def beste_importzeit_ms(laeufe: int = LAEUFE) -> float:
+    """Beste kumulierte Importzeit des CLI-Pfads in ms über `laeufe` Prozesse (mit warmen .pyc)."""
+    _vorwaermen()
+    beste = float("inf")
+    for _ in range(laeufe):
+        zeiten = _importzeiten()
+        beste = min(beste, sum(zeiten.get(modul, 0) for modul in CLI_MODULE) / 1000)
+    return beste
+
+
+def pruefe_budget(budget_ms: float = BUDGET_MS, laeufe: int = LAEUFE) -> Tuple[float, List[str]]:
+    """Misst die Importzeit und liefert sie zusammen mit den Verstößen (leer, wenn alles passt)."""
+    beste = beste_importzeit_ms(laeufe)
+    fehler = []
+    if beste > budget_ms:
+        fehler.append(f"Importzeit {beste:.1f} ms überschreitet das Budget von {budget_ms:.1f} ms")
+    geladen = geladene_verbotene_module()
+    if geladen:
+        fehler.append(f"Der CLI-Pfad lädt Module, die nur bei Bedarf geladen werden sollen: {', '.join(geladen)}")
+    return beste, fehler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Importzeit-Budget des CLI-Pfads prüfen.")
+    parser.add_argument("budget_ms", nargs="?", type=float, default=BUDGET_MS,
+                        help=f"erlaubte kumulierte Importzeit in ms (Standard: {BUDGET_MS:.0f})")
+    parser.add_argument("--laeufe", type=int, default=LAEUFE, help="Anzahl Messläufe (beste zählt)")
+    argumente = parser.parse_args()
+
+    beste, fehler = pruefe_budget(argumente.budget_ms, argumente.laeufe)
+    print(f"Importzeit CLI-Pfad ({', '.join(CLI_MODULE)}): {beste:.1f} ms (Budget {argumente.budget_ms:.1f} ms)")
+    if fehler:
+        raise SystemExit("\n".join(fehler))
+    print("Budget eingehalten, keine verbotenen Module geladen.")
+
+
+if __name__ == "__main__":
+    main()
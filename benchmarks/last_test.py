@@ -0,0 +1,111 @@
+"""
+Lasttest für den Web-Modus: Während mehrere große Uploads verarbeitet werden, wird die
+Antwortzeit kleiner Anfragen (statische Datei) gemessen. Zusätzlich wird gezählt, wie viele
+Uploads wegen voller Warteschlange mit HTTP 503 abgelehnt wurden.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.last_test [faktor] [parallele_uploads]
+"""
+import socket
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import uvicorn
+
+from C_adapters.web_controller import app
+from benchmarks.synthetische_daten import vervielfache_export
+
+
+def _freier_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _multipart(dateiname: str, inhalt: bytes) -> Tuple[bytes, str]:
+    grenze = "----lasttest"
+    koerper = (
+        f"--{grenze}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{dateiname}"\r\n'
+        "Content-Type: text/csv\r\n\r\n"
+    ).encode() + inhalt + f"\r\n--{grenze}--\r\n".encode()
+    return koerper, f"multipart/form-data; boundary={grenze}"
+
+
+def _upload(basis_url: str, koerper: bytes, content_type: str) -> Tuple[int, float]:
+    anfrage = urllib.request.Request(f"{basis_url}/api/process", data=koerper,
+                                     headers={"Content-Type": content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(anfrage) as antwort:
+            antwort.read()
+            status = antwort.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def _kleine_anfragen(basis_url: str, stop: threading.Event) -> List[float]:
+    latenzen = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        with urllib.request.urlopen(f"{basis_url}/static/css/style.css") as antwort:
+            antwort.read()
+        latenzen.append(time.perf_counter() - start)
+        time.sleep(0.01)
+    return latenzen
+
+
+def _auswertung(name: str, latenzen: List[float]) -> None:
+    latenzen = sorted(latenzen)
+    p95 = latenzen[int(len(latenzen) * 0.95) - 1] if len(latenzen) >= 20 else latenzen[-1]
+    print(f"{name:<32} n={len(latenzen):5d}  p50={statistics.median(latenzen) * 1000:7.1f} ms  "
+          f"p95={p95 * 1000:7.1f} ms  max={latenzen[-1] * 1000:7.1f} ms")
+
+
+def main() -> None:
+    faktor = int(sys.argv[1]) if len(sys.argv) > 1 else 9
+    parallele_uploads = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    port = _freier_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    basis_url = f"http://127.0.0.1:{port}"
+
+    inhalt = vervielfache_export(faktor).encode("utf-8")
+    print(f"Upload-Größe: {len(inhalt) / 1024 / 1024:.1f} MB, {parallele_uploads} parallele Uploads")
+
+    # Referenz: Latenz ohne Last
+    stop = threading.Event()
+    threading.Timer(1.0, stop.set).start()
+    _auswertung("Statische Datei ohne Last", _kleine_anfragen(basis_url, stop))
+
+    # Unter Last: viele große Uploads gleichzeitig (jeweils leicht verändert, damit der Cache nicht greift)
+    stop = threading.Event()
+    with ThreadPoolExecutor(max_workers=parallele_uploads + 1) as executor:
+        messung = executor.submit(_kleine_anfragen, basis_url, stop)
+        uploads = [
+            executor.submit(_upload, basis_url, *_multipart(f"last_{i}.csv", inhalt.replace(b"\n0-", f"\n{i}x-".encode(), 1)))
+            for i in range(parallele_uploads)
+        ]
+        ergebnisse = [u.result() for u in uploads]
+        stop.set()
+        _auswertung("Statische Datei unter Last", messung.result())
+
+    for status in sorted({s for s, _ in ergebnisse}):
+        dauern = [d for s, d in ergebnisse if s == status]
+        print(f"Uploads mit HTTP {status}: {len(dauern):3d}  (Ø {statistics.mean(dauern) * 1000:.0f} ms)")
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark-Suite über alle Verarbeitungsstufen mit synthetischen Lotzapp-Exporten:
+Parsen (file_handler), Mapping (Repository), Abgleich (ArtikelSyncUseCase), CSV-Export
+sowie die beiden Web-Endpunkte /api/process und /upload.
+
+Je Stufe werden die beste Laufzeit aus mehreren Wiederholungen, der Durchsatz und der
+Spitzen-Speicherbedarf (tracemalloc, in einem separaten Durchlauf) ausgegeben.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m benchmarks.run_all [zeilen ...] [--wiederholungen N] [--ohne-web] [--ohne-speicher]
+
+Beispiel: python -m benchmarks.run_all 10000 100000 1000000 --wiederholungen 1
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, Optional
+
+from B_application.use_cases import ArtikelSyncUseCase
+from C_adapters import artikel_repository
+from C_adapters.konfiguration import mit_ueberschreibungen
+from D_infrastructure import file_handler
+from benchmarks.synthetische_daten import schreibe_synthetischen_export
+
+EXPORT_FELDER = ['Name', 'ID', 'gruppe', 'barcode', 'extnr', 'ändern_auf', 'einheit']
+
+
+def _messe_zeit(stufe: Callable[[], int], wiederholungen: int) -> float:
+    """Gibt die beste Laufzeit in Sekunden aus mehreren Wiederholungen zurück."""
+    beste = float("inf")
+    for _ in range(wiederholungen):
+        gc.collect()
+        start = time.perf_counter()
+        stufe()
+        beste = min(beste, time.perf_counter() - start)
+    return beste
+
+
+def _messe_spitze(stufe: Callable[[], int]) -> int:
+    """Gibt den zusätzlichen Spitzen-Speicherbedarf einer Stufe in Bytes zurück."""
+    gc.collect()
+    tracemalloc.start()
+    basis, _ = tracemalloc.get_traced_memory()
+    stufe()
+    _, spitze = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return spitze - basis
+
+
+def _web_stufen(pfad: str) -> Dict[str, Optional[Callable[[], int]]]:
+    """
+    Stufen für die beiden Web-Endpunkte. Ohne FastAPI/httpx entfallen sie; Dateien über
+    der konfigurierten Upload-Grenze werden als übersprungen (None) gemeldet.
+    """
+    try:
+        from fastapi.testclient import TestClient
+        from C_adapters import web_controller
+    except ImportError as e:
+        print(f"Web-Endpunkte übersprungen: {e}")
+        return {}
+
+    if os.path.getsize(pfad) > web_controller.MAX_FILE_SIZE:
+        return {"POST /api/process": None, "POST /upload": None}
+
+    client = TestClient(web_controller.app)
+    with open(pfad, "rb") as datei:
+        inhalt = datei.read()
+
+    def anfrage(url: str) -> int:
+        # Upload-Cache leeren, sonst würde ab der zweiten Wiederholung nur der Cache-Treffer gemessen
+        web_controller.upload_cache.leeren()
+        antwort = client.post(url, files={"file": ("benchmark.csv", inhalt, "text/csv")})
+        antwort.raise_for_status()
+        return len(antwort.content)
+
+    return {
+        "POST /api/process": lambda: anfrage("/api/process"),
+        "POST /upload": lambda: anfrage("/upload"),
+    }
+
+
+def _stufen(pfad: str, mit_web: bool) -> Dict[str, Optional[Callable[[], int]]]:
+    """Baut die Stufen auf; die Eingaben jeder Stufe werden vorab (ungemessen) erzeugt."""
+    config = mit_ueberschreibungen(artikel_repository.lade_konfiguration(), nur_neue_vorschlaege=0)
+    spalten = artikel_repository.ARTIKEL_SPALTEN
+
+    werte = list(file_handler.iter_csv_projiziert(pfad, spalten))
+    artikel = list(artikel_repository._map_csv_werte_zu_artikel(werte))
+    ergebnisse = ArtikelSyncUseCase(config).execute(artikel)
+
+    stufen: Dict[str, Optional[Callable[[], int]]] = {
+        "Parsen (file_handler)": lambda: sum(1 for _ in file_handler.iter_csv_projiziert(pfad, spalten)),
+        "Mapping (Repository)": lambda: sum(1 for _ in artikel_repository._map_csv_werte_zu_artikel(werte)),
+        "Abgleich (execute)": lambda: len(ArtikelSyncUseCase(config).execute(artikel)),
+    }
+    try:
+        import numpy  # noqa: F401
+        tabelle = artikel_repository.lade_artikel_tabelle_aus_csv(pfad)
+        vektor_config = mit_ueberschreibungen(config, vektorisierte_berechnung=1)
+        stufen["Abgleich (vektorisiert)"] = lambda: len(ArtikelSyncUseCase(vektor_config).execute(tabelle))
+    except ImportError:
+        pass
+    stufen["CSV-Export"] = lambda: sum(len(c) for c in artikel_repository.erzeuge_export_chunks(ergebnisse, EXPORT_FELDER))
+    if mit_web:
+        stufen.update(_web_stufen(pfad))
+    return stufen
+
+
+def _benchmark(anzahl: int, wiederholungen: int, mit_web: bool, mit_speicher: bool) -> None:
+    with tempfile.TemporaryDirectory() as ordner:
+        pfad = os.path.join(ordner, f"synthetisch_{anzahl}.csv")
+        with open(pfad, mode='w', encoding='utf-8', newline='') as csvdatei:
+            schreibe_synthetischen_export(csvdatei, anzahl)
+        megabyte = os.path.getsize(pfad) / 1024 / 1024
+        print(f"\n=== {anzahl:,} Zeilen ({megabyte:.1f} MB) ===")
+        print(f"{'Stufe':<26} {'Zeit':>11} {'Zeilen/s':>13} {'MB/s':>8} {'Spitze':>10}")
+
+        for name, stufe in _stufen(pfad, mit_web).items():
+            if stufe is None:
+                print(f"{name:<26} übersprungen (größer als max_upload_mb)")
+                continue
+            dauer = _messe_zeit(stufe, wiederholungen)
+            spitze = f"{_messe_spitze(stufe) / 1024 / 1024:7.1f} MB" if mit_speicher else "-"
+            print(f"{name:<26} {dauer * 1000:8.1f} ms {anzahl / dauer:13,.0f} {megabyte / dauer:8.1f} {spitze:>10}")
+
+
+def _parse_argumente() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark aller Verarbeitungsstufen mit synthetischen Exporten.")
+    parser.add_argument("zeilen", nargs="*", type=int, default=[10_000, 100_000],
+                        help="Anzahl Artikel je synthetischem Export (Standard: 10000 100000)")
+    parser.add_argument("--wiederholungen", type=int, default=3, help="Wiederholungen je Stufe (beste zählt)")
+    parser.add_argument("--ohne-web", action="store_true", help="Web-Endpunkte nicht messen")
+    parser.add_argument("--ohne-speicher", action="store_true", help="Keinen tracemalloc-Durchlauf ausführen")
+    return parser.parse_args()
+
+
+def main() -> None:
+    argumente = _parse_argumente()
+    for anzahl in argumente.zeilen:
+        _benchmark(anzahl, argumente.wiederholungen, not argumente.ohne_web, not argumente.ohne_speicher)
+
+
+if __name__ == "__main__":
+    main()
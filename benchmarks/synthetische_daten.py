@@ -0,0 +1,131 @@
+"""
+Hilfsfunktionen, um Exporte für Benchmarks zu erzeugen: entweder durch Vervielfachen des
+Beispiel-Exports in data/ oder rein synthetisch im Lotzapp-Format (62 Spalten).
+"""
+import csv
+import glob
+import io
+import random
+from typing import Iterator, List, TextIO, Tuple
+
+# Spalten des Lotzapp-Artikel-Exports mit den Standardwerten eines "leeren" Artikels.
+LOTZAPP_SPALTEN: Tuple[Tuple[str, str], ...] = (
+    ('ID', ''), ('extnr', ''), ('name', ''), ('gruppe', ''), ('einheit', ''), ('inhalt', '1,000'),
+    ('grundeinheit', ''), ('mwst', '7'), ('dekp', '0'), ('vk', '0'), ('vkbrutto', '0,00'), ('vk1', '0'),
+    ('konto_aufwand', '0'), ('konto_erloes', '0'), ('barcode', ''), ('plu', '0'), ('mindestbestand', '0.000'),
+    ('bestellmenge', '0.000'), ('haltbarkeit', '0'), ('text_etikett', ''), ('kurzname', ''),
+    ('lieferant', '100652'), ('lieferantname', 'köllektiv eG'), ('lieferant_extnr', ''), ('ekmwst', '7'),
+    ('ek', '0,00000'), ('ekbrutto', '0,00'), ('kassaartikel', '0'), ('produktionsstaette', '0'),
+    ('produktionsdoku', '0'), ('beschreibung', ''), ('volldeklaration', ''), ('seriennummer', '0'),
+    ('saisonal', '0000-00-00'), ('bio', '0'), ('vegetarisch', '0'), ('gewicht', '0.00000'),
+    ('laenge', '0.00000'), ('breite', '0.00000'), ('hoehe', '0.00000'), ('urprodukt', '0'),
+    ('verfuegbar', '0'), ('jn1', '0'), ('jn2', '0'), ('jn3', '0'), ('jn4', '0'), ('shop_name', ''),
+    ('shop_name2', ''), ('shop_ca_preis', '0'), ('shop_bestellende', '0'), ('shop_variantenartikel', '0'),
+    ('etikett_extnr', '0'), ('etikett_text1', '0'), ('etikett_text2', '0'), ('etikett_text3', '0'),
+    ('etikett_text4', '0'), ('etikett_text5', '0'), ('etikett_image1', '0'), ('etikett_image2', '0'),
+    ('etikett_image3', '0'), ('lagerstand', '0'), ('lagerstand9', '0'),
+)
+LOTZAPP_HEADER: List[str] = [spalte for spalte, _ in LOTZAPP_SPALTEN]
+
+# Verteilungen grob nach dem Beispiel-Export (ca. 2200 Artikel, Januar 2026).
+_EINHEITEN = ('Stück', 'kg', '')
+_EINHEIT_GEWICHTE = (83, 16, 1)
+_GRUPPEN = (
+    '184', '63', '31', '267', '62', '268', '128', '167', '2', '5', '10', '11', '12', '15', '17', '53',
+    '54', '57', '58', '106', '108', '118', '121', '127', '129', '130', '139', '147', '148', '149', '154',
+    '164', '165', '166', '168', '169', '171', '181', '187', '188', '189', '239', '240', '241', '246',
+    '250', '253', '254', '255', '256', '257', '258', '259', '260', '261', '262', '263', '264', '265',
+    '266', '270', '271', '272', '276', '277', '278', '281', '282', '283', '287', '290', '291', '292', '294',
+)
+# Wenige große Warengruppen, viele kleine (Zipf-ähnlich).
+_GRUPPEN_GEWICHTE = tuple(1 / (rang + 1) ** 1.1 for rang in range(len(_GRUPPEN)))
+_NAMEN = ('Apfel', 'Bergkäse', 'Dinkelmehl', 'Haferdrink', 'Kaffee', 'Linsen', 'Möhren', 'Nudeln',
+          'Olivenöl', 'Reis', 'Schokolade', 'Seife', 'Tee', 'Tomaten', 'Walnüsse', 'Joghurt')
+_ANTEIL_NULL = 0.46
+_ANTEIL_NEGATIV = 0.016
+_ANTEIL_BARCODE = 0.66
+_ANTEIL_EXTNR = 0.10
+
+
+def lade_beispiel_export() -> List[List[str]]:
+    """Lädt den neuesten Lotzapp-Export aus data/ als Liste von Zeilen (inkl. Header)."""
+    pfad = sorted(glob.glob("data/*.csv"))[-1]
+    with open(pfad, mode='r', encoding='utf-8-sig', newline='') as csvdatei:
+        return list(csv.reader(csvdatei, delimiter=';'))
+
+
+def vervielfache_export(faktor: int) -> str:
+    """
+    Simuliert einen großen Multi-Filial-Export, indem der Beispiel-Export `faktor`-mal
+    mit eindeutigen IDs hintereinander gehängt wird.
+    """
+    header, *zeilen = lade_beispiel_export()
+    id_index = header.index('ID')
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=';', lineterminator='\n')
+    writer.writerow(header)
+    for filiale in range(faktor):
+        for zeile in zeilen:
+            neue_zeile = list(zeile)
+            neue_zeile[id_index] = f"{filiale}-{zeile[id_index]}"
+            writer.writerow(neue_zeile)
+    return output.getvalue()
+
+
+def _synthetischer_lagerstand(rng: random.Random, einheit: str) -> str:
+    """Würfelt einen Lagerstand im Lotzapp-Format (Dezimalkomma, kg mit bis zu drei Nachkommastellen)."""
+    zufall = rng.random()
+    if zufall < _ANTEIL_NULL:
+        return '0'
+    if zufall < _ANTEIL_NULL + _ANTEIL_NEGATIV:
+        return str(-rng.randint(1, 5))
+    if einheit == 'kg':
+        return f"{rng.uniform(0.1, 15):.3f}".rstrip('0').rstrip('.').replace('.', ',')
+    return str(int(rng.expovariate(1 / 8)) + 1)
+
+
+def iter_synthetische_zeilen(anzahl: int, seed: int = 42) -> Iterator[List[str]]:
+    """
+    Erzeugt `anzahl` Datenzeilen (ohne Header) im Lotzapp-Format. Einheit, Warengruppe,
+    Lagerstand und Kassa-Flag folgen grob den Verteilungen des Beispiel-Exports; derselbe
+    `seed` liefert immer denselben Export.
+    """
+    rng = random.Random(seed)
+    vorlage = [standard for _, standard in LOTZAPP_SPALTEN]
+    index = {spalte: i for i, spalte in enumerate(LOTZAPP_HEADER)}
+    i_id, i_extnr, i_name, i_gruppe = index['ID'], index['extnr'], index['name'], index['gruppe']
+    i_einheit, i_grundeinheit, i_barcode = index['einheit'], index['grundeinheit'], index['barcode']
+    i_kassa, i_lagerstand = index['kassaartikel'], index['lagerstand']
+
+    einheiten = rng.choices(_EINHEITEN, _EINHEIT_GEWICHTE, k=anzahl)
+    gruppen = rng.choices(_GRUPPEN, _GRUPPEN_GEWICHTE, k=anzahl)
+    for nummer in range(anzahl):
+        zeile = list(vorlage)
+        einheit = einheiten[nummer]
+        lagerstand = _synthetischer_lagerstand(rng, einheit)
+        zeile[i_id] = str(nummer + 1)
+        zeile[i_name] = f"{rng.choice(_NAMEN)} {nummer + 1}"
+        zeile[i_gruppe] = gruppen[nummer]
+        zeile[i_einheit] = zeile[i_grundeinheit] = einheit
+        zeile[i_lagerstand] = lagerstand
+        # Artikel ohne Bestand sind häufiger (noch) nicht in der Kasse.
+        zeile[i_kassa] = '0' if rng.random() < (0.25 if lagerstand == '0' else 0.005) else '1'
+        if rng.random() < _ANTEIL_BARCODE:
+            zeile[i_barcode] = str(rng.randrange(10 ** 12, 10 ** 13))
+        if rng.random() < _ANTEIL_EXTNR:
+            zeile[i_extnr] = str(rng.randrange(10 ** 4, 10 ** 10))
+        yield zeile
+
+
+def schreibe_synthetischen_export(ziel: TextIO, anzahl: int, seed: int = 42) -> None:
+    """Schreibt einen synthetischen Export mit Header in ein geöffnetes Textziel."""
+    writer = csv.writer(ziel, delimiter=';', lineterminator='\n')
+    writer.writerow(LOTZAPP_HEADER)
+    writer.writerows(iter_synthetische_zeilen(anzahl, seed))
+
+
+def erzeuge_synthetischen_export(anzahl: int, seed: int = 42) -> str:
+    """Liefert einen synthetischen Export mit `anzahl` Artikeln als String."""
+    output = io.StringIO()
+    schreibe_synthetischen_export(output, anzahl, seed)
+    return output.getvalue()
@@ -1,13 +1,46 @@
-from C_adapters.cli_controller import CLIController
+import argparse
 from C_adapters import artikel_repository
+from C_adapters.konfiguration import KonfigurationsFehler
 from A_domain.models import AppMode
 
+def _positive_zahl(wert: str) -> int:
+    """argparse-Typ für Anzahlen, die mindestens 1 sein müssen (z.B. --prozesse)."""
+    try:
+        zahl = int(wert)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"'{wert}' ist keine ganze Zahl")
+    if zahl < 1:
+        raise argparse.ArgumentTypeError(f"muss mindestens 1 sein, ist aber {zahl}")
+    return zahl
+
 def main() -> None:
     """
     Einstiegspunkt der Anwendung (Composition Root).
     Hier wird entschieden, welcher Controller (CLI, Web, etc.) gestartet wird.
     """
-    config = artikel_repository.lade_konfiguration()
+    parser = argparse.ArgumentParser(description="Köllektiv Artikel-Kassenabgleich")
+    parser.add_argument("--batch", action="store_true",
+                        help="alle passenden Exportdateien parallel verarbeiten (unabhängig vom Modus in config.json)")
+    parser.add_argument("--muster", default="data/*.csv", help="Glob-Muster der Eingabedateien im Batch-Modus")
+    parser.add_argument("--von", help="nur Exporte ab diesem Datum (JJJJMMTT)")
+    parser.add_argument("--bis", help="nur Exporte bis zu diesem Datum (JJJJMMTT)")
+    parser.add_argument("--prozesse", type=_positive_zahl, help="Anzahl paralleler Prozesse (Standard: batch_prozesse bzw. CPU-Kerne)")
+    args = parser.parse_args()
+
+    # Eine ungültige Konfiguration wird in jedem Modus (auch im Batch) gleich gemeldet
+    try:
+        config = artikel_repository.lade_konfiguration()
+    except KonfigurationsFehler as e:
+        print(f"Fehler: {e}")
+        return
+
+    # Controller werden erst im jeweiligen Modus importiert, damit der CLI-Start schlank bleibt
+    # und die Web-Abhängigkeiten (FastAPI, Jinja2, uvicorn) nur im Web-Modus geladen werden.
+    if args.batch:
+        from C_adapters.cli_controller import CLIController
+        CLIController().execute_batch(args.muster, args.von, args.bis, args.prozesse)
+        return
+
     mode_str = config.get("mode", "local")
     
     try:
@@ -19,12 +52,14 @@ def main() -> None:
         return
 
     if mode == AppMode.LOCAL:
+        from C_adapters.cli_controller import CLIController
         controller = CLIController()
         controller.execute()
     elif mode == AppMode.WEB:
         from C_adapters.web_controller import run
-        print("Starte Web-Modus auf Port 8000...")
-        run()
+        worker = int(config["web_worker"])
+        print(f"Starte Web-Modus auf Port 8000 mit {worker} Worker-Prozess(en)...")
+        run(worker)
     else:
         print(f"Der Modus {mode} wird aktuell nicht unterstuetzt.")
 
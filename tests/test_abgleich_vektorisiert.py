@@ -0,0 +1,104 @@
+"""
+Der NumPy-Batch-Modus von ArtikelSyncUseCase muss für jede Filterkombination dieselben
+Vorschläge in derselben Reihenfolge liefern wie die artikelweise Berechnung.
+
+Aufruf aus dem Projektverzeichnis:
+    python -m pytest tests
+"""
+import itertools
+import unittest
+
+from A_domain.models import Artikel, ArtikelTabelle
+from B_application.use_cases import ArtikelSyncUseCase, _lade_numpy
+from C_adapters import artikel_repository
+
+# Fester Export mit den Randfällen: leerer und ungültiger Lagerstand (Zeile wird übersprungen),
+# NaN, fehlende Spalten am Zeilenende, negative und Nullbestände, Stückartikel, Gruppen
+EXPORT = "\n".join([
+    "ID;name;lagerstand;kassaartikel;einheit;barcode;extnr;gruppe",
+    "1;Äpfel;12,5;0;kg;4001;A-1;Obst",
+    "2;Birnen;0;1;kg;4002;A-2;Obst",
+    "3;Brot;-2;1;Stück;;B-1;Backwaren",
+    "4;Semmel;3;0;Stück;4004;;Backwaren",
+    "5;Milch;;1;Liter;4005;M-1;Molkerei",
+    "6;Joghurt;nan;0;Becher;4006;;Molkerei",
+    "7;Käse;NaN;1;kg;;;Molkerei",
+    "8;Honig;abc;0;Glas;4008;H-1;",
+    "9;Tee;1;1;Packung;4009;T-1;Getränke",
+    "10;Kaffee;0;0;Packung;4010;K-1;Getränke",
+    "11;Saft;0,001;0;Flasche",
+    "12;Wasser;0;1",
+    "13;Nudeln;5;0;Stück;4013;N-1;Trockenware",
+    "14;Reis;-0,5;1;kg;4014;R-1;Trockenware",
+    "15;Öl;7;0;;4015;;",
+])
+
+FILTER_KOMBINATIONEN = [
+    {"nur_Änderungen_zu_JA_ausgeben": nur_ja, "stueckartikel_aussortieren": stueck_aus}
+    for nur_ja, stueck_aus in itertools.product((0, 1), repeat=2)
+]
+
+
+@unittest.skipIf(_lade_numpy() is None, "NumPy ist nicht installiert")
+class AbgleichVektorisiertTest(unittest.TestCase):
+
+    def setUp(self):
+        self.bericht = artikel_repository.FehlerBericht()
+        self.tabelle = ArtikelTabelle.aus_artikeln(artikel_repository.iter_artikel_aus_string(EXPORT, self.bericht))
+
+    def assertGleicheErgebnisse(self, use_case: ArtikelSyncUseCase, tabelle: ArtikelTabelle) -> list:
+        artikelweise = list(use_case.execute_stream(tabelle))
+        self.assertEqual(use_case.execute_batch(tabelle), artikelweise)
+        return artikelweise
+
+    def test_export_wird_wie_erwartet_gelesen(self):
+        # Leerer und ungültiger Lagerstand fallen weg, NaN bleibt als Artikel erhalten
+        self.assertEqual(self.bericht.anzahl, {artikel_repository.FEHLER_LAGERSTAND: 2})
+        self.assertEqual(len(self.tabelle), 13)
+        self.assertEqual(sum(1 for art in self.tabelle if art.lagerstand != art.lagerstand), 2)
+
+    def test_alle_filterkombinationen(self):
+        for config in FILTER_KOMBINATIONEN:
+            with self.subTest(**config):
+                ergebnisse = self.assertGleicheErgebnisse(ArtikelSyncUseCase(config), self.tabelle)
+                self.assertTrue(ergebnisse)
+
+    def test_erwartete_vorschlaege_ohne_filter(self):
+        ergebnisse = self.assertGleicheErgebnisse(ArtikelSyncUseCase({}), self.tabelle)
+        self.assertEqual(
+            [(zeile['ID'], zeile['ändern_auf']) for zeile in ergebnisse],
+            [('1', 'Ja'), ('2', 'Nein'), ('3', 'Nein'), ('4', 'Ja'), ('11', 'Ja'), ('12', 'Nein'),
+             ('13', 'Ja'), ('14', 'Nein'), ('15', 'Ja')]
+        )
+
+    def test_mit_bestandsverlauf(self):
+        verlauf = {'1': True, '2': True, '3': False, '4': True, '6': True, '7': False, '12': False, '15': False}
+        for config in FILTER_KOMBINATIONEN:
+            with self.subTest(**config):
+                self.assertGleicheErgebnisse(ArtikelSyncUseCase(config, verlauf), self.tabelle)
+
+    def test_nur_nan_und_nullbestaende(self):
+        tabelle = ArtikelTabelle.aus_artikeln([
+            Artikel('1', 'a', float('nan'), True, 'kg'),
+            Artikel('2', 'b', float('nan'), False, 'Stück'),
+            Artikel('3', 'c', 0.0, False, 'kg'),
+            Artikel('4', 'd', -0.0, True, ''),
+        ])
+        for config in FILTER_KOMBINATIONEN:
+            with self.subTest(**config):
+                self.assertGleicheErgebnisse(ArtikelSyncUseCase(config), tabelle)
+
+    def test_leere_tabelle(self):
+        leer = ArtikelTabelle.aus_artikeln([])
+        for config in FILTER_KOMBINATIONEN:
+            with self.subTest(**config):
+                self.assertEqual(self.assertGleicheErgebnisse(ArtikelSyncUseCase(config), leer), [])
+
+    def test_execute_nutzt_batch_bei_konfiguration(self):
+        config = {"vektorisierte_berechnung": 1, "stueckartikel_aussortieren": 1}
+        self.assertEqual(ArtikelSyncUseCase(config).execute(self.tabelle),
+                         list(ArtikelSyncUseCase(config).execute_stream(self.tabelle)))
+
+
+if __name__ == "__main__":
+    unittest.main()
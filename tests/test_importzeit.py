@@ -0,0 +1,26 @@
+"""
+Der CLI-Pfad (main, C_adapters.cli_controller) muss innerhalb des Importzeit-Budgets
+starten und darf keine Module laden, die nur im Web- oder Batch-Modus gebraucht werden.
+Gemessen wird mit `python -X importtime` in eigenen Prozessen (siehe benchmarks/importzeit.py).
+
+Aufruf aus dem Projektverzeichnis:
+    python -m pytest tests
+"""
+import unittest
+
+from benchmarks import importzeit
+
+
+class ImportzeitTest(unittest.TestCase):
+
+    def test_keine_verbotenen_module(self):
+        self.assertEqual(importzeit.geladene_verbotene_module(), [])
+
+    def test_budget_eingehalten(self):
+        beste = importzeit.beste_importzeit_ms()
+        self.assertLessEqual(beste, importzeit.BUDGET_MS,
+                             f"Importzeit {beste:.1f} ms überschreitet das Budget von {importzeit.BUDGET_MS:.1f} ms")
+
+
+if __name__ == "__main__":
+    unittest.main()